@@ -0,0 +1,91 @@
+"""AIcarus-Message-Protocol 列式事件批基准.
+
+对比逐个 Event 统计（按平台、会话、小时计数）与先构建 EventBatch 再分组计数的耗时，
+并给出列式数据占用的字节数.
+
+运行方式:
+    python benchmarks/bench_batch.py [事件数量]
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import ConversationInfo, Event, EventBatch, Seg, UserInfo
+from aicarus_protocols.event_batch import ARRAY_BACKEND, HOUR_MS
+
+PLATFORMS = ("qq", "telegram", "discord", "wechat")
+
+
+def build_events(count: int) -> list[dict]:
+    """构建一批事件字典，模拟从归档中读出的数据."""
+    events = []
+    for i in range(count):
+        platform = PLATFORMS[i % len(PLATFORMS)]
+        event = Event(
+            event_id=f"e{i}",
+            event_type=f"message.{platform}.group" if i % 5 else f"notice.{platform}.group.x",
+            time=1678886400000.0 + i * 1000.0,
+            bot_id="10001",
+            content=[Seg("text", {"text": "消息内容" * (i % 8)})],
+            user_info=UserInfo(user_id=f"user_{i % 997}"),
+            conversation_info=ConversationInfo(conversation_id=f"group_{i % 113}", type="group"),
+        )
+        events.append(event.to_dict())
+    return events
+
+
+def row_counts(events: list[dict]) -> tuple[Counter, Counter, Counter]:
+    """逐个 Event 统计消息数量."""
+    by_platform: Counter = Counter()
+    by_conversation: Counter = Counter()
+    by_hour: Counter = Counter()
+    for data in events:
+        event = Event.from_dict(data)
+        if not event.is_message_event():
+            continue
+        by_platform[event.get_platform()] += 1
+        by_conversation[event.conversation_info.conversation_id] += 1
+        by_hour[int(event.time // HOUR_MS) * HOUR_MS] += 1
+    return by_platform, by_conversation, by_hour
+
+
+def main() -> None:
+    """运行列式批基准并打印结果."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    events = build_events(count)
+    print(f"{count} 个事件，数组后端: {ARRAY_BACKEND}")
+
+    started = time.perf_counter()
+    expected = row_counts(events)
+    row_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = EventBatch.from_events(events, keep_rows=False)
+    build_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    messages = batch.filter(prefix="message")
+    result = (
+        messages.count_by("platform"),
+        messages.count_by("conversation_id"),
+        messages.count_by("time"),
+    )
+    query_seconds = time.perf_counter() - started
+    assert all(dict(a) == b for a, b in zip(expected, result, strict=True))
+
+    nbytes = 0
+    for name in ("time", "event_type", "platform", "conversation_id", "user_id", "text_length"):
+        column = batch.column(name)
+        nbytes += len(column) * column.itemsize
+    print(f"  逐个 Event 统计      : {row_seconds * 1000:8.1f} ms")
+    print(f"  构建 EventBatch      : {build_seconds * 1000:8.1f} ms")
+    print(f"  过滤 + 三次分组计数  : {query_seconds * 1000:8.1f} ms")
+    print(f"  列数据大小           : {nbytes / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
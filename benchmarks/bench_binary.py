@@ -0,0 +1,99 @@
+"""AIcarus-Message-Protocol 二进制格式基准.
+
+模拟一个繁忙群聊适配器连接上的事件流，对比 JSON 与二进制格式的帧大小和编解码耗时，
+并校验二进制格式与 JSON 格式的往返一致性.
+
+运行方式:
+    python benchmarks/bench_binary.py [事件数量]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import (
+    ConversationInfo,
+    ConversationType,
+    Event,
+    EventBuilder,
+    SegBuilder,
+    UserInfo,
+)
+from aicarus_protocols.binary_codec import BinaryDecoder, BinaryEncoder
+
+
+def build_stream(count: int, seed: int = 7) -> list[Event]:
+    """生成一个群聊事件流：少量会话、轮换的发言用户、短文本为主."""
+    rng = random.Random(seed)
+    users = [
+        UserInfo(user_id=f"{100000 + i}", user_nickname=f"群友{i}", role="member")
+        for i in range(30)
+    ]
+    conversations = [
+        ConversationInfo(
+            conversation_id=f"{800000 + i}", type=ConversationType.GROUP, name=f"群{i}"
+        )
+        for i in range(3)
+    ]
+    events = []
+    for i in range(count):
+        segs = [SegBuilder.text("哈" * rng.randint(1, 30))]
+        if rng.random() < 0.3:
+            segs.insert(0, SegBuilder.at(rng.choice(users).user_id))
+        if rng.random() < 0.1:
+            segs.append(SegBuilder.image(hash=f"{rng.getrandbits(64):016x}", mime_type="image/png"))
+        events.append(
+            EventBuilder.create_message_event(
+                event_type="message.qq.group.normal",
+                bot_id="10001",
+                message_id=str(1000000 + i),
+                content_segs=segs,
+                user_info=rng.choice(users),
+                conversation_info=rng.choice(conversations),
+            )
+        )
+    return events
+
+
+def main() -> None:
+    """运行二进制格式基准并打印结果."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    events = build_stream(count)
+
+    start = time.perf_counter()
+    json_frames = [event.to_json_bytes() for event in events]
+    json_encode = time.perf_counter() - start
+    start = time.perf_counter()
+    for frame in json_frames:
+        Event.from_json_bytes(frame)
+    json_decode = time.perf_counter() - start
+
+    encoder, decoder = BinaryEncoder(), BinaryDecoder()
+    decoder.accept_handshake(encoder.handshake())
+    start = time.perf_counter()
+    binary_frames = [encoder.encode(event) for event in events]
+    binary_encode = time.perf_counter() - start
+    start = time.perf_counter()
+    decoded = [decoder.decode(frame) for frame in binary_frames]
+    binary_decode = time.perf_counter() - start
+
+    for original, restored in zip(events, decoded, strict=True):
+        assert json.loads(restored.to_json_bytes()) == json.loads(original.to_json_bytes())
+
+    json_size = sum(map(len, json_frames))
+    binary_size = sum(map(len, binary_frames))
+    print(f"事件数量: {count}，往返校验通过")
+    print(f"  平均帧大小 JSON   : {json_size / count:7.1f} 字节")
+    print(f"  平均帧大小 二进制 : {binary_size / count:7.1f} 字节 ({json_size / binary_size:.2f}x)")
+    us = 1e6 / count
+    print(f"  编码 JSON / 二进制: {json_encode * us:6.2f} / {binary_encode * us:6.2f} µs")
+    print(f"  解码 JSON / 二进制: {json_decode * us:6.2f} / {binary_decode * us:6.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""AIcarus-Message-Protocol 预置字典压缩基准.
+
+在消息和通知混合的模拟流量上训练字典，再用另一批事件评估：
+报告未压缩、无字典逐帧压缩、不同大小字典逐帧压缩的平均帧大小，以及编解码吞吐.
+
+运行方式:
+    python benchmarks/bench_compression.py [评估事件数量]
+"""
+
+import os
+import random
+import sys
+import time
+import zlib
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import (
+    ConversationInfo,
+    ConversationType,
+    DictionaryCompressor,
+    Event,
+    EventBuilder,
+    Seg,
+    SegBuilder,
+    UserInfo,
+    train_dictionary,
+)
+
+NOTICE_TYPES = (
+    "notice.qq.group.member_increase",
+    "notice.qq.group.member_decrease",
+    "notice.qq.group.recall",
+    "notice.qq.friend.poke",
+)
+WORDS = ("你好", "今天", "天气", "不错", "吃了吗", "哈哈", "收到", "ok", "明天见", "👍", "123")
+
+
+def build_events(count: int, seed: int) -> list[Event]:
+    """构建消息约占四分之三、其余为通知的群聊流量."""
+    rng = random.Random(seed)
+    users = [
+        UserInfo(
+            user_id=str(10000 + i),
+            user_nickname=f"用户{i}",
+            user_cardname=f"群名片{i}",
+            role=rng.choice(("member", "member", "admin")),
+        )
+        for i in range(200)
+    ]
+    conversations = [
+        ConversationInfo(
+            conversation_id=str(900000 + i), type=ConversationType.GROUP, name=f"测试群聊{i}"
+        )
+        for i in range(30)
+    ]
+    events = []
+    for i in range(count):
+        user = rng.choice(users)
+        conversation = rng.choice(conversations)
+        if rng.random() < 0.75:
+            segs = [SegBuilder.text("".join(rng.choices(WORDS, k=rng.randint(1, 12))))]
+            if rng.random() < 0.2:
+                target = rng.choice(users)
+                segs.append(SegBuilder.at(target.user_id, target.user_nickname))
+            if rng.random() < 0.1:
+                segs.append(
+                    SegBuilder.image(
+                        hash=f"{rng.getrandbits(128):032x}",
+                        mime_type="image/png",
+                        url=f"https://example.com/{rng.getrandbits(64):x}.png",
+                    )
+                )
+            event = EventBuilder.create_message_event(
+                event_type="message.qq.group.normal",
+                bot_id="10001",
+                message_id=str(rng.getrandbits(40)),
+                content_segs=segs,
+                user_info=user,
+                conversation_info=conversation,
+            )
+        else:
+            event_type = rng.choice(NOTICE_TYPES)
+            event = Event(
+                event_id=EventBuilder.generate_event_id(),
+                event_type=event_type,
+                time=1678886400000.0 + i * 1000,
+                bot_id="10001",
+                content=[
+                    Seg(
+                        event_type,
+                        {"operator_id": rng.choice(users).user_id, "target_id": user.user_id},
+                    )
+                ],
+                user_info=user,
+                conversation_info=conversation,
+            )
+        events.append(event)
+    return events
+
+
+def main() -> None:
+    """运行压缩基准并打印结果."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    training = build_events(5000, seed=1)
+    frames = [event.to_json_bytes() for event in build_events(count, seed=2)]
+    raw = sum(map(len, frames))
+    without = sum(len(zlib.compress(frame, 6, -15)) for frame in frames)
+    print(f"{count} 个事件，平均每帧 {raw / count:.1f} 字节")
+    print(f"  无字典逐帧压缩: {without / count:7.1f} 字节/帧 ({without / raw:.0%})")
+
+    for size in (4096, 16384, 32768):
+        compressor = DictionaryCompressor(train_dictionary(training, size))
+        started = time.perf_counter()
+        compressed = [compressor.compress(frame) for frame in frames]
+        encode_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        restored = [compressor.decompress(frame) for frame in compressed]
+        decode_seconds = time.perf_counter() - started
+        assert restored == frames
+        total = sum(map(len, compressed))
+        encode_rate = raw / encode_seconds / 1e6
+        decode_rate = raw / decode_seconds / 1e6
+        print(f"  {size // 1024:2d} KiB 字典    : {total / count:7.1f} 字节/帧 ({total / raw:.0%})")
+        print(f"    压缩 {encode_rate:5.1f} MB/s ({count / encode_seconds:,.0f} 帧/秒)")
+        print(f"    解压 {decode_rate:5.1f} MB/s ({count / decode_seconds:,.0f} 帧/秒)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""AIcarus-Message-Protocol 重复事件抑制基准.
+
+模拟每毫秒到达一个事件的 ID 流，其中约 10% 是对近期事件的重放（重放距离从几秒到半小时不等）.
+比较无界 set、只有精确层的 DuplicateFilter 以及精确层加概率层的 DuplicateFilter：
+吞吐、漏判的重放数、误判的唯一事件数（与预期误判数对照）以及保留的状态大小.
+
+运行方式:
+    python benchmarks/bench_dedup.py [ID 数量]
+"""
+
+import os
+import random
+import sys
+import time
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import DuplicateFilter
+
+# 每个 ID 推进的模拟时间（秒）
+TICK = 0.001
+REPLAY_RATIO = 0.1
+# 重放距离的上限（个 ID），按 TICK 换算约为 30 分钟
+MAX_REPLAY_DISTANCE = 1_800_000
+
+
+def build_stream(count: int, seed: int) -> tuple[list[tuple[str, str]], list[bool]]:
+    """生成 (event_id, message_id) 流以及每一项是否为重放."""
+    rng = random.Random(seed)
+    stream: list[tuple[str, str]] = []
+    replays: list[bool] = []
+    for i in range(count):
+        if stream and rng.random() < REPLAY_RATIO:
+            # 重放沿用原消息的 message_id，但 Adapter 生成了新的 event_id
+            distance = min(len(stream), int(rng.expovariate(1 / 20000)) + 1, MAX_REPLAY_DISTANCE)
+            stream.append((f"replay-{i}", stream[-distance][1]))
+            replays.append(True)
+        else:
+            stream.append((f"event-{i}", f"{i * 7919 % 1_000_000_007}"))
+            replays.append(False)
+    return stream, replays
+
+
+def run_set(stream: list[tuple[str, str]], replays: list[bool]) -> None:
+    """无界 set：精确但内存随 ID 数量无限增长."""
+    seen: set[tuple[str | None, str]] = set()
+    started = time.perf_counter()
+    verdicts = []
+    for _, message_id in stream:
+        key = ("qq", message_id)
+        verdicts.append(key in seen)
+        seen.add(key)
+    report("无界 set", stream, replays, verdicts, time.perf_counter() - started)
+    print(f"    保留 {len(seen):,} 个键")
+
+
+def run_filter(
+    dedup: DuplicateFilter, clock: list[float], stream: list[tuple[str, str]]
+) -> tuple[list[bool], float]:
+    """用模拟时钟驱动 DuplicateFilter."""
+    check = dedup.check_ids
+    verdicts = []
+    started = time.perf_counter()
+    for event_id, message_id in stream:
+        clock[0] += TICK
+        verdicts.append(check(event_id, "qq", message_id))
+    return verdicts, time.perf_counter() - started
+
+
+def report(
+    name: str,
+    stream: list[tuple[str, str]],
+    replays: list[bool],
+    verdicts: list[bool],
+    seconds: float,
+) -> None:
+    """打印吞吐、漏判和误判."""
+    missed = sum(replay and not verdict for replay, verdict in zip(replays, verdicts, strict=True))
+    false_positives = sum(
+        verdict and not replay for replay, verdict in zip(replays, verdicts, strict=True)
+    )
+    print(
+        f"  {name}: {len(stream) / seconds:10,.0f} 个/秒，"
+        f"漏判重放 {missed:,}，误判唯一事件 {false_positives:,}"
+    )
+
+
+def main() -> None:
+    """运行去重基准并打印结果."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    stream, replays = build_stream(count, seed=1)
+    print(f"{count:,} 个 ID，其中重放 {sum(replays):,} 个，模拟时长 {count * TICK:,.0f} 秒")
+    run_set(stream, replays)
+
+    configs = (
+        ("精确层 60 秒", {"window": 60.0}),
+        ("精确层 60 秒 + 概率层 1 小时", {"window": 60.0, "bloom_window": 3600.0}),
+    )
+    for name, options in configs:
+        clock = [0.0]
+        dedup = DuplicateFilter(clock=lambda clock=clock: clock[0], **options)
+        verdicts, seconds = run_filter(dedup, clock, stream)
+        report(name, stream, replays, verdicts, seconds)
+        stats = dedup.stats()
+        print(
+            f"    精确层保留 {stats['entries']:,} 个键，"
+            f"概率层 {stats['bloom_bytes'] / 1024 / 1024:.1f} MiB，"
+            f"当前误判率估计 {stats['false_positive_rate']:.4%}，"
+            f"预期误判 {stats['expected_false_positives']:,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""AIcarus-Message-Protocol 事件分发基准.
+
+对比逐个处理器做模式匹配的线性分发与 EventDispatcher 的前缀树分发，
+在订阅了数百个处理器时为每个事件找出匹配处理器的开销.
+
+运行方式:
+    python benchmarks/bench_dispatch.py [处理器数量]
+"""
+
+import os
+import sys
+import timeit
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import Event, EventDispatcher
+from aicarus_protocols.event_type import WILDCARD_ANY, WILDCARD_ONE
+
+PLATFORMS = ("qq", "discord", "telegram", "wechat", "kook")
+PREFIXES = ("message", "notice", "request", "action_response")
+
+
+def build_patterns(count: int) -> list[str]:
+    """生成一组混合了精确段、"*" 和 "**" 的订阅模式."""
+    patterns = []
+    for i in range(count):
+        prefix = PREFIXES[i % len(PREFIXES)]
+        platform = PLATFORMS[(i // len(PREFIXES)) % len(PLATFORMS)]
+        kind = i % 3
+        if kind == 0:
+            patterns.append(f"{prefix}.{platform}.group.*")
+        elif kind == 1:
+            patterns.append(f"{prefix}.{platform}.**")
+        else:
+            patterns.append(f"{prefix}.*.plugin_{i}")
+    return patterns
+
+
+def linear_match(pattern: tuple[str, ...], parts: list[str]) -> bool:
+    """逐段匹配单个模式，作为对照组."""
+    if not pattern:
+        return not parts
+    head = pattern[0]
+    if head == WILDCARD_ANY:
+        return any(linear_match(pattern[1:], parts[i:]) for i in range(len(parts) + 1))
+    if not parts:
+        return False
+    if head in (WILDCARD_ONE, parts[0]):
+        return linear_match(pattern[1:], parts[1:])
+    return False
+
+
+def main() -> None:
+    """运行事件分发基准并打印结果."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    patterns = build_patterns(count)
+    compiled = [tuple(p.split(".")) for p in patterns]
+    event_types = [
+        "message.qq.group.normal",
+        "notice.discord.group.member_increase",
+        "action_response.telegram.success",
+        "request.kook.friend_add",
+    ]
+    events = [Event(f"e{i}", t, 0.0, "bot", []) for i, t in enumerate(event_types)]
+
+    dispatcher = EventDispatcher()
+    for pattern in patterns:
+        dispatcher.subscribe(pattern, lambda event: None)
+
+    for event in events:
+        expected = sum(linear_match(c, event.event_type.split(".")) for c in compiled)
+        assert len(dispatcher.handlers_for(event.event_type)) == expected
+
+    def linear() -> None:
+        for event in events:
+            parts = event.event_type.split(".")
+            for c in compiled:
+                linear_match(c, parts)
+
+    def trie_uncached() -> None:
+        for event in events:
+            dispatcher._match(event.event_type)
+
+    def trie_cached() -> None:
+        for event in events:
+            dispatcher.dispatch_sync(event)
+
+    number = 2000
+    print(f"{count} 个订阅，每轮 {len(events)} 个事件，循环 {number} 次")
+    for name, func in {
+        "linear match": linear,
+        "trie match (uncached)": trie_uncached,
+        "dispatch_sync (cached)": trie_cached,
+    }.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"  {name:<24}: {seconds / number / len(events) * 1e6:8.2f} µs/事件")
+
+
+if __name__ == "__main__":
+    main()
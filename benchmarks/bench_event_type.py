@@ -0,0 +1,69 @@
+"""AIcarus-Message-Protocol 事件类型校验基准.
+
+对比旧实现（每次以字符串模式调用 re.match 再单独检查 ".."）、预编译模式、
+带判定缓存的 validate_event_type 以及批量接口 validate_event_types 的单次开销.
+
+运行方式:
+    python benchmarks/bench_event_type.py [循环次数]
+"""
+
+import os
+import re
+import sys
+import timeit
+from collections.abc import Callable
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import validate_event_type, validate_event_types
+from aicarus_protocols.event_type import _check_event_type
+
+EVENT_TYPES = [
+    "message.qq.group",
+    "message.qq.private",
+    "notice.qq.group.member_increase",
+    "request.qq.friend.add",
+    "action.qq.send_message",
+    "action_response.qq.send_message",
+    "meta.lifecycle.connect",
+    "message..invalid",
+]
+
+
+def legacy_validate_event_type(event_type: str) -> bool:
+    """旧版实现，作为对照."""
+    if not isinstance(event_type, str):
+        return False
+    pattern = (
+        r"^(message|notice|request|action|action_response|meta)\.[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)+$"
+    )
+    if not re.match(pattern, event_type):
+        return False
+    return ".." not in event_type
+
+
+def main() -> None:
+    """运行事件类型校验基准并打印结果."""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    calls = number * len(EVENT_TYPES)
+    for event_type in EVENT_TYPES:
+        assert legacy_validate_event_type(event_type) == validate_event_type(event_type)
+
+    def run_each(func: Callable[[str], bool]) -> Callable[[], list[bool]]:
+        return lambda: [func(event_type) for event_type in EVENT_TYPES]
+
+    cases = {
+        "legacy re.match": run_each(legacy_validate_event_type),
+        "precompiled, uncached": run_each(_check_event_type),
+        "validate_event_type": run_each(validate_event_type),
+        "validate_event_types": lambda: validate_event_types(EVENT_TYPES),
+    }
+    print(f"{len(EVENT_TYPES)} 个事件类型 x {number} 轮")
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"  {name:<24}: {seconds / calls * 1e9:7.1f} ns/次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""AIcarus-Message-Protocol JSON 编解码基准.
+
+对比 json.dumps(event.to_dict()) / Event.from_dict(json.loads(...)) 与
+Event.to_json_bytes() / Event.from_json_bytes() 的吞吐，以及路由场景下延迟解码的收益.
+
+运行方式:
+    python benchmarks/bench_json.py [循环次数]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import (
+    ConversationInfo,
+    ConversationType,
+    Event,
+    EventBuilder,
+    SegBuilder,
+    UserInfo,
+)
+from aicarus_protocols.json_codec import JSON_BACKEND
+
+
+def build_sample_event() -> Event:
+    """构建一条典型的群消息事件."""
+    return EventBuilder.create_message_event(
+        event_type="message.qq.group.normal",
+        bot_id="10001",
+        message_id="platform_msg_789",
+        content_segs=[
+            SegBuilder.text("你好，这是一条用于基准测试的消息！"),
+            SegBuilder.at("user_2", "王五"),
+            SegBuilder.face("66"),
+            SegBuilder.image(hash="abc123", mime_type="image/png", url="http://example.com/a.png"),
+        ],
+        user_info=UserInfo(user_id="user_sender_456", user_nickname="李四", role="member"),
+        conversation_info=ConversationInfo(
+            conversation_id="group123", type=ConversationType.GROUP, name="AIcarus测试群"
+        ),
+    )
+
+
+def route(event: Event) -> tuple:
+    """模拟路由进程只读取事件头部字段."""
+    return event.event_type, event.bot_id, event.conversation_info.conversation_id
+
+
+def main() -> None:
+    """运行 JSON 编解码基准并打印结果."""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    event = build_sample_event()
+    payload = event.to_json_bytes()
+    assert json.loads(payload) == event.to_dict()
+    assert Event.from_json_bytes(payload) == event
+
+    cases = {
+        "encode  to_dict + json.dumps": lambda: json.dumps(
+            event.to_dict(), ensure_ascii=False
+        ).encode("utf-8"),
+        "encode  to_json_bytes": event.to_json_bytes,
+        "decode  json.loads + from_dict": lambda: Event.from_dict(json.loads(payload)),
+        "decode  from_json_bytes": lambda: Event.from_json_bytes(payload),
+        "decode  lazy + route fields": lambda: route(Event.from_json_bytes(payload, lazy=True)),
+        "forward lazy decode + encode": lambda: Event.from_json_bytes(
+            payload, lazy=True
+        ).to_json_bytes(),
+    }
+
+    print(f"JSON 后端: {JSON_BACKEND}，单帧 {len(payload)} 字节，循环 {number} 次")
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"  {name:<32}: {seconds / number * 1e6:7.2f} µs/事件")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""AIcarus-Message-Protocol 内存占用基准.
+
+对比使用 __slots__ 的核心数据结构与等价的普通 dataclass（每个实例带 __dict__）
+在保存一条典型的 5 个 Seg 的群消息时，每个事件平均占用的字节数；
+以及从字典解码时开启 UserInfo / ConversationInfo 驻留前后的差别.
+
+运行方式:
+    python benchmarks/bench_memory.py [事件数量]
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import field, fields, make_dataclass
+from typing import Any
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import (
+    ConversationInfo,
+    Event,
+    Seg,
+    UserInfo,
+    disable_interning,
+    enable_interning,
+)
+
+
+def _legacy_class(cls: type) -> type:
+    """按照 cls 的字段生成一个不带 __slots__ 的普通 dataclass，用作对照组."""
+    spec = []
+    for f in fields(cls):
+        if f.default_factory is not field().default_factory:
+            spec.append((f.name, f.type, field(default_factory=f.default_factory)))
+        elif f.default is not field().default:
+            spec.append((f.name, f.type, field(default=f.default)))
+        else:
+            spec.append((f.name, f.type))
+    return make_dataclass(f"Legacy{cls.__name__}", spec)
+
+
+LegacyEvent = _legacy_class(Event)
+LegacySeg = _legacy_class(Seg)
+LegacyUserInfo = _legacy_class(UserInfo)
+LegacyConversationInfo = _legacy_class(ConversationInfo)
+
+
+def build_group_message(
+    i: int,
+    event_cls: type,
+    seg_cls: type,
+    user_cls: type,
+    conversation_cls: type,
+) -> Any:
+    """构建一条典型的群消息：元数据 + 文本 + @ + 表情 + 图片，共 5 个 Seg."""
+    return event_cls(
+        event_id=f"event-{i:08d}",
+        event_type="message.qq.group.normal",
+        time=1678886400123.0 + i,
+        bot_id="10001",
+        content=[
+            seg_cls(type="message_metadata", data={"message_id": f"msg-{i}"}),
+            seg_cls(type="text", data={"text": f"第 {i} 条消息，大家好！"}),
+            seg_cls(type="at", data={"user_id": "user_2", "display_name": "王五"}),
+            seg_cls(type="face", data={"id": "66"}),
+            seg_cls(type="image", data={"hash": f"h{i % 50}", "mime_type": "image/png"}),
+        ],
+        user_info=user_cls(user_id=f"user_{i % 20}", user_nickname="李四"),
+        conversation_info=conversation_cls(
+            conversation_id="group123", type="group", name="AIcarus测试群"
+        ),
+    )
+
+
+def measure(factory: Callable[[int], Any], count: int) -> float:
+    """测量 count 个事件常驻内存时平均每个事件占用的字节数."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    events = [factory(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return (after - before) / count
+
+
+def main() -> None:
+    """运行内存基准并打印结果."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    legacy = measure(
+        lambda i: build_group_message(
+            i, LegacyEvent, LegacySeg, LegacyUserInfo, LegacyConversationInfo
+        ),
+        count,
+    )
+    slotted = measure(
+        lambda i: build_group_message(i, Event, Seg, UserInfo, ConversationInfo), count
+    )
+
+    dicts = [
+        build_group_message(i, Event, Seg, UserInfo, ConversationInfo).to_dict()
+        for i in range(count)
+    ]
+    decoded = measure(lambda i: Event.from_dict(dicts[i]), count)
+    enable_interning()
+    interned = measure(lambda i: Event.from_dict(dicts[i]), count)
+    disable_interning()
+
+    print(f"事件数量: {count}（每个事件 5 个 Seg）")
+    print(f"  普通 dataclass  : {legacy:8.1f} 字节/事件")
+    print(f"  __slots__ 版本  : {slotted:8.1f} 字节/事件")
+    print(f"  节省            : {legacy - slotted:8.1f} 字节/事件 ({1 - slotted / legacy:.1%})")
+    print(f"  from_dict 解码  : {decoded:8.1f} 字节/事件")
+    print(f"  开启驻留后解码  : {interned:8.1f} 字节/事件")
+
+
+if __name__ == "__main__":
+    main()
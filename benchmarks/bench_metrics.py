@@ -0,0 +1,62 @@
+"""AIcarus-Message-Protocol 指标统计开销基准.
+
+在同一进程中交替测量关闭统计和开启统计时 to_dict、from_dict、JSON 编解码、校验和构建的
+单次耗时，给出开启统计带来的额外开销；最后打印一段 Prometheus 文本输出作为示例.
+
+运行方式:
+    python benchmarks/bench_metrics.py [循环次数]
+"""
+
+import os
+import sys
+import timeit
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from payloads import build_event, build_segs, seg_specs
+
+from aicarus_protocols import Event, EventValidator, collect_metrics, disable_metrics
+
+# 每个用例交替测量的轮数，取每种状态下的最小值
+ROUNDS = 5
+
+
+def main() -> None:
+    """运行指标统计开销基准并打印结果."""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    segs = build_segs(seg_specs("small_chat"))
+    event = build_event(segs)
+    event_dict = event.to_dict()
+    payload = event.to_json_bytes()
+    validator = EventValidator()
+    cases = {
+        "to_dict": event.to_dict,
+        "from_dict": lambda: Event.from_dict(event_dict),
+        "to_json_bytes": event.to_json_bytes,
+        "from_json_bytes": lambda: Event.from_json_bytes(payload),
+        "validate": lambda: validator.validate(event),
+        "create_message_event": lambda: build_event(segs),
+    }
+
+    disable_metrics()
+    print(f"small_chat 负载，每轮 {number} 次，取 {ROUNDS} 轮最小值")
+    print(f"  {'操作':<22} {'关闭 ns/次':>12} {'开启 ns/次':>12} {'额外开销':>10}")
+    for name, func in cases.items():
+        timer = timeit.Timer(func)
+        disabled = enabled = float("inf")
+        for _ in range(ROUNDS):
+            disabled = min(disabled, timer.timeit(number) / number * 1e9)
+            with collect_metrics():
+                enabled = min(enabled, timer.timeit(number) / number * 1e9)
+        print(f"  {name:<22} {disabled:12,.0f} {enabled:12,.0f} {enabled - disabled:+10,.0f}")
+
+    with collect_metrics() as recorder:
+        Event.from_json_bytes(payload)
+        lines = recorder.to_prometheus().splitlines()
+    print("\nPrometheus 输出示例:")
+    print("\n".join(line for line in lines if "_count" in line or line.startswith("# TYPE")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""AIcarus-Message-Protocol 动作响应关联基准.
+
+同时有大量动作在途时，比较 PendingActions（一个堆加一个定时器）与
+每个动作一个 asyncio.wait_for 任务的做法：
+
+*   登记并按时响应：每秒能完成多少个动作.
+*   全部超时：所有动作到期后多久能全部以超时结束.
+
+运行方式:
+    python benchmarks/bench_pending_actions.py [在途动作数量]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import (
+    ActionTimeoutError,
+    Event,
+    EventBuilder,
+    PendingActions,
+    Seg,
+)
+
+TIMEOUT = 0.5
+
+
+def build_actions(count: int) -> tuple[list[Event], list[Event]]:
+    """构建 count 个动作事件及各自的成功响应."""
+    actions = [
+        Event(
+            event_id=EventBuilder.generate_event_id(),
+            event_type="action.qq.send_message",
+            time=EventBuilder.get_current_timestamp(),
+            bot_id="10001",
+            content=[Seg("action.qq.send_message", {"segments": [{"type": "text", "data": {}}]})],
+        )
+        for _ in range(count)
+    ]
+    responses = [EventBuilder.create_action_response_event("success", action) for action in actions]
+    return actions, responses
+
+
+async def pending_resolve(actions: list[Event], responses: list[Event]) -> float:
+    """PendingActions：登记全部动作，再逐个响应并等待结果."""
+    pending = PendingActions(default_timeout=60.0)
+    started = time.perf_counter()
+    futures = [pending.register(action) for action in actions]
+    for response in responses:
+        pending.resolve(response)
+    await asyncio.gather(*futures)
+    return time.perf_counter() - started
+
+
+async def wait_for_resolve(actions: list[Event], responses: list[Event]) -> float:
+    """对照组：每个动作一个 asyncio.wait_for 任务."""
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    futures: dict[str, asyncio.Future[Event]] = {}
+    tasks = []
+    for action in actions:
+        future = futures[action.event_id] = loop.create_future()
+        tasks.append(asyncio.create_task(asyncio.wait_for(future, 60.0)))
+    await asyncio.sleep(0)
+    for action, response in zip(actions, responses, strict=True):
+        futures.pop(action.event_id).set_result(response)
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - started
+
+
+async def pending_expire(actions: list[Event]) -> float:
+    """PendingActions：全部动作超时，计时从截止时间开始."""
+    pending = PendingActions(default_timeout=TIMEOUT)
+    futures = [pending.register(action) for action in actions]
+    deadline = time.perf_counter() + TIMEOUT
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    assert all(isinstance(result, ActionTimeoutError) for result in results)
+    return time.perf_counter() - deadline
+
+
+async def wait_for_expire(actions: list[Event]) -> float:
+    """对照组：每个动作一个 asyncio.wait_for 任务，全部超时."""
+    loop = asyncio.get_running_loop()
+    tasks = [asyncio.create_task(asyncio.wait_for(loop.create_future(), TIMEOUT)) for _ in actions]
+    deadline = time.perf_counter() + TIMEOUT
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, TimeoutError) for result in results)
+    return time.perf_counter() - deadline
+
+
+async def run(count: int) -> None:
+    """运行各项对比并打印结果."""
+    actions, responses = build_actions(count)
+
+    pending_seconds = await pending_resolve(actions, responses)
+    wait_for_seconds = await wait_for_resolve(actions, responses)
+    print("登记并按时响应:")
+    print(f"  PendingActions : {count / pending_seconds:12,.0f} 动作/秒")
+    print(f"  wait_for 任务  : {count / wait_for_seconds:12,.0f} 动作/秒")
+
+    pending_seconds = await pending_expire(actions)
+    wait_for_seconds = await wait_for_expire(actions)
+    print("全部超时（到期后结束全部动作所需时间）:")
+    print(f"  PendingActions : {pending_seconds * 1000:8.1f} ms")
+    print(f"  wait_for 任务  : {wait_for_seconds * 1000:8.1f} ms")
+
+
+def main() -> None:
+    """运行动作响应关联基准并打印结果."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"{count} 个在途动作")
+    asyncio.run(run(count))
+
+
+if __name__ == "__main__":
+    main()
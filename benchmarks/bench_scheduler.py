@@ -0,0 +1,183 @@
+"""AIcarus-Message-Protocol 优先级调度基准.
+
+*   突发模拟：用模拟时钟按毫秒推进，处理方每毫秒处理固定数量的事件，平时到达消息、通知和
+    动作响应，每隔一段时间突然涌入一大批通知. 比较单个 FIFO 队列与 EventScheduler 中
+    各类事件的排队时间 p50 / p99 和丢弃数.
+*   开销：EventScheduler 与 deque、AsyncEventScheduler 与 asyncio.Queue 每秒的入队加出队次数.
+
+运行方式:
+    python benchmarks/bench_scheduler.py [模拟毫秒数]
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections import deque
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import AsyncEventScheduler, Event, EventScheduler
+
+# 处理方每毫秒处理的事件数
+SERVICE_RATE = 10
+# 每隔多少毫秒涌入一批通知，以及每批的数量
+BURST_INTERVAL = 500
+BURST_SIZE = 3000
+EVENT_TYPES = {
+    "message": "message.qq.group.normal",
+    "notice": "notice.qq.group.member_increase",
+    "action_response": "action_response.qq.success",
+}
+
+
+def make_event(kind: str, index: int) -> Event:
+    """构建一个指定类别的空事件."""
+    return Event(
+        event_id=str(index),
+        event_type=EVENT_TYPES[kind],
+        time=0.0,
+        bot_id="10001",
+        content=[],
+    )
+
+
+def arrivals(duration: int, seed: int) -> list[list[Event]]:
+    """生成每毫秒到达的事件：平时每毫秒约 4 条消息、3 条通知、1 个动作响应，外加周期性的通知洪峰."""
+    rng = random.Random(seed)
+    ticks = []
+    index = 0
+    for tick in range(duration):
+        batch = []
+        counts = {"message": 4, "notice": 3, "action_response": 1}
+        if tick % BURST_INTERVAL == 0:
+            counts["notice"] += BURST_SIZE
+        for kind, count in counts.items():
+            for _ in range(count if kind == "notice" else rng.randint(0, 2 * count)):
+                batch.append(make_event(kind, index))
+                index += 1
+        rng.shuffle(batch)
+        ticks.append(batch)
+    return ticks
+
+
+def report(name: str, waits: dict[str, list[float]], dropped: int) -> None:
+    """打印各类事件的排队时间分位数."""
+    print(f"  {name}（丢弃 {dropped}）:")
+    for kind, values in waits.items():
+        if len(values) < 2:
+            continue
+        quantiles = statistics.quantiles(values, n=100)
+        print(
+            f"    {kind:16s} {len(values):7d} 个，"
+            f"p50 {quantiles[49]:7.1f} ms，p99 {quantiles[98]:7.1f} ms"
+        )
+
+
+def simulate_fifo(ticks: list[list[Event]]) -> None:
+    """单个无界 FIFO 队列."""
+    queue: deque[tuple[float, Event]] = deque()
+    waits: dict[str, list[float]] = {kind: [] for kind in EVENT_TYPES}
+    for now, batch in enumerate(ticks):
+        queue.extend((now, event) for event in batch)
+        for _ in range(min(SERVICE_RATE, len(queue))):
+            enqueued_at, event = queue.popleft()
+            waits[event.type_path.prefix].append(now - enqueued_at)
+    report("FIFO", waits, 0)
+
+
+def simulate_scheduler(ticks: list[list[Event]]) -> None:
+    """默认类别的 EventScheduler，模拟时钟以毫秒为单位."""
+    clock = [0.0]
+    scheduler = EventScheduler(clock=lambda: clock[0], starvation_timeout=1000.0)
+    waits: dict[str, list[float]] = {kind: [] for kind in EVENT_TYPES}
+    enqueued_at: dict[int, float] = {}
+    for now, batch in enumerate(ticks):
+        clock[0] = now
+        for event in batch:
+            if scheduler.offer(event):
+                enqueued_at[id(event)] = now
+        for _ in range(SERVICE_RATE):
+            event = scheduler.poll()
+            if event is None:
+                break
+            waits[event.type_path.prefix].append(now - enqueued_at.pop(id(event)))
+    stats = scheduler.stats()
+    dropped = sum(int(values["dropped"] + values["rejected"]) for values in stats.values())
+    report("EventScheduler", waits, dropped)
+
+
+def bench_sync(events: list[Event]) -> None:
+    """EventScheduler 与 deque 的入队加出队开销."""
+    started = time.perf_counter()
+    queue: deque[Event] = deque()
+    for event in events:
+        queue.append(event)
+    while queue:
+        queue.popleft()
+    deque_seconds = time.perf_counter() - started
+
+    scheduler = EventScheduler(starvation_timeout=None)
+    started = time.perf_counter()
+    for event in events:
+        scheduler.offer(event)
+    while scheduler.poll() is not None:
+        pass
+    scheduler_seconds = time.perf_counter() - started
+    print(f"  deque                : {len(events) / deque_seconds:12,.0f} 次/秒")
+    print(f"  EventScheduler       : {len(events) / scheduler_seconds:12,.0f} 次/秒")
+
+
+async def bench_async(events: list[Event]) -> None:
+    """AsyncEventScheduler 与 asyncio.Queue 的生产者/消费者开销."""
+    queue: asyncio.Queue[Event | None] = asyncio.Queue(maxsize=1024)
+
+    async def drain_queue() -> None:
+        while await queue.get() is not None:
+            pass
+
+    started = time.perf_counter()
+    consumer = asyncio.create_task(drain_queue())
+    for event in events:
+        await queue.put(event)
+    await queue.put(None)
+    await consumer
+    queue_seconds = time.perf_counter() - started
+
+    scheduler = AsyncEventScheduler()
+
+    async def drain_scheduler() -> None:
+        async for _ in scheduler:
+            pass
+
+    started = time.perf_counter()
+    consumer = asyncio.create_task(drain_scheduler())
+    for event in events:
+        await scheduler.put(event)
+    scheduler.close()
+    await consumer
+    scheduler_seconds = time.perf_counter() - started
+    print(f"  asyncio.Queue        : {len(events) / queue_seconds:12,.0f} 次/秒")
+    print(f"  AsyncEventScheduler  : {len(events) / scheduler_seconds:12,.0f} 次/秒")
+
+
+def main() -> None:
+    """运行调度基准并打印结果."""
+    duration = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ticks = arrivals(duration, seed=1)
+    total = sum(map(len, ticks))
+    print(f"模拟 {duration} ms，共 {total} 个事件，处理能力 {SERVICE_RATE} 个/ms")
+    simulate_fifo(ticks)
+    simulate_scheduler(ticks)
+
+    events = [event for batch in ticks for event in batch][:200000]
+    print(f"开销（{len(events)} 个事件）:")
+    bench_sync(events)
+    asyncio.run(bench_async(events))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""AIcarus-Message-Protocol 连接级上下文增量编码基准.
+
+模拟一条适配器连接上的群聊流量（少数几个会话、几十个活跃用户），
+对比普通 JSON 编码与 SessionEncoder 的字节数和编解码耗时.
+
+运行方式:
+    python benchmarks/bench_session.py [事件数量]
+"""
+
+import os
+import random
+import sys
+import time
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import (
+    ConversationInfo,
+    ConversationType,
+    Event,
+    SegBuilder,
+    SessionDecoder,
+    SessionEncoder,
+    UserInfo,
+    disable_interning,
+    enable_interning,
+)
+
+
+def build_events(count: int) -> list[Event]:
+    """构建一段群聊流量."""
+    rng = random.Random(42)
+    conversations = [
+        ConversationInfo(
+            conversation_id=f"group_{i}",
+            type=ConversationType.GROUP,
+            name=f"测试群聊 {i}",
+            extra={"member_count": 300 + i},
+        )
+        for i in range(3)
+    ]
+    users = [
+        UserInfo(
+            user_id=f"user_{i}",
+            user_nickname=f"用户{i}",
+            user_cardname=f"群名片{i}",
+            permission_level="member",
+            role="member",
+            level="10",
+        )
+        for i in range(40)
+    ]
+    return [
+        Event(
+            event_id=f"event_{i}",
+            event_type="message.qq.group.normal",
+            time=1678886400000.0 + i,
+            bot_id="10001",
+            content=[SegBuilder.text(f"第 {i} 条消息")],
+            user_info=rng.choice(users),
+            conversation_info=rng.choice(conversations),
+        )
+        for i in range(count)
+    ]
+
+
+def measure(events: list[Event]) -> None:
+    """编解码一遍事件并打印字节数和耗时."""
+    count = len(events)
+    started = time.perf_counter()
+    plain = [event.to_json_bytes() for event in events]
+    plain_encode = time.perf_counter() - started
+    started = time.perf_counter()
+    for data in plain:
+        Event.from_json_bytes(data)
+    plain_decode = time.perf_counter() - started
+
+    encoder, decoder = SessionEncoder(), SessionDecoder()
+    started = time.perf_counter()
+    delta = [encoder.encode(event) for event in events]
+    delta_encode = time.perf_counter() - started
+    started = time.perf_counter()
+    decoded = [decoder.decode(data) for data in delta]
+    delta_decode = time.perf_counter() - started
+    assert decoded == events
+
+    plain_bytes = sum(map(len, plain))
+    delta_bytes = sum(map(len, delta))
+    print(f"  引用命中 {encoder.hits} 次，完整发送 {encoder.misses} 次")
+    print(f"  普通 JSON : {plain_bytes / count:7.1f} 字节/事件")
+    print(f"  增量编码  : {delta_bytes / count:7.1f} 字节/事件 ({delta_bytes / plain_bytes:.0%})")
+    us = 1e6 / count
+    print(f"  编码耗时  : {plain_encode * us:6.2f} -> {delta_encode * us:6.2f} µs/事件")
+    print(f"  解码耗时  : {plain_decode * us:6.2f} -> {delta_decode * us:6.2f} µs/事件")
+
+
+def main() -> None:
+    """运行增量编码基准并打印结果."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"{count} 个事件，未开启驻留:")
+    measure(build_events(count))
+
+    # 开启驻留后发送端的上下文对象和接收端解码出的对象都是共享实例
+    enable_interning()
+    try:
+        print(f"{count} 个事件，开启驻留:")
+        measure([Event.from_dict(event.to_dict()) for event in build_events(count)])
+    finally:
+        disable_interning()
+
+
+if __name__ == "__main__":
+    main()
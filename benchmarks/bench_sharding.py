@@ -0,0 +1,95 @@
+"""AIcarus-Message-Protocol 多进程分片流水线基准.
+
+模拟一个每个事件需要几十微秒纯 Python 计算的插件，分别在主进程中直接处理，以及用
+ShardedPipeline 分到 1、2、4 …… 直到 CPU 核数个工作进程中处理，比较每秒处理的事件数.
+事件分布在 1000 个群聊中，同一群聊的事件保持顺序.
+
+运行方式:
+    python benchmarks/bench_sharding.py [事件数量]
+"""
+
+import os
+import sys
+import time
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import (
+    ConversationInfo,
+    ConversationType,
+    Event,
+    EventBuilder,
+    SegBuilder,
+    ShardedPipeline,
+    UserInfo,
+)
+
+CONVERSATIONS = 1000
+# 每个事件的模拟计算量
+WORK_ROUNDS = 40
+
+
+def plugin(event: Event) -> int:
+    """模拟插件：对消息文本做若干轮纯 Python 计算."""
+    text = event.get_text_content()
+    checksum = 0
+    for _ in range(WORK_ROUNDS):
+        for char in text:
+            checksum = (checksum * 31 + ord(char)) & 0xFFFFFFFF
+    return checksum
+
+
+def build_events(count: int) -> list[Event]:
+    """构建分布在多个群聊中的消息事件."""
+    return [
+        EventBuilder.create_message_event(
+            event_type="message.qq.group.normal",
+            bot_id="10001",
+            message_id=str(i),
+            content_segs=[SegBuilder.text(f"第 {i} 条消息，今天天气不错，我们去吃饭吧")],
+            user_info=UserInfo(user_id=str(10000 + i % 5000), user_nickname="用户"),
+            conversation_info=ConversationInfo(
+                conversation_id=str(900000 + i % CONVERSATIONS), type=ConversationType.GROUP
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def worker_counts() -> list[int]:
+    """1、2、4 …… 直到 CPU 核数."""
+    cores = os.cpu_count() or 1
+    counts = []
+    workers = 1
+    while workers < cores:
+        counts.append(workers)
+        workers *= 2
+    counts.append(cores)
+    return counts
+
+
+def main() -> None:
+    """运行分片流水线基准并打印结果."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    events = build_events(count)
+    print(f"{count} 个事件，{CONVERSATIONS} 个群聊，CPU 核数 {os.cpu_count()}")
+
+    started = time.perf_counter()
+    for event in events:
+        plugin(event)
+    inline = count / (time.perf_counter() - started)
+    print(f"  主进程直接处理 : {inline:9,.0f} 事件/秒")
+
+    for workers in worker_counts():
+        with ShardedPipeline(plugin, workers=workers) as pipeline:
+            started = time.perf_counter()
+            for event in events:
+                pipeline.submit(event)
+            pipeline.flush()
+            rate = count / (time.perf_counter() - started)
+        print(f"  {workers:3d} 个工作进程  : {rate:9,.0f} 事件/秒 ({rate / inline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""AIcarus-Message-Protocol asyncio 传输基准.
+
+在本机启动回显服务器，分别用 1、10、100 个并发连接测量：
+
+*   吞吐：每个连接流水线式发送事件并接收回显，统计每秒往返的事件数.
+*   延迟：每个连接逐个发送事件并等待回显，统计往返延迟的 p50 / p99.
+
+运行方式:
+    python benchmarks/bench_transport.py [每轮事件总数]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_json import build_sample_event
+
+from aicarus_protocols import EventConnection, connect, serve
+
+CONNECTION_COUNTS = (1, 10, 100)
+
+
+async def echo(conn: EventConnection) -> None:
+    """把收到的事件原样发回."""
+    async for event in conn:
+        await conn.send(event)
+
+
+async def pipelined(conn: EventConnection, count: int) -> None:
+    """流水线式发送 count 个事件并接收全部回显."""
+    event = build_sample_event()
+
+    async def sender() -> None:
+        for _ in range(count):
+            await conn.send(event)
+
+    task = asyncio.create_task(sender())
+    for _ in range(count):
+        await conn.recv()
+    await task
+
+
+async def ping_pong(conn: EventConnection, count: int, latencies: list[float]) -> None:
+    """逐个发送事件并记录往返延迟."""
+    event = build_sample_event()
+    for _ in range(count):
+        started = time.perf_counter()
+        await conn.send(event)
+        await conn.recv()
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(total: int) -> None:
+    """对每种并发连接数运行吞吐和延迟测试."""
+    server = await serve(echo, "127.0.0.1", 0)
+    try:
+        for clients in CONNECTION_COUNTS:
+            conns = [await connect("127.0.0.1", server.port) for _ in range(clients)]
+            per_conn = max(1, total // clients)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(pipelined(conn, per_conn) for conn in conns))
+            elapsed = time.perf_counter() - started
+            throughput = per_conn * clients / elapsed
+
+            latencies: list[float] = []
+            rounds = max(1, per_conn // 10)
+            await asyncio.gather(*(ping_pong(conn, rounds, latencies) for conn in conns))
+            quantiles = statistics.quantiles(latencies, n=100)
+            p50, p99 = quantiles[49] * 1e6, quantiles[98] * 1e6
+
+            print(
+                f"  {clients:3d} 个连接: {throughput:9,.0f} 事件/秒，"
+                f"往返延迟 p50 {p50:7.0f} µs，p99 {p99:7.0f} µs"
+            )
+            for conn in conns:
+                await conn.close()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    """运行传输基准并打印结果."""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"每轮 {total} 个事件，本机回显")
+    asyncio.run(run(total))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""AIcarus-Message-Protocol 事件结构校验基准.
+
+测量 EventValidator 校验一个 Event 对象和一个尚未解析的事件字典的单次开销，
+并与仅校验 event_type 字符串的 validate_event_type 对照.
+
+运行方式:
+    python benchmarks/bench_validate.py [循环次数]
+"""
+
+import os
+import sys
+import timeit
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_json import build_sample_event
+
+from aicarus_protocols import Event, EventValidator, Seg, validate_event_type
+
+
+def main() -> None:
+    """运行校验基准并打印结果."""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    validator = EventValidator()
+    message = build_sample_event()
+    message_dict = message.to_dict()
+    notice = Event(
+        event_id="e-notice",
+        event_type="notice.qq.group.member_increase",
+        time=1678886400123.0,
+        bot_id="10001",
+        content=[Seg("notice.qq.group.member_increase", {"user_id": "u1", "operator_id": "u2"})],
+    )
+    action = Event(
+        event_id="e-action",
+        event_type="action.qq.kick_member",
+        time=1678886400123.0,
+        bot_id="10001",
+        content=[Seg("action_params", {"group_id": "g1", "user_id": "u1"})],
+    )
+    for event in (message, message_dict, notice, action):
+        assert validator.is_valid(event)
+
+    cases = {
+        "validate_event_type only": lambda: validate_event_type(message.event_type),
+        "message Event": lambda: validator.validate(message),
+        "message dict": lambda: validator.validate(message_dict),
+        "notice Event": lambda: validator.validate(notice),
+        "action Event": lambda: validator.validate(action),
+    }
+    print(f"循环 {number} 次")
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        per_event = seconds / number
+        print(f"  {name:<26}: {per_event * 1e6:6.2f} µs/事件 (约 {1 / per_event:,.0f} 事件/秒)")
+
+
+if __name__ == "__main__":
+    main()
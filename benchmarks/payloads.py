@@ -0,0 +1,177 @@
+"""AIcarus-Message-Protocol 基准测试用的事件负载生成器.
+
+所有负载都由固定种子的 random.Random 生成，同一版本的代码每次得到完全相同的事件：
+
+*   small_chat：一两句文本，偶尔带 @ 或表情的普通群聊消息.
+*   long_forward：合并转发的聊天记录，一个 forward Seg 中嵌套上百条消息.
+*   flat_forward：展开为几百个顶层 Seg 的合并转发，文本、@、表情和图片交替出现.
+*   media_heavy：多张内联 Base64 缩略图和带长 URL 的图片、视频.
+"""
+
+import base64
+import os
+import random
+import sys
+from collections.abc import Callable
+from typing import Any
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import (
+    ConversationInfo,
+    ConversationType,
+    Event,
+    EventBuilder,
+    Seg,
+    SegBuilder,
+    UserInfo,
+)
+
+WORDS = ("你好", "今天", "天气", "不错", "吃了吗", "哈哈哈", "收到", "ok", "明天见", "👍", "123")
+
+# 构建一个 Seg 所需的 (构建函数, 关键字参数)
+SegSpec = tuple[Callable[..., Seg], dict[str, Any]]
+
+
+def forward(**data: Any) -> Seg:
+    """构建合并转发 Seg；SegBuilder 中没有对应的方法."""
+    return Seg(type="forward", data=data)
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    """随机拼接若干个词."""
+    return "".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+def _small_chat(rng: random.Random) -> list[SegSpec]:
+    specs: list[SegSpec] = [(SegBuilder.text, {"text": _sentence(rng, 2, 12)})]
+    if rng.random() < 0.3:
+        specs.insert(0, (SegBuilder.at, {"user_id": "10086", "display_name": "群友"}))
+    if rng.random() < 0.2:
+        specs.append((SegBuilder.face, {"face_id": str(rng.randint(1, 300))}))
+    return specs
+
+
+def _long_forward(rng: random.Random) -> list[SegSpec]:
+    messages = [
+        {
+            "user_id": str(10000 + rng.randint(0, 50)),
+            "nickname": f"用户{rng.randint(0, 50)}",
+            "time": 1678886400000 + i * 1000,
+            "content": [
+                SegBuilder.text(_sentence(rng, 1, 20)).to_dict(),
+                *([SegBuilder.face(str(rng.randint(1, 300))).to_dict()] if i % 7 == 0 else []),
+            ],
+        }
+        for i in range(150)
+    ]
+    return [
+        (SegBuilder.reply, {"message_id": "platform_msg_1"}),
+        (SegBuilder.text, {"text": "看看这段聊天记录"}),
+        (forward, {"id": f"forward_{rng.getrandbits(32):x}", "messages": messages}),
+    ]
+
+
+def _flat_forward(rng: random.Random) -> list[SegSpec]:
+    specs: list[SegSpec] = [(SegBuilder.reply, {"message_id": "platform_msg_1"})]
+    for _ in range(200):
+        specs.append((SegBuilder.text, {"text": _sentence(rng, 1, 20)}))
+        if rng.random() < 0.5:
+            specs.append((SegBuilder.at, {"user_id": str(10000 + rng.randint(0, 50))}))
+        if rng.random() < 0.4:
+            specs.append((SegBuilder.face, {"face_id": str(rng.randint(1, 300))}))
+        if rng.random() < 0.2:
+            image = {"hash": f"{rng.getrandbits(128):032x}", "mime_type": "image/png"}
+            specs.append((SegBuilder.image, image))
+    return specs
+
+
+def _media_heavy(rng: random.Random) -> list[SegSpec]:
+    specs: list[SegSpec] = [(SegBuilder.text, {"text": "今天拍的照片和视频"})]
+    for i in range(8):
+        thumbnail = base64.b64encode(rng.randbytes(3072)).decode("ascii")
+        specs.append(
+            (
+                SegBuilder.image,
+                {
+                    "hash": f"{rng.getrandbits(128):032x}",
+                    "mime_type": "image/jpeg",
+                    "url": f"https://multimedia.example.com/download?fileid={rng.getrandbits(256):x}",
+                    "base64": thumbnail if i < 4 else None,
+                    "summary": "[图片]",
+                },
+            )
+        )
+    for _ in range(2):
+        specs.append(
+            (
+                SegBuilder.video,
+                {
+                    "hash": f"{rng.getrandbits(128):032x}",
+                    "mime_type": "video/mp4",
+                    "url": f"https://multimedia.example.com/video?fileid={rng.getrandbits(256):x}",
+                    "file_id": f"{rng.getrandbits(64):x}",
+                },
+            )
+        )
+    return specs
+
+
+PAYLOAD_KINDS: dict[str, Callable[[random.Random], list[SegSpec]]] = {
+    "small_chat": _small_chat,
+    "long_forward": _long_forward,
+    "flat_forward": _flat_forward,
+    "media_heavy": _media_heavy,
+}
+
+
+def seg_specs(kind: str, seed: int = 0) -> list[SegSpec]:
+    """生成某种负载的 Seg 构建参数.
+
+    Args:
+        kind (str): PAYLOAD_KINDS 中的负载名称.
+        seed (int): 随机种子.
+
+    Returns:
+        list[SegSpec]: 按顺序构建各个 Seg 所需的 (构建函数, 关键字参数).
+    """
+    return PAYLOAD_KINDS[kind](random.Random(f"{kind}:{seed}"))
+
+
+def build_segs(specs: list[SegSpec]) -> list[Seg]:
+    """按构建参数调用 SegBuilder 得到 Seg 列表."""
+    return [build(**kwargs) for build, kwargs in specs]
+
+
+def build_event(segs: list[Seg]) -> Event:
+    """用 EventBuilder 构建一条带发送者和群聊信息的消息事件."""
+    return EventBuilder.create_message_event(
+        event_type="message.qq.group.normal",
+        bot_id="10001",
+        message_id="platform_msg_789",
+        content_segs=segs,
+        user_info=UserInfo(
+            user_id="user_sender_456",
+            user_nickname="李四",
+            user_cardname="测试群名片",
+            role="member",
+            level="12",
+        ),
+        conversation_info=ConversationInfo(
+            conversation_id="group123", type=ConversationType.GROUP, name="AIcarus测试群"
+        ),
+    )
+
+
+def build_payload(kind: str, seed: int = 0) -> Event:
+    """生成某种负载的完整事件.
+
+    Args:
+        kind (str): PAYLOAD_KINDS 中的负载名称.
+        seed (int): 随机种子.
+
+    Returns:
+        Event: 生成的消息事件.
+    """
+    return build_event(build_segs(seg_specs(kind, seed)))
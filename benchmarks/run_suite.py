@@ -0,0 +1,280 @@
+"""AIcarus-Message-Protocol 基准测试套件.
+
+覆盖包中的热点路径，离线运行，结果可以保存为 JSON 并与基线比较：
+
+*   Seg、UserInfo、ConversationInfo、Event 的 to_dict / from_dict.
+*   JSON 往返：Event.to_json_bytes / from_json_bytes，以及 json.dumps / json.loads 对照.
+*   SegBuilder 和 EventBuilder 构建.
+*   validate_event_type（带缓存和不带缓存），EventTypeRegistry 的 register 与各种查询.
+*   utils 中的文本提取和按类型扫描.
+
+与负载有关的用例分别在 payloads.py 的每种负载上运行.
+每个用例先校准循环次数，再重复计时，报告最小值（纳秒/次）. 与基线比较时，任一用例
+比基线慢超过阈值即视为性能回退，脚本以退出码 1 结束，可直接用于 CI.
+
+运行方式:
+    python benchmarks/run_suite.py                               # 运行全部用例并打印
+    python benchmarks/run_suite.py --output results.json         # 同时保存 JSON 结果
+    python benchmarks/run_suite.py --save-baseline               # 保存为 benchmarks/baseline.json
+    python benchmarks/run_suite.py --baseline benchmarks/baseline.json --threshold 0.2
+    python benchmarks/run_suite.py --filter json --quick         # 只运行名称含 json 的用例
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from payloads import PAYLOAD_KINDS, build_event, build_segs, seg_specs
+
+import aicarus_protocols
+from aicarus_protocols import (
+    ConversationInfo,
+    Event,
+    Seg,
+    UserInfo,
+    extract_text_from_content,
+    filter_segs_by_type,
+    find_seg_by_type,
+    validate_event_type,
+)
+from aicarus_protocols.event_type import EventTypeRegistry, _check_event_type
+from aicarus_protocols.json_codec import JSON_BACKEND
+
+# 结果文件格式版本
+SCHEMA_VERSION = 1
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.2
+
+PLATFORMS = ("qq", "wechat", "telegram", "discord")
+EVENT_TYPES = [
+    *(f"message.{p}.{kind}" for p in PLATFORMS for kind in ("group.normal", "private.friend")),
+    *(f"notice.{p}.group.{kind}" for p in PLATFORMS for kind in ("member_increase", "recall")),
+    *(f"request.{p}.friend.add" for p in PLATFORMS),
+    *(f"action.{p}.{kind}" for p in PLATFORMS for kind in ("send_message", "member.kick")),
+    *(f"action_response.{p}.success" for p in PLATFORMS),
+    "meta.lifecycle.connect",
+    "meta.system.heartbeat",
+    "message..invalid",
+    "unknown.qq.group",
+]
+
+
+def build_registry_types(count: int) -> list[str]:
+    """生成 count 个层级深浅不一的合法事件类型，用于注册表用例."""
+    prefixes = ("message", "notice", "request", "action", "action_response", "meta")
+    return [
+        f"{prefixes[i % len(prefixes)]}.{PLATFORMS[i % len(PLATFORMS)]}.group{i % 17}"
+        + "".join(f".level{depth}_{i}" for depth in range(i % 4))
+        for i in range(count)
+    ]
+
+
+def build_cases() -> dict[str, Callable[[], object]]:
+    """构建全部用例，键为用例名称."""
+    cases: dict[str, Callable[[], object]] = {}
+    for kind in PAYLOAD_KINDS:
+        specs = seg_specs(kind)
+        segs = build_segs(specs)
+        event = build_event(segs)
+        seg_dicts = [seg.to_dict() for seg in segs]
+        event_dict = event.to_dict()
+        payload = event.to_json_bytes()
+        indexed = build_event(build_segs(specs))
+        cases.update(
+            {
+                f"seg.to_dict[{kind}]": lambda segs=segs: [seg.to_dict() for seg in segs],
+                f"seg.from_dict[{kind}]": lambda data=seg_dicts: [Seg.from_dict(d) for d in data],
+                f"event.to_dict[{kind}]": event.to_dict,
+                f"event.from_dict[{kind}]": lambda data=event_dict: Event.from_dict(data),
+                f"json.encode[{kind}]": event.to_json_bytes,
+                f"json.decode[{kind}]": lambda data=payload: Event.from_json_bytes(data),
+                f"json.stdlib_roundtrip[{kind}]": lambda event=event: Event.from_dict(
+                    json.loads(json.dumps(event.to_dict(), ensure_ascii=False))
+                ),
+                f"builder.segs[{kind}]": lambda specs=specs: build_segs(specs),
+                f"builder.event[{kind}]": lambda segs=segs: build_event(segs),
+                f"utils.extract_text.list[{kind}]": lambda segs=segs: extract_text_from_content(
+                    segs
+                ),
+                f"utils.extract_text.event[{kind}]": lambda event=indexed: (
+                    extract_text_from_content(event)
+                ),
+                f"utils.find_seg.list[{kind}]": lambda segs=segs: find_seg_by_type(segs, "video"),
+                f"utils.find_seg.event[{kind}]": lambda event=indexed: find_seg_by_type(
+                    event, "video"
+                ),
+                f"utils.filter_segs.list[{kind}]": lambda segs=segs: filter_segs_by_type(
+                    segs, "image"
+                ),
+                f"utils.filter_segs.event[{kind}]": lambda event=indexed: filter_segs_by_type(
+                    event, "image"
+                ),
+                f"event.get_message_id[{kind}]": indexed.get_message_id,
+            }
+        )
+
+    sample = build_event(build_segs(seg_specs("small_chat")))
+    user_dict = sample.user_info.to_dict()
+    conversation_dict = sample.conversation_info.to_dict()
+    cases.update(
+        {
+            "user_info.to_dict": sample.user_info.to_dict,
+            "user_info.from_dict": lambda: UserInfo.from_dict(user_dict),
+            "conversation_info.to_dict": sample.conversation_info.to_dict,
+            "conversation_info.from_dict": lambda: ConversationInfo.from_dict(conversation_dict),
+            "event_type.validate": lambda: [validate_event_type(t) for t in EVENT_TYPES],
+            "event_type.validate_uncached": lambda: [_check_event_type(t) for t in EVENT_TYPES],
+        }
+    )
+
+    registry_types = build_registry_types(500)
+    registry = EventTypeRegistry()
+    for event_type in registry_types:
+        registry.register(event_type)
+    lookups = registry_types[::7] + [f"{t}.unregistered" for t in registry_types[::11]]
+
+    def register_all() -> EventTypeRegistry:
+        fresh = EventTypeRegistry()
+        for event_type in registry_types:
+            fresh.register(event_type)
+        return fresh
+
+    cases.update(
+        {
+            "registry.register[500]": register_all,
+            "registry.is_registered": lambda: [registry.is_registered(t) for t in lookups],
+            "registry.find_ancestor": lambda: [registry.find_ancestor(t) for t in lookups],
+            "registry.find_by_prefix": lambda: registry.find_by_prefix("notice.qq"),
+            "registry.match": lambda: registry.match("message.*.group3.**"),
+        }
+    )
+    return cases
+
+
+def measure(func: Callable[[], object], min_time: float, repeat: int) -> dict[str, Any]:
+    """校准循环次数使每次重复约耗时 min_time 秒，再重复 repeat 次计时."""
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time / 5:
+            break
+        number *= 10 if elapsed < min_time / 50 else 2
+    number = max(1, round(number * min_time / elapsed))
+    per_op = [seconds / number * 1e9 for seconds in timer.repeat(repeat, number)]
+    return {
+        "ns_per_op": min(per_op),
+        "median_ns": statistics.median(per_op),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def environment() -> dict[str, Any]:
+    """记录影响结果的运行环境."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "json_backend": JSON_BACKEND,
+        "package_version": aicarus_protocols.__version__,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(
+    results: dict[str, dict[str, Any]], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """打印与基线的对比，返回变慢超过阈值的用例名称."""
+    base_env = baseline.get("environment", {})
+    for key in ("python", "implementation", "machine", "json_backend"):
+        if base_env.get(key) != environment()[key]:
+            print(f"注意: 基线的 {key} 为 {base_env.get(key)!r}，与当前环境不同")
+    base_results = baseline.get("results", {})
+    regressions = []
+    print(f"\n与基线比较（阈值 ±{threshold:.0%}）:")
+    for name, result in results.items():
+        base = base_results.get(name)
+        if base is None:
+            print(f"  {name:<40} {'新增':>10}")
+            continue
+        ratio = result["ns_per_op"] / base["ns_per_op"]
+        if ratio > 1 + threshold:
+            status = "回退"
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold):
+            status = "提升"
+        else:
+            status = ""
+        print(f"  {name:<40} {ratio:9.2f}x {status}")
+    return regressions
+
+
+def main() -> None:
+    """运行基准测试套件."""
+    parser = argparse.ArgumentParser(description="AIcarus-Message-Protocol 基准测试套件")
+    parser.add_argument("--filter", default="", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--list", action="store_true", help="只列出用例名称")
+    parser.add_argument("--quick", action="store_true", help="缩短计时，适合快速检查")
+    parser.add_argument("--repeat", type=int, default=5, help="每个用例重复计时的次数")
+    parser.add_argument("--output", help="把结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="与该 JSON 基线比较")
+    parser.add_argument(
+        "--save-baseline",
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help=f"把结果保存为基线，默认写入 {DEFAULT_BASELINE}",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="变慢超过该比例视为回退，默认 0.2",
+    )
+    args = parser.parse_args()
+
+    cases = {name: func for name, func in build_cases().items() if args.filter in name}
+    if args.list:
+        print("\n".join(cases))
+        return
+    min_time = 0.02 if args.quick else 0.1
+    repeat = 3 if args.quick else args.repeat
+
+    env = environment()
+    print(f"Python {env['python']}，JSON 后端 {env['json_backend']}，{len(cases)} 个用例")
+    results: dict[str, dict[str, Any]] = {}
+    for name, func in cases.items():
+        results[name] = measure(func, min_time, repeat)
+        print(f"  {name:<40} {results[name]['ns_per_op']:>12,.0f} ns/次")
+
+    document = {"schema": SCHEMA_VERSION, "environment": env, "results": results}
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(document, f, ensure_ascii=False, indent=2)
+            print(f"结果已写入 {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("schema") != SCHEMA_VERSION:
+            raise SystemExit(f"基线格式版本 {baseline.get('schema')} 与当前 {SCHEMA_VERSION} 不同")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} 个用例回退: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
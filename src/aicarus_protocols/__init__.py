@@ -5,33 +5,143 @@
 """
 
 # 核心数据结构
-from .constants import PROTOCOL_VERSION, ConversationType, EventTypePrefix
+from .archive import EventArchive
+from .batch_codec import BatchDecoder, BatchFraming, encode_batch, iter_decode, iter_encode_batches
+from .binary_codec import BinaryDecoder, BinaryEncoder
+from .compression import DictionaryCompressor, train_dictionary
+from .constants import (
+    PROTOCOL_VERSION,
+    ConversationType,
+    EventIdStrategy,
+    EventTypePrefix,
+    MetricOperation,
+    OverflowPolicy,
+)
 from .conversation_info import ConversationInfo
-from .event import Event
+from .dedup import DuplicateFilter, RotatingBloomFilter
+from .dispatcher import EventDispatcher, Subscription
+from .event import Event, LazyEvent
+from .event_batch import EventBatch
 from .event_builder import EventBuilder
-from .event_type import EventType, validate_event_type
+from .event_type import EventType, EventTypePath, validate_event_type, validate_event_types
+from .interning import disable_interning, enable_interning, interning_stats
+from .media_store import (
+    DiskMediaStore,
+    MediaOffloader,
+    MediaStore,
+    MemoryMediaStore,
+    TieredMediaStore,
+)
+from .metrics import (
+    MetricsRecorder,
+    PrometheusTextfileExporter,
+    collect_metrics,
+    disable_metrics,
+    enable_metrics,
+    metrics_snapshot,
+)
+from .pending_actions import ActionTimeoutError, PendingActions
+from .scheduler import (
+    AsyncEventScheduler,
+    EventScheduler,
+    PriorityClass,
+    ThreadSafeEventScheduler,
+)
 
 # 构建器和常量
-from .seg import Seg, SegBuilder
+from .seg import Seg, SegBuilder, SegList
+from .session_codec import SessionDecoder, SessionEncoder
+from .sharding import ShardedPipeline, ShardWorkerError, shard_key
+from .transport import (
+    ConnectionClosedError,
+    EventConnection,
+    EventServer,
+    TransportOptions,
+    connect,
+    serve,
+)
 from .user_info import UserInfo
 
 # 工具函数
 from .utils import extract_text_from_content, filter_segs_by_type, find_seg_by_type
+from .validator import (
+    EventValidationError,
+    EventValidator,
+    ValidationIssue,
+    validate_event,
+)
 
 __version__ = "1.6.0"
 __all__ = [
     "PROTOCOL_VERSION",
+    "ActionTimeoutError",
+    "AsyncEventScheduler",
+    "BatchDecoder",
+    "BatchFraming",
+    "BinaryDecoder",
+    "BinaryEncoder",
+    "ConnectionClosedError",
     "ConversationInfo",
     "ConversationType",
+    "DictionaryCompressor",
+    "DiskMediaStore",
+    "DuplicateFilter",
     "Event",
+    "EventArchive",
+    "EventBatch",
     "EventBuilder",
+    "EventConnection",
+    "EventDispatcher",
+    "EventIdStrategy",
+    "EventScheduler",
+    "EventServer",
     "EventType",
+    "EventTypePath",
     "EventTypePrefix",
+    "EventValidationError",
+    "EventValidator",
+    "LazyEvent",
+    "MediaOffloader",
+    "MediaStore",
+    "MemoryMediaStore",
+    "MetricOperation",
+    "MetricsRecorder",
+    "OverflowPolicy",
+    "PendingActions",
+    "PriorityClass",
+    "PrometheusTextfileExporter",
+    "RotatingBloomFilter",
     "Seg",
     "SegBuilder",
+    "SegList",
+    "SessionDecoder",
+    "SessionEncoder",
+    "ShardWorkerError",
+    "ShardedPipeline",
+    "Subscription",
+    "ThreadSafeEventScheduler",
+    "TieredMediaStore",
+    "TransportOptions",
     "UserInfo",
+    "ValidationIssue",
+    "collect_metrics",
+    "connect",
+    "disable_interning",
+    "disable_metrics",
+    "enable_interning",
+    "enable_metrics",
+    "encode_batch",
     "extract_text_from_content",
     "filter_segs_by_type",
     "find_seg_by_type",
+    "interning_stats",
+    "iter_decode",
+    "iter_encode_batches",
+    "metrics_snapshot",
+    "serve",
+    "shard_key",
+    "train_dictionary",
+    "validate_event",
     "validate_event_type",
+    "validate_event_types",
 ]
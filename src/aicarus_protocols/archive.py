@@ -0,0 +1,464 @@
+"""AIcarus-Message-Protocol v1.6.0 - 只追加的事件归档.
+
+事件按写入顺序以长度前缀 JSON 帧（与 batch_codec 的长度前缀格式相同）追加到分段文件中，
+每个分段旁边有一份索引. 定长索引记录包含 event_id 摘要、conversation_id 摘要、time、
+帧在分段中的偏移和长度.
+
+*   活动分段：索引按写入顺序追加到 .idx 文件，同时在内存中保留一份，用于查询.
+*   已封存分段：活动分段达到 segment_bytes 后被封存，额外写出按 event_id、time、
+    conversation_id 排序的三份索引. 查询时对内存映射的索引做二分查找，
+    再只解码命中的那几个帧，不会把整个分段或整份索引读成 Python 对象.
+
+目录结构：
+
+    archive/
+        segment-00000001.log        # 事件帧
+        segment-00000001.idx        # 写入顺序索引
+        segment-00000001.by_id      # 封存后写出的排序索引
+        segment-00000001.by_time
+        segment-00000001.by_conv
+
+归档只支持单个写入者. 打开时会根据 .log 修复因崩溃而缺失的索引记录，并截掉残缺的尾帧.
+"""
+
+import bisect
+import hashlib
+import heapq
+import mmap
+import os
+import re
+import struct
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from .batch_codec import BatchFraming, encode_frame
+from .event import Event
+
+# 默认的分段大小（字节），超过后封存当前分段并开启新分段
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+
+# 索引记录：event_id 摘要、conversation_id 摘要、time、帧内容偏移、帧内容长度
+_RECORD = struct.Struct("<16s16sdQI")
+_FIELD_ID, _FIELD_CONV, _FIELD_TIME, _FIELD_OFFSET, _FIELD_LENGTH = range(5)
+_LENGTH = struct.Struct(">I")
+_NO_CONVERSATION = bytes(16)
+_SEGMENT_NAME = re.compile(r"^segment-(\d{8})\.log$")
+_SORTED_SUFFIXES = (".by_id", ".by_time", ".by_conv")
+
+
+def _digest(value: str) -> bytes:
+    """返回字符串的 16 字节摘要，作为索引键."""
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+
+
+def _conversation_key(event: Event) -> bytes:
+    """返回事件所属会话的索引键，没有会话时为全零."""
+    info = event.conversation_info
+    return _digest(info.conversation_id) if info is not None else _NO_CONVERSATION
+
+
+class _RecordView:
+    """把一段索引记录的某个字段包装成只读序列，供 bisect 二分查找."""
+
+    __slots__ = ("_buf", "_count", "_field")
+
+    def __init__(self, buf: Any, field: int) -> None:
+        self._buf = buf
+        self._count = len(buf) // _RECORD.size
+        self._field = field
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> Any:
+        return _RECORD.unpack_from(self._buf, i * _RECORD.size)[self._field]
+
+
+class _Segment:
+    """一个分段及其索引."""
+
+    def __init__(self, directory: str, number: int) -> None:
+        self.number = number
+        self.base = os.path.join(directory, f"segment-{number:08d}")
+        self.log_path = self.base + ".log"
+        self.sealed = all(os.path.exists(self.base + s) for s in _SORTED_SUFFIXES)
+        # 活动分段的写入顺序索引，以及按 event_id / 会话摘要分组的帧位置
+        self.records: list[tuple[bytes, bytes, float, int, int]] = []
+        self._ids: dict[bytes, list[tuple[int, int]]] = {}
+        self._convs: dict[bytes, list[tuple[int, int]]] = {}
+        self._log_map: mmap.mmap | None = None
+        self._sorted: dict[str, Any] = {}
+
+    # ---- 读取 ----
+
+    def read_frame(self, offset: int, length: int) -> bytes | memoryview:
+        """读取帧内容. 已封存分段走内存映射，活动分段直接 pread."""
+        if self.sealed:
+            if self._log_map is None:
+                self._log_map = _map_file(self.log_path)
+            return memoryview(self._log_map)[offset : offset + length]
+        fd = os.open(self.log_path, os.O_RDONLY)
+        try:
+            return os.pread(fd, length, offset)
+        finally:
+            os.close(fd)
+
+    def sorted_index(self, suffix: str) -> Any:
+        """返回某份排序索引的内存映射."""
+        buf = self._sorted.get(suffix)
+        if buf is None:
+            buf = self._sorted[suffix] = _map_file(self.base + suffix)
+        return buf
+
+    def count(self) -> int:
+        """返回分段中的事件数量."""
+        if self.sealed:
+            return len(self.sorted_index(".by_id")) // _RECORD.size
+        return len(self.records)
+
+    def close(self) -> None:
+        """释放内存映射."""
+        maps = [self._log_map, *self._sorted.values()]
+        self._log_map = None
+        self._sorted.clear()
+        for m in maps:
+            if isinstance(m, mmap.mmap):
+                m.close()
+
+    # ---- 活动分段的恢复与封存 ----
+
+    def add_record(self, record: tuple[bytes, bytes, float, int, int]) -> None:
+        """向活动分段的内存索引中加入一条记录."""
+        self.records.append(record)
+        position = (record[_FIELD_OFFSET], record[_FIELD_LENGTH])
+        self._ids.setdefault(record[_FIELD_ID], []).append(position)
+        self._convs.setdefault(record[_FIELD_CONV], []).append(position)
+
+    def load_records(self) -> None:
+        """从 .idx 载入写入顺序索引，并用 .log 补齐缺失的记录、截掉残缺尾帧.
+
+        完整但无法建立索引的帧（结构不对、time 不是数字等）会被跳过，仍留在 .log 中.
+        """
+        records: list[tuple[bytes, bytes, float, int, int]] = []
+        idx_path = self.base + ".idx"
+        if os.path.exists(idx_path):
+            with open(idx_path, "rb") as f:
+                data = f.read()
+            usable = len(data) - len(data) % _RECORD.size
+            records = list(_RECORD.iter_unpack(data[:usable]))
+        log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        while records and records[-1][_FIELD_OFFSET] + records[-1][_FIELD_LENGTH] > log_size:
+            records.pop()
+        pos = records[-1][_FIELD_OFFSET] + records[-1][_FIELD_LENGTH] if records else 0
+        if pos < log_size:
+            with open(self.log_path, "rb") as f:
+                f.seek(pos)
+                tail = f.read()
+            i = 0
+            while i + _LENGTH.size <= len(tail):
+                (length,) = _LENGTH.unpack_from(tail, i)
+                start = i + _LENGTH.size
+                if start + length > len(tail):
+                    break
+                try:
+                    event = Event.from_json_bytes(tail[start : start + length], lazy=True)
+                except ValueError:
+                    break
+                except (TypeError, AttributeError):
+                    event = None
+                i = start + length
+                try:
+                    record = _make_record(event, pos + start, length) if event is not None else None
+                except (TypeError, ValueError, AttributeError):
+                    record = None
+                # 帧完整但无法建立索引时跳过它，不让整个归档因此无法打开
+                if record is not None:
+                    records.append(record)
+            pos += i
+        if pos < log_size:
+            with open(self.log_path, "r+b") as f:
+                f.truncate(pos)
+        with open(idx_path, "wb") as f:
+            f.write(b"".join(_RECORD.pack(*r) for r in records))
+        for record in records:
+            self.add_record(record)
+
+    def seal(self) -> None:
+        """写出三份排序索引并把分段标记为已封存."""
+        records = self.records
+        orders = {
+            ".by_id": sorted(records, key=lambda r: (r[_FIELD_ID], r[_FIELD_OFFSET])),
+            ".by_time": sorted(records, key=lambda r: (r[_FIELD_TIME], r[_FIELD_OFFSET])),
+            ".by_conv": sorted(records, key=lambda r: (r[_FIELD_CONV], r[_FIELD_OFFSET])),
+        }
+        # .by_conv 最后写入，它的存在表示封存完成
+        for suffix in _SORTED_SUFFIXES:
+            tmp_path = self.base + suffix + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(b"".join(_RECORD.pack(*r) for r in orders[suffix]))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.base + suffix)
+        self.records = []
+        self._ids.clear()
+        self._convs.clear()
+        self.sealed = True
+
+    # ---- 查询 ----
+
+    def find_id(self, key: bytes) -> Iterator[tuple[int, int]]:
+        """返回 event_id 摘要等于 key 的所有帧位置."""
+        if not self.sealed:
+            yield from self._ids.get(key, ())
+            return
+        buf = self.sorted_index(".by_id")
+        view = _RecordView(buf, _FIELD_ID)
+        for i in range(bisect.bisect_left(view, key), len(view)):
+            r = _RECORD.unpack_from(buf, i * _RECORD.size)
+            if r[_FIELD_ID] != key:
+                break
+            yield r[_FIELD_OFFSET], r[_FIELD_LENGTH]
+
+    def find_time(self, t0: float, t1: float) -> Iterator[tuple[float, int, int, int]]:
+        """按时间顺序返回 t0 <= time < t1 的 (time, 分段号, 偏移, 长度)."""
+        if not self.sealed:
+            hits = sorted(
+                (r[_FIELD_TIME], self.number, r[_FIELD_OFFSET], r[_FIELD_LENGTH])
+                for r in self.records
+                if t0 <= r[_FIELD_TIME] < t1
+            )
+            yield from hits
+            return
+        buf = self.sorted_index(".by_time")
+        view = _RecordView(buf, _FIELD_TIME)
+        for i in range(bisect.bisect_left(view, t0), len(view)):
+            r = _RECORD.unpack_from(buf, i * _RECORD.size)
+            if r[_FIELD_TIME] >= t1:
+                break
+            yield r[_FIELD_TIME], self.number, r[_FIELD_OFFSET], r[_FIELD_LENGTH]
+
+    def find_conversation(self, key: bytes) -> Iterator[tuple[int, int]]:
+        """按写入顺序返回属于某个会话的帧位置."""
+        if not self.sealed:
+            yield from list(self._convs.get(key, ()))
+            return
+        buf = self.sorted_index(".by_conv")
+        view = _RecordView(buf, _FIELD_CONV)
+        for i in range(bisect.bisect_left(view, key), len(view)):
+            r = _RECORD.unpack_from(buf, i * _RECORD.size)
+            if r[_FIELD_CONV] != key:
+                break
+            yield r[_FIELD_OFFSET], r[_FIELD_LENGTH]
+
+
+def _make_record(event: Event, offset: int, length: int) -> tuple[bytes, bytes, float, int, int]:
+    """为写入 offset 处、长度为 length 的事件帧生成索引记录."""
+    return (_digest(event.event_id), _conversation_key(event), float(event.time), offset, length)
+
+
+def _map_file(path: str) -> Any:
+    """以只读方式内存映射整个文件，空文件返回 b""."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class EventArchive:
+    """只追加的事件归档.
+
+    Attributes:
+        directory (str): 归档目录.
+        segment_bytes (int): 分段大小上限，活动分段超过它之后会被封存.
+        lazy (bool): 为 True 时查询返回只解析了头部的 LazyEvent.
+
+    Methods:
+        append(event: Event) -> None: 追加一个事件.
+        extend(events: Iterable[Event]) -> int: 追加多个事件.
+        flush() -> None: 把缓冲的数据写入文件.
+        get(event_id: str) -> Event | None: 按 event_id 查找事件.
+        range(t0: float, t1: float) -> Iterator[Event]: 按时间顺序返回 t0 <= time < t1 的事件.
+        iter_conversation(conversation_id: str) -> Iterator[Event]: 按写入顺序返回某个会话的事件.
+        close() -> None: 封存之外的状态写盘并释放文件.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        lazy: bool = False,
+    ) -> None:
+        self.directory = os.fspath(directory)
+        self.segment_bytes = segment_bytes
+        self.lazy = lazy
+        os.makedirs(self.directory, exist_ok=True)
+
+        numbers = sorted(
+            int(m.group(1))
+            for name in os.listdir(self.directory)
+            if (m := _SEGMENT_NAME.match(name)) is not None
+        )
+        self._segments = [_Segment(self.directory, n) for n in numbers]
+        for segment in self._segments:
+            if not segment.sealed:
+                segment.load_records()
+        # 只有最后一个分段可以保持活动状态
+        for segment in self._segments[:-1]:
+            if not segment.sealed:
+                segment.seal()
+        if not self._segments or self._segments[-1].sealed:
+            self._segments.append(_Segment(self.directory, numbers[-1] + 1 if numbers else 1))
+        self._by_number = {s.number: s for s in self._segments}
+        self._open_active()
+
+    def __enter__(self) -> "EventArchive":
+        """进入上下文.
+
+        Returns:
+            EventArchive: 归档自身.
+        """
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """退出上下文时关闭归档."""
+        self.close()
+
+    def __len__(self) -> int:
+        """返回归档中的事件总数.
+
+        Returns:
+            int: 事件总数.
+        """
+        return sum(segment.count() for segment in self._segments)
+
+    def __contains__(self, event_id: str) -> bool:
+        """判断 event_id 是否已归档."""
+        return self.get(event_id) is not None
+
+    def append(self, event: Event) -> None:
+        """追加一个事件.
+
+        Args:
+            event (Event): 要归档的事件.
+
+        Raises:
+            TypeError: 事件无法编码或建立索引（例如 time 不是数字），此时不会写入任何数据.
+            ValueError: 同上.
+        """
+        # 先生成帧和索引记录，任何一步失败时都还没有写入，归档保持一致
+        frame = encode_frame(event, BatchFraming.LENGTH_PREFIXED)
+        record = _make_record(event, self._log_size + _LENGTH.size, len(frame) - _LENGTH.size)
+        packed = _RECORD.pack(*record)
+        self._log.write(frame)
+        self._idx.write(packed)
+        self._segments[-1].add_record(record)
+        self._log_size += len(frame)
+        if self._log_size >= self.segment_bytes:
+            self._rotate()
+
+    def extend(self, events: Iterable[Event]) -> int:
+        """追加多个事件.
+
+        Args:
+            events (Iterable[Event]): 要归档的事件.
+
+        Returns:
+            int: 追加的事件数量.
+        """
+        count = 0
+        for event in events:
+            self.append(event)
+            count += 1
+        return count
+
+    def flush(self) -> None:
+        """把缓冲的数据写入文件. 查询活动分段之前会自动调用."""
+        self._log.flush()
+        self._idx.flush()
+
+    def get(self, event_id: str) -> Event | None:
+        """按 event_id 查找事件.
+
+        Args:
+            event_id (str): 事件 ID.
+
+        Returns:
+            Event | None: 找到的事件，不存在时返回 None. 同一个 event_id 被归档多次时返回最后一次.
+        """
+        self.flush()
+        key = _digest(event_id)
+        for segment in reversed(self._segments):
+            found = None
+            for offset, length in segment.find_id(key):
+                event = self._decode(segment, offset, length)
+                if event.event_id == event_id:
+                    found = event
+            if found is not None:
+                return found
+        return None
+
+    def range(self, t0: float, t1: float) -> Iterator[Event]:
+        """按时间顺序返回 t0 <= time < t1 的事件.
+
+        Args:
+            t0 (float): 起始时间（含）.
+            t1 (float): 结束时间（不含）.
+
+        Yields:
+            Event: 时间在范围内的事件，时间相同时按写入顺序.
+        """
+        self.flush()
+        streams = [segment.find_time(t0, t1) for segment in self._segments]
+        for _, number, offset, length in heapq.merge(*streams):
+            yield self._decode(self._by_number[number], offset, length)
+
+    def iter_conversation(self, conversation_id: str) -> Iterator[Event]:
+        """按写入顺序返回某个会话的事件.
+
+        Args:
+            conversation_id (str): 会话 ID.
+
+        Yields:
+            Event: 属于该会话的事件.
+        """
+        self.flush()
+        key = _digest(conversation_id)
+        for segment in list(self._segments):
+            for offset, length in segment.find_conversation(key):
+                event = self._decode(segment, offset, length)
+                info = event.conversation_info
+                if info is not None and info.conversation_id == conversation_id:
+                    yield event
+
+    def close(self) -> None:
+        """把数据写盘并释放文件. 活动分段保持未封存，下次打开时继续写入."""
+        if self._log.closed:
+            return
+        self.flush()
+        self._log.close()
+        self._idx.close()
+        for segment in self._segments:
+            segment.close()
+
+    def _decode(self, segment: _Segment, offset: int, length: int) -> Event:
+        """解码分段中的一个帧."""
+        return Event.from_json_bytes(segment.read_frame(offset, length), lazy=self.lazy)
+
+    def _open_active(self) -> None:
+        """打开活动分段的文件用于追加."""
+        active = self._segments[-1]
+        self._log = open(active.log_path, "ab")  # noqa: SIM115
+        self._idx = open(active.base + ".idx", "ab")  # noqa: SIM115
+        self._log_size = self._log.tell()
+
+    def _rotate(self) -> None:
+        """封存活动分段并开启新分段."""
+        self.flush()
+        os.fsync(self._log.fileno())
+        self._log.close()
+        self._idx.close()
+        self._segments[-1].seal()
+        segment = _Segment(self.directory, self._segments[-1].number + 1)
+        self._segments.append(segment)
+        self._by_number[segment.number] = segment
+        self._open_active()
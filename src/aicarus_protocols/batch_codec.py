@@ -0,0 +1,321 @@
+"""AIcarus-Message-Protocol v1.6.0 - 流式批量事件编解码.
+
+把多个 Event 放进同一个传输帧，减少突发流量（如重连后的历史同步）时逐事件的帧开销.
+支持两种分帧方式：
+
+*   NDJSON：每个事件一行紧凑 JSON，以换行符结尾.
+*   长度前缀：每个事件前加 4 字节大端无符号长度，后接该事件的 JSON.
+
+编码端可以边迭代边输出，不需要把整批事件放进内存；解码端 BatchDecoder 接受任意切分的
+字节块，每凑齐一个完整事件就产出一个，未完成的部分留在有界缓冲区中等待后续数据.
+单个事件的 JSON 与 Event.to_json_bytes() 相同，解码结果与 Event.from_dict 一致.
+"""
+
+import struct
+from collections.abc import Iterable, Iterator
+
+from . import json_codec
+from .event import Event
+
+
+class BatchFraming:
+    """批量编解码的分帧方式.
+
+    Attributes:
+        NDJSON (str): 每个事件一行 JSON.
+        LENGTH_PREFIXED (str): 每个事件前加 4 字节大端长度.
+    """
+
+    NDJSON = "ndjson"
+    LENGTH_PREFIXED = "length_prefixed"
+
+
+# 单个事件帧的默认上限（字节），也是解码缓冲区中未完成数据的上限
+DEFAULT_MAX_FRAME_SIZE = 16 * 1024 * 1024
+# iter_encode_batches 默认的每批字节数
+DEFAULT_BATCH_BYTES = 64 * 1024
+
+_LENGTH = struct.Struct(">I")
+
+
+def _check_framing(framing: str) -> None:
+    """校验分帧方式."""
+    if framing not in (BatchFraming.NDJSON, BatchFraming.LENGTH_PREFIXED):
+        raise ValueError(f"未知的分帧方式: {framing!r}")
+
+
+def encode_frame(event: Event, framing: str = BatchFraming.NDJSON) -> bytes:
+    """把单个 Event 编码为一帧.
+
+    Args:
+        event (Event): 要编码的事件.
+        framing (str): BatchFraming 中定义的分帧方式.
+
+    Returns:
+        bytes: 帧数据.
+
+    Raises:
+        ValueError: 未知的分帧方式.
+    """
+    payload = json_codec.encode_event(event)
+    if framing == BatchFraming.NDJSON:
+        # 紧凑 JSON 会把字符串中的换行转义为 "\n"，因此不会出现裸换行
+        return payload + b"\n"
+    _check_framing(framing)
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def encode_batch(events: Iterable[Event], framing: str = BatchFraming.NDJSON) -> bytes:
+    """把多个 Event 编码为一段连续的帧数据.
+
+    Args:
+        events (Iterable[Event]): 要编码的事件.
+        framing (str): BatchFraming 中定义的分帧方式.
+
+    Returns:
+        bytes: 所有事件帧首尾相接的数据.
+
+    Raises:
+        ValueError: 未知的分帧方式.
+    """
+    _check_framing(framing)
+    return b"".join(encode_frame(event, framing) for event in events)
+
+
+def iter_encode_batches(
+    events: Iterable[Event],
+    framing: str = BatchFraming.NDJSON,
+    batch_bytes: int = DEFAULT_BATCH_BYTES,
+) -> Iterator[bytes]:
+    """边迭代事件边产出批量数据块.
+
+    每个数据块由若干完整的事件帧组成，大小在超过 batch_bytes 后立即产出，
+    因此任何时候最多只在内存中保留一个数据块.
+
+    Args:
+        events (Iterable[Event]): 要编码的事件，可以是生成器.
+        framing (str): BatchFraming 中定义的分帧方式.
+        batch_bytes (int): 每个数据块的目标大小.
+
+    Yields:
+        bytes: 由完整事件帧组成的数据块.
+
+    Raises:
+        ValueError: 未知的分帧方式.
+    """
+    _check_framing(framing)
+    frames: list[bytes] = []
+    size = 0
+    for event in events:
+        frame = encode_frame(event, framing)
+        frames.append(frame)
+        size += len(frame)
+        if size >= batch_bytes:
+            yield b"".join(frames)
+            frames.clear()
+            size = 0
+    if frames:
+        yield b"".join(frames)
+
+
+class BatchDecoder:
+    """增量解码批量事件帧.
+
+    数据可以按任意边界切分后多次传入 feed()，每个完整的事件帧都会立即被解码产出.
+    NDJSON 中的空行会被忽略. 某个帧解码失败或超过 max_frame_size 时异常会向上传播，
+    但该帧（包括超限帧之后才到达的部分）已被丢弃，之后的 feed() 从下一帧继续.
+
+    Attributes:
+        framing (str): 分帧方式.
+        max_frame_size (int): 单个事件帧的上限. 缓冲区中尚未解码的数据超过一个帧的上限后，
+            必须先遍历 feed() 返回的迭代器才能继续 feed()，因此缓冲区不会无限增长.
+        lazy (bool): 为 True 时产出只解析了头部的 LazyEvent.
+
+    Methods:
+        feed(data: bytes) -> Iterator[Event]: 追加数据并返回产出已完整事件的迭代器.
+        finish() -> Iterator[Event]: 数据流结束时产出剩余事件，并检查是否有残缺的帧.
+        pending -> int: 缓冲区中尚未解码的字节数.
+    """
+
+    def __init__(
+        self,
+        framing: str = BatchFraming.NDJSON,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+        lazy: bool = False,
+    ) -> None:
+        _check_framing(framing)
+        self.framing = framing
+        self.max_frame_size = max_frame_size
+        self.lazy = lazy
+        self._buffer = bytearray()
+        self._pos = 0
+        # 正在丢弃的超限帧：长度前缀格式下还需丢弃的字节数，NDJSON 下是否丢弃到下一个换行
+        self._skip_bytes = 0
+        self._skip_line = False
+
+    @property
+    def pending(self) -> int:
+        """缓冲区中尚未解码的字节数."""
+        return len(self._buffer) - self._pos
+
+    def feed(self, data: bytes | bytearray | memoryview) -> Iterator[Event]:
+        """追加数据并返回产出已完整事件的迭代器.
+
+        数据在调用时立即进入缓冲区；返回的迭代器即使没有被遍历，数据也不会丢失，
+        会由下一次 feed() 或 finish() 返回的迭代器产出. 但缓冲区中尚未解码的数据超过
+        一个帧的上限时，必须先遍历已返回的迭代器（或 feed(b"") 返回的新迭代器）.
+
+        Args:
+            data (bytes | bytearray | memoryview): 新到达的数据.
+
+        Returns:
+            Iterator[Event]: 产出缓冲区中已完整的事件.
+
+        Raises:
+            ValueError: 缓冲区中尚未解码的数据已超过一个帧的上限，此时 data 不会进入缓冲区；
+                或遍历时遇到超过 max_frame_size 的帧，或帧内容不是合法的事件 JSON.
+        """
+        if data and self.pending > self.max_frame_size + _LENGTH.size:
+            raise ValueError(
+                f"未解码的数据超过 {self.max_frame_size} 字节，请先遍历 feed() 返回的迭代器"
+            )
+        self._buffer += data
+        if self._skip_bytes or self._skip_line:
+            self._skip_oversized()
+        return self._drain()
+
+    def _drain(self) -> Iterator[Event]:
+        """产出缓冲区中所有完整的事件，结束后丢弃已解码的部分."""
+        try:
+            if self.framing == BatchFraming.NDJSON:
+                yield from self._drain_lines()
+            else:
+                yield from self._drain_length_prefixed()
+        finally:
+            self._compact()
+
+    def finish(self) -> Iterator[Event]:
+        """数据流结束时产出剩余事件，并检查是否有残缺的帧.
+
+        NDJSON 最后一行可以没有换行符；长度前缀格式的残缺帧会导致异常.
+
+        Yields:
+            Event: 解码得到的事件.
+
+        Raises:
+            ValueError: 数据流在一个帧的中间结束.
+        """
+        if self.framing == BatchFraming.NDJSON:
+            start, end = self._pos, len(self._buffer)
+            try:
+                if self._buffer[start:end].strip():
+                    event = self._decode(start, end)
+                else:
+                    return
+            finally:
+                self._reset()
+            yield event
+        else:
+            pending = self.pending
+            self._reset()
+            if pending:
+                raise ValueError(f"数据流在帧中间结束，剩余 {pending} 字节")
+
+    def _drain_lines(self) -> Iterator[Event]:
+        """解码缓冲区中所有以换行结尾的行."""
+        buffer = self._buffer
+        while True:
+            end = buffer.find(b"\n", self._pos)
+            if end < 0:
+                if self.pending > self.max_frame_size:
+                    # 丢弃这一行已到达的部分，其余部分在后续 feed() 中丢弃到换行为止
+                    self._pos = len(buffer)
+                    self._skip_line = True
+                    raise ValueError(f"事件帧超过上限 {self.max_frame_size} 字节")
+                return
+            start = self._pos
+            self._pos = end + 1
+            if end - start > self.max_frame_size:
+                raise ValueError(f"事件帧超过上限 {self.max_frame_size} 字节")
+            if end > start:
+                yield self._decode(start, end)
+
+    def _drain_length_prefixed(self) -> Iterator[Event]:
+        """解码缓冲区中所有完整的长度前缀帧."""
+        buffer = self._buffer
+        while len(buffer) - self._pos >= _LENGTH.size:
+            (length,) = _LENGTH.unpack_from(buffer, self._pos)
+            start = self._pos + _LENGTH.size
+            if length > self.max_frame_size:
+                # 丢弃整个帧：已到达的部分现在丢弃，其余部分在后续 feed() 中丢弃
+                self._pos = min(start + length, len(buffer))
+                self._skip_bytes = start + length - self._pos
+                raise ValueError(f"事件帧超过上限 {self.max_frame_size} 字节")
+            end = start + length
+            if end > len(buffer):
+                return
+            self._pos = end
+            yield self._decode(start, end)
+
+    def _decode(self, start: int, end: int) -> Event:
+        """解码缓冲区中 [start, end) 处的帧.
+
+        解码完成后立即释放对缓冲区的视图，调用方在处理事件时可以继续 feed().
+        """
+        with memoryview(self._buffer)[start:end] as frame:
+            return json_codec.decode_event(frame, Event, self.lazy)
+
+    def _skip_oversized(self) -> None:
+        """丢弃缓冲区中属于超限帧的后续数据."""
+        buffer = self._buffer
+        if self._skip_line:
+            end = buffer.find(b"\n", self._pos)
+            if end < 0:
+                self._pos = len(buffer)
+            else:
+                self._pos = end + 1
+                self._skip_line = False
+        else:
+            skipped = min(self._skip_bytes, len(buffer) - self._pos)
+            self._pos += skipped
+            self._skip_bytes -= skipped
+        self._compact()
+
+    def _compact(self) -> None:
+        """丢弃缓冲区中已解码的部分."""
+        if self._pos:
+            del self._buffer[: self._pos]
+            self._pos = 0
+
+    def _reset(self) -> None:
+        """清空缓冲区."""
+        self._buffer.clear()
+        self._pos = 0
+        self._skip_bytes = 0
+        self._skip_line = False
+
+
+def iter_decode(
+    chunks: Iterable[bytes],
+    framing: str = BatchFraming.NDJSON,
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+    lazy: bool = False,
+) -> Iterator[Event]:
+    """从字节块序列中逐个解码事件.
+
+    Args:
+        chunks (Iterable[bytes]): 任意切分的数据块，例如从 socket 或文件中读取的块.
+        framing (str): BatchFraming 中定义的分帧方式.
+        max_frame_size (int): 单个事件帧的上限.
+        lazy (bool): 为 True 时产出只解析了头部的 LazyEvent.
+
+    Yields:
+        Event: 解码得到的事件.
+
+    Raises:
+        ValueError: 帧超过上限、内容非法，或数据流在帧中间结束.
+    """
+    decoder = BatchDecoder(framing, max_frame_size, lazy)
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.finish()
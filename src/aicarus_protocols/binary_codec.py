@@ -0,0 +1,496 @@
+"""AIcarus-Message-Protocol v1.6.0 - 紧凑二进制编解码.
+
+JSON 之外的可选传输格式。同一条连接上反复出现的 event_type、Seg 类型、字典键等字符串
+通过一张双方协商的字符串表替换为很小的整数引用.
+
+编解码器是有状态的：每条连接使用一对 BinaryEncoder / BinaryDecoder，帧必须按发送顺序解码.
+连接建立时发送方先发出 handshake() 帧，接收方用 accept_handshake() 校验双方的预置表一致；
+重连时双方都要 reset()（重新握手会自动 reset）.
+
+对任意 Event e，decode(encode(e)).to_dict() 与 Event.from_dict(e.to_dict()).to_dict() 相同，
+即二进制格式与 JSON 格式可以无损互转.
+
+这一格式以 CPU 换取体积：帧通常只有 JSON 的三分之一左右，但编解码是纯 Python 实现，
+比使用 orjson 后端的 JSON 编解码更慢. 适合带宽或存储受限的链路，不适合追求单核吞吐的场景.
+"""
+
+import struct
+import zlib
+from collections.abc import Iterable
+from typing import Any
+
+from .conversation_info import ConversationInfo
+from .event import Event
+from .json_codec import conversation_info_to_obj, user_info_to_obj
+from .seg import Seg, SegList
+from .user_info import UserInfo
+
+# 帧头
+MAGIC = 0xAC
+FORMAT_VERSION = 1
+FRAME_HANDSHAKE = 0x00
+FRAME_EVENT = 0x01
+
+# 值标签
+_T_NONE = 0x00
+_T_FALSE = 0x01
+_T_TRUE = 0x02
+_T_INT = 0x03
+_T_FLOAT = 0x04
+_T_STR = 0x05
+_T_STR_REF = 0x06
+_T_STR_DEF = 0x07
+_T_LIST = 0x08
+_T_MAP = 0x09
+_T_UUID = 0x0A  # 规范格式的 UUID 字符串，以 16 字节原始形式传输
+
+# Event 可选字段的存在标志
+_F_USER_INFO = 0x01
+_F_CONVERSATION_INFO = 0x02
+_F_RAW_DATA = 0x04
+
+# user_info / conversation_info 中不超过该长度的字符串值会被收入字符串表
+MAX_INTERNED_VALUE_LENGTH = 32
+
+_pack_double = struct.Struct("<d").pack
+_unpack_double = struct.Struct("<d").unpack_from
+_pack_table_id = struct.Struct("<I").pack
+_unpack_table_id = struct.Struct("<I").unpack_from
+
+# 双方默认共享的预置字符串表：协议前缀、常见 Seg 类型、各对象的字段名和常用取值
+DEFAULT_PRESET: tuple[str, ...] = (
+    # Event / Seg 字段
+    "type",
+    "data",
+    # Seg 类型与常见 data 键
+    "message_metadata",
+    "message_id",
+    "text",
+    "at",
+    "image",
+    "video",
+    "reply",
+    "face",
+    "action_params",
+    "user_id",
+    "display_name",
+    "id",
+    "hash",
+    "mime_type",
+    "url",
+    "file_id",
+    "base64",
+    "summary",
+    "platform_id",
+    "group_id",
+    "original_event_id",
+    "original_action_type",
+    "status_code",
+    "message",
+    # UserInfo 字段
+    "user_nickname",
+    "user_cardname",
+    "user_titlename",
+    "permission_level",
+    "role",
+    "level",
+    "sex",
+    "age",
+    "area",
+    "additional_data",
+    # ConversationInfo 字段与会话类型
+    "conversation_id",
+    "name",
+    "parent_id",
+    "extra",
+    "private",
+    "group",
+    "channel",
+    "unknown",
+    # 常见取值
+    "member",
+    "admin",
+    "owner",
+    "male",
+    "female",
+)
+
+
+def _table_id(preset: Iterable[str]) -> int:
+    """计算预置字符串表的指纹，用于握手时确认双方使用同一张表."""
+    return zlib.crc32("\n".join(preset).encode("utf-8"))
+
+
+class BinaryEncoder:
+    """二进制编码器，每条连接的发送方向一个实例.
+
+    Attributes:
+        preset (tuple[str, ...]): 预置字符串表.
+        max_table_size (int): 字符串表（含预置部分）的最大条目数，表满后不再新增条目.
+        dynamic (bool): 是否在连接过程中动态扩充字符串表. 关闭后每一帧都可以独立解码.
+        table_id (int): 预置表的指纹.
+
+    Methods:
+        handshake() -> bytes: 生成握手帧，并重置字符串表.
+        encode(event: Event) -> bytes: 把 Event 编码为一帧.
+        reset() -> None: 丢弃动态学习到的字符串，回到预置表.
+    """
+
+    def __init__(
+        self,
+        preset: Iterable[str] = DEFAULT_PRESET,
+        max_table_size: int = 4096,
+        dynamic: bool = True,
+    ) -> None:
+        self.preset = tuple(preset)
+        self.max_table_size = max_table_size
+        self.dynamic = dynamic
+        self.table_id = _table_id(self.preset)
+        self._table: dict[str, int] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """丢弃动态学习到的字符串，回到预置表."""
+        self._table = {s: i for i, s in enumerate(self.preset)}
+
+    def handshake(self) -> bytes:
+        """生成握手帧，并重置字符串表.
+
+        Returns:
+            bytes: 握手帧，包含格式版本、预置表指纹、表容量和是否动态扩充.
+        """
+        self.reset()
+        out = bytearray((MAGIC, FRAME_HANDSHAKE, FORMAT_VERSION, int(self.dynamic)))
+        out += _pack_table_id(self.table_id)
+        _write_varint(out, self.max_table_size)
+        return bytes(out)
+
+    def encode(self, event: Event) -> bytes:
+        """把 Event 编码为一帧.
+
+        Args:
+            event (Event): 要编码的事件.
+
+        Returns:
+            bytes: 编码后的帧.
+
+        Raises:
+            TypeError: 事件中包含无法用 JSON 表示的数据. 此时字符串表保持编码前的状态.
+        """
+        table_size = len(self._table)
+        try:
+            return self._encode_event(event)
+        except TypeError:
+            # 回滚本帧新增的条目，避免与接收方的字符串表错位
+            if len(self._table) > table_size:
+                self._table = {s: i for s, i in self._table.items() if i < table_size}
+            raise
+
+    def _encode_event(self, event: Event) -> bytes:
+        """编码 Event 的实际实现."""
+        out = bytearray((MAGIC, FRAME_EVENT))
+        flags = 0
+        if event.user_info is not None:
+            flags |= _F_USER_INFO
+        if event.conversation_info is not None:
+            flags |= _F_CONVERSATION_INFO
+        if event.raw_data is not None:
+            flags |= _F_RAW_DATA
+        out.append(flags)
+
+        self._write_str(out, event.event_id, False)
+        self._write_str(out, event.event_type, True)
+        self._write_value(out, event.time, False)
+        self._write_str(out, event.bot_id, True)
+
+        content = event.content
+        _write_varint(out, len(content))
+        for seg in content:
+            self._write_str(out, seg.type, True)
+            self._write_value(out, seg.data, False)
+
+        if flags & _F_USER_INFO:
+            self._write_value(out, user_info_to_obj(event.user_info), True)
+        if flags & _F_CONVERSATION_INFO:
+            self._write_value(out, conversation_info_to_obj(event.conversation_info), True)
+        if flags & _F_RAW_DATA:
+            self._write_str(out, event.raw_data, False)
+        return bytes(out)
+
+    def _write_str(self, out: bytearray, value: str | None, intern: bool) -> None:
+        """写入字符串，intern 为 True 时优先使用字符串表引用.
+
+        event_id、event_type 等字段为 None 时与 JSON 格式一样原样保留，写为 None 标签.
+        """
+        if value is None:
+            out.append(_T_NONE)
+            return
+        table = self._table
+        index = table.get(value)
+        if index is not None:
+            out.append(_T_STR_REF)
+            _write_varint(out, index)
+            return
+        if len(value) == 36 and value[8] == "-" and not intern:
+            raw_uuid = _uuid_bytes(value)
+            if raw_uuid is not None:
+                out.append(_T_UUID)
+                out += raw_uuid
+                return
+        raw = value.encode("utf-8")
+        if intern and self.dynamic and len(table) < self.max_table_size:
+            table[value] = len(table)
+            out.append(_T_STR_DEF)
+        else:
+            out.append(_T_STR)
+        _write_varint(out, len(raw))
+        out += raw
+
+    def _write_value(self, out: bytearray, value: Any, intern_values: bool) -> None:
+        """写入任意 JSON 兼容的值. 字典键总是参与字符串表."""
+        if value is None:
+            out.append(_T_NONE)
+        elif value is True:
+            out.append(_T_TRUE)
+        elif value is False:
+            out.append(_T_FALSE)
+        elif isinstance(value, str):
+            self._write_str(out, value, intern_values and len(value) <= MAX_INTERNED_VALUE_LENGTH)
+        elif isinstance(value, int):
+            out.append(_T_INT)
+            _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif isinstance(value, float):
+            out.append(_T_FLOAT)
+            out += _pack_double(value)
+        elif isinstance(value, dict):
+            out.append(_T_MAP)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    raise TypeError(f"字典键必须是 str，实际为 {type(key).__name__}")
+                self._write_str(out, key, True)
+                self._write_value(out, item, intern_values)
+        elif isinstance(value, list | tuple):
+            out.append(_T_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self._write_value(out, item, intern_values)
+        else:
+            raise TypeError(f"无法编码类型为 {type(value).__name__} 的值")
+
+
+class BinaryDecoder:
+    """二进制解码器，每条连接的接收方向一个实例.
+
+    Attributes:
+        preset (tuple[str, ...]): 预置字符串表，必须与发送方一致.
+        max_table_size (int): 字符串表的最大条目数，由握手帧更新.
+        table_id (int): 预置表的指纹.
+
+    Methods:
+        accept_handshake(frame: bytes) -> None: 校验握手帧并重置字符串表.
+        decode(frame: bytes) -> Event: 把一帧解码为 Event.
+        reset() -> None: 丢弃动态学习到的字符串，回到预置表.
+    """
+
+    def __init__(self, preset: Iterable[str] = DEFAULT_PRESET, max_table_size: int = 4096) -> None:
+        self.preset = tuple(preset)
+        self.max_table_size = max_table_size
+        self.table_id = _table_id(self.preset)
+        self._table: list[str] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """丢弃动态学习到的字符串，回到预置表."""
+        self._table = list(self.preset)
+
+    def accept_handshake(self, frame: bytes | bytearray | memoryview) -> None:
+        """校验握手帧并重置字符串表.
+
+        Args:
+            frame (bytes | bytearray | memoryview): 发送方的握手帧.
+
+        Raises:
+            ValueError: 帧格式错误、版本不支持或预置表与本地不一致.
+        """
+        buf = memoryview(frame)
+        if len(buf) < 8 or buf[0] != MAGIC or buf[1] != FRAME_HANDSHAKE:
+            raise ValueError("不是有效的二进制握手帧")
+        if buf[2] != FORMAT_VERSION:
+            raise ValueError(f"不支持的二进制格式版本: {buf[2]}")
+        (table_id,) = _unpack_table_id(buf, 4)
+        if table_id != self.table_id:
+            raise ValueError("双方的预置字符串表不一致")
+        self.max_table_size, _ = _read_varint(buf, 8)
+        self.reset()
+
+    def decode(self, frame: bytes | bytearray | memoryview) -> Event:
+        """把一帧解码为 Event.
+
+        Args:
+            frame (bytes | bytearray | memoryview): 由 BinaryEncoder.encode 生成的帧.
+
+        Returns:
+            Event: 解码得到的事件.
+
+        Raises:
+            ValueError: 帧格式错误或引用了未知的字符串表条目.
+        """
+        # 逐字节索引和切片解码在 bytes 上都比在 memoryview 上快，复制一次整帧更划算
+        buf = frame if type(frame) is bytes else bytes(frame)
+        if len(buf) < 3 or buf[0] != MAGIC or buf[1] != FRAME_EVENT:
+            raise ValueError("不是有效的二进制事件帧")
+        flags = buf[2]
+        read = self._read_value
+        try:
+            event_id, pos = read(buf, 3)
+            event_type, pos = read(buf, pos)
+            time, pos = read(buf, pos)
+            bot_id, pos = read(buf, pos)
+
+            count, pos = _read_varint(buf, pos)
+            content = SegList()
+            # 新建的列表还没有索引，绕过 SegList.append 丢弃索引的开销
+            append = list.append
+            for _ in range(count):
+                seg_type, pos = read(buf, pos)
+                seg_data, pos = read(buf, pos)
+                if type(seg_data) is not dict:
+                    seg_data = {"value": seg_data} if seg_data is not None else {}
+                append(content, Seg(seg_type, seg_data))
+
+            user_info = conversation_info = raw_data = None
+            if flags & _F_USER_INFO:
+                data, pos = read(buf, pos)
+                user_info = UserInfo.from_dict(data) if data else None
+            if flags & _F_CONVERSATION_INFO:
+                data, pos = read(buf, pos)
+                conversation_info = ConversationInfo.from_dict(data) if data else None
+            if flags & _F_RAW_DATA:
+                raw_data, pos = read(buf, pos)
+        except (IndexError, struct.error) as e:
+            raise ValueError("二进制事件帧被截断") from e
+
+        return Event(
+            event_id,
+            event_type,
+            time,
+            bot_id,
+            content,
+            user_info,
+            conversation_info,
+            raw_data,
+        )
+
+    def _read_value(self, buf: bytes, pos: int) -> tuple[Any, int]:
+        """从 pos 处读取一个值，返回值和新的位置.
+
+        按出现频率排列分支；字符串表引用和字典键的单字节索引不经过 _read_varint.
+        """
+        tag = buf[pos]
+        if tag == _T_STR_REF:
+            index = buf[pos + 1]
+            if index < 0x80:
+                pos += 2
+            else:
+                index, pos = _read_varint(buf, pos + 1)
+            table = self._table
+            if index >= len(table):
+                raise ValueError(f"引用了未知的字符串表条目: {index}")
+            return table[index], pos
+        pos += 1
+        if tag == _T_MAP:
+            count, pos = _read_varint(buf, pos)
+            result = {}
+            table = self._table
+            read = self._read_value
+            for _ in range(count):
+                index = buf[pos + 1]
+                if buf[pos] == _T_STR_REF and index < 0x80 and index < len(table):
+                    key = table[index]
+                    pos += 2
+                else:
+                    key, pos = read(buf, pos)
+                result[key], pos = read(buf, pos)
+            return result, pos
+        if tag in (_T_STR, _T_STR_DEF):
+            length = buf[pos]
+            if length < 0x80:
+                pos += 1
+            else:
+                length, pos = _read_varint(buf, pos)
+            end = pos + length
+            if end > len(buf):
+                raise IndexError(end)
+            value = buf[pos:end].decode("utf-8")
+            if tag == _T_STR_DEF and len(self._table) < self.max_table_size:
+                self._table.append(value)
+            return value, end
+        if tag == _T_UUID:
+            end = pos + 16
+            if end > len(buf):
+                raise IndexError(end)
+            return _uuid_str(buf[pos:end]), end
+        if tag == _T_INT:
+            raw, pos = _read_varint(buf, pos)
+            return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1), pos
+        if tag == _T_FLOAT:
+            return _unpack_double(buf, pos)[0], pos + 8
+        if tag == _T_LIST:
+            count, pos = _read_varint(buf, pos)
+            items = []
+            for _ in range(count):
+                item, pos = self._read_value(buf, pos)
+                items.append(item)
+            return items, pos
+        if tag == _T_NONE:
+            return None, pos
+        if tag == _T_TRUE:
+            return True, pos
+        if tag == _T_FALSE:
+            return False, pos
+        raise ValueError(f"未知的值标签: {tag:#04x}")
+
+
+def _uuid_bytes(value: str) -> bytes | None:
+    """若 value 是规范格式（小写、带连字符）的 UUID，返回其 16 字节形式，否则返回 None."""
+    if not value[13] == value[18] == value[23] == "-":
+        return None
+    digits = value.replace("-", "")
+    if len(digits) != 32:
+        return None
+    try:
+        raw = bytes.fromhex(digits)
+    except ValueError:
+        return None
+    return raw if raw.hex() == digits else None
+
+
+def _uuid_str(raw: bytes) -> str:
+    """把 16 字节的 UUID 还原为规范格式的字符串."""
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """以 LEB128 格式写入非负整数."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf: bytes | memoryview, pos: int) -> tuple[int, int]:
+    """读取 LEB128 格式的非负整数，返回值和新的位置."""
+    byte = buf[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    result = byte & 0x7F
+    shift = 7
+    while True:
+        pos += 1
+        byte = buf[pos]
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos + 1
+        shift += 7
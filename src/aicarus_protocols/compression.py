@@ -0,0 +1,212 @@
+"""AIcarus-Message-Protocol v1.6.0 - 预置字典压缩.
+
+单个事件的 JSON 通常只有几百字节，逐帧压缩几乎没有收益；但不同事件之间高度重复
+（字段名、event_type、Seg 结构、常见的会话和用户信息）. 用一份从历史事件中训练出的
+预置字典（zlib 的 zdict）压缩每一帧，可以在保持各帧独立解码的同时获得接近整流压缩的压缩率.
+
+通信双方必须使用同一份字典. 帧是不带头部和校验的原始 deflate 数据，以省下每帧 10 字节；
+双方可以在建立连接时交换 dictionary_id 确认字典一致.
+
+字典可以用 tools/build_zdict.py 从 EventArchive 中训练:
+
+    python tools/build_zdict.py <归档目录> <输出文件>
+"""
+
+import zlib
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from . import json_codec
+from .batch_codec import DEFAULT_MAX_FRAME_SIZE
+from .event import Event
+
+# 默认的字典大小（字节）
+DEFAULT_DICTIONARY_SIZE = 16 * 1024
+# deflate 的窗口是 32 KiB，更长的字典只有末尾部分会被使用
+MAX_DICTIONARY_SIZE = 32 * 1024
+# 默认压缩级别，更高的级别对小帧几乎没有额外收益
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# 原始 deflate 流，不带 zlib 头部和 adler32 校验
+_WBITS = -15
+# 较小的 memLevel 让复制压缩器状态更快，对小帧的压缩率没有影响
+_MEM_LEVEL = 6
+
+
+def train_dictionary(
+    samples: Iterable[Event | dict[str, Any] | bytes],
+    size: int = DEFAULT_DICTIONARY_SIZE,
+) -> bytes:
+    """从样本事件训练预置字典.
+
+    deflate 只能引用字典中连续的字节，因此完整的事件 JSON 比拆散的常见片段更有效.
+    样本按 event_type 分组，每组先预留一个样本，其余空间按出现频率分配. 频率最高的组放在
+    字典末尾，离被压缩的数据最近，匹配距离最短. 字典放不下每组一个样本时，优先保留较常见的组.
+
+    Args:
+        samples (Iterable[Event | dict[str, Any] | bytes]): 样本事件，可以是 Event、
+            Event.to_dict() 的结果或事件的 JSON 字节.
+        size (int): 字典大小上限，不能超过 MAX_DICTIONARY_SIZE.
+
+    Returns:
+        bytes: 训练得到的字典.
+
+    Raises:
+        ValueError: size 不在有效范围内，或没有任何样本.
+    """
+    if not 0 < size <= MAX_DICTIONARY_SIZE:
+        raise ValueError(f"字典大小必须在 1 到 {MAX_DICTIONARY_SIZE} 之间: {size}")
+    groups: defaultdict[str, list[bytes]] = defaultdict(list)
+    total = 0
+    for sample in samples:
+        event_type, payload = _sample_payload(sample)
+        groups[event_type].append(payload)
+        total += 1
+    if not total:
+        raise ValueError("训练字典至少需要一个样本")
+
+    ordered = sorted(groups.values(), key=len)
+    # 先为每组预留其中最短的一个样本，保证少见的事件类型也有可引用的结构；
+    # 放不下所有组时优先保留较常见的组
+    reserved: list[bytes | None] = [None] * len(ordered)
+    free = size
+    for i in range(len(ordered) - 1, -1, -1):
+        shortest = min(ordered[i], key=len)
+        if len(shortest) <= free:
+            reserved[i] = shortest
+            free -= len(shortest)
+    if free == size:
+        # 任何一个样本都比字典大，只能截取最常见的组中最短样本的末尾
+        return min(ordered[-1], key=len)[-size:]
+    # 剩余空间按频率分给各组的其他样本，总长度不会超过 size，无需再截断
+    picked: list[bytes] = []
+    for payloads, first in zip(ordered, reserved, strict=True):
+        budget = free * len(payloads) / total
+        used = 0
+        if first is not None:
+            picked.append(first)
+        for payload in payloads:
+            if payload is first:
+                continue
+            if used + len(payload) > budget:
+                break
+            picked.append(payload)
+            used += len(payload)
+    return b"".join(picked)
+
+
+def _sample_payload(sample: Event | dict[str, Any] | bytes) -> tuple[str, bytes]:
+    """把样本统一为 (event_type, JSON 字节)."""
+    if isinstance(sample, Event):
+        return sample.event_type, sample.to_json_bytes()
+    if isinstance(sample, dict):
+        return str(sample.get("event_type")), json_codec._dumps(sample)
+    payload = bytes(sample)
+    obj = json_codec._loads(payload)
+    event_type = obj.get("event_type") if isinstance(obj, dict) else None
+    return str(event_type), payload
+
+
+class DictionaryCompressor:
+    """使用预置字典逐帧压缩事件.
+
+    每一帧独立压缩，可以单独、乱序解码. 实例不保存帧之间的状态，可以在多个连接之间共享.
+
+    Attributes:
+        dictionary (bytes): 预置字典.
+        dictionary_id (int): 字典的 adler32 校验值，用于确认双方的字典一致.
+        level (int): 压缩级别.
+        max_frame_size (int): 解压后单帧的大小上限.
+
+    Methods:
+        compress(data: bytes) -> bytes: 压缩一帧数据.
+        decompress(data: bytes) -> bytes: 解压一帧数据.
+        encode_event(event: Event) -> bytes: 把事件编码为压缩帧.
+        decode_event(data: bytes, lazy: bool = False) -> Event: 从压缩帧解码事件.
+    """
+
+    def __init__(
+        self,
+        dictionary: bytes,
+        level: int = DEFAULT_COMPRESSION_LEVEL,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+    ) -> None:
+        if len(dictionary) > MAX_DICTIONARY_SIZE:
+            dictionary = dictionary[-MAX_DICTIONARY_SIZE:]
+        self.dictionary = bytes(dictionary)
+        self.dictionary_id = zlib.adler32(self.dictionary)
+        self.level = level
+        self.max_frame_size = max_frame_size
+        # 载入字典需要为整个字典建立哈希表，只做一次，之后每帧复制这个已就绪的状态
+        if self.dictionary:
+            self._primed = zlib.compressobj(
+                level, zlib.DEFLATED, _WBITS, _MEM_LEVEL, zdict=self.dictionary
+            )
+        else:
+            self._primed = zlib.compressobj(level, zlib.DEFLATED, _WBITS, _MEM_LEVEL)
+
+    def compress(self, data: bytes | bytearray | memoryview) -> bytes:
+        """压缩一帧数据.
+
+        Args:
+            data (bytes | bytearray | memoryview): 原始数据.
+
+        Returns:
+            bytes: 压缩后的数据.
+        """
+        compressor = self._primed.copy()
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes | bytearray | memoryview) -> bytes:
+        """解压一帧数据.
+
+        Args:
+            data (bytes | bytearray | memoryview): 压缩后的数据.
+
+        Returns:
+            bytes: 原始数据.
+
+        Raises:
+            ValueError: 数据损坏、字典不匹配，或解压后超过 max_frame_size.
+        """
+        if self.dictionary:
+            decompressor = zlib.decompressobj(_WBITS, zdict=self.dictionary)
+        else:
+            decompressor = zlib.decompressobj(_WBITS)
+        try:
+            result = decompressor.decompress(data, self.max_frame_size)
+            if decompressor.unconsumed_tail:
+                raise ValueError(f"解压后的帧超过上限 {self.max_frame_size} 字节")
+            result += decompressor.flush()
+        except zlib.error as e:
+            raise ValueError(f"无法解压帧: {e}") from e
+        if not decompressor.eof:
+            raise ValueError("压缩帧不完整")
+        return result
+
+    def encode_event(self, event: Event) -> bytes:
+        """把事件编码为压缩帧.
+
+        Args:
+            event (Event): 要编码的事件.
+
+        Returns:
+            bytes: 压缩后的事件 JSON.
+        """
+        return self.compress(json_codec.encode_event(event))
+
+    def decode_event(self, data: bytes | bytearray | memoryview, lazy: bool = False) -> Event:
+        """从压缩帧解码事件.
+
+        Args:
+            data (bytes | bytearray | memoryview): encode_event() 产生的压缩帧.
+            lazy (bool): 为 True 时返回只解析了头部的 LazyEvent.
+
+        Returns:
+            Event: 解码得到的事件.
+
+        Raises:
+            ValueError: 数据损坏、字典不匹配，或内容不是合法的事件 JSON.
+        """
+        return json_codec.decode_event(self.decompress(data), Event, lazy)
@@ -39,3 +39,50 @@ class EventTypePrefix:
     ACTION = "action"
     ACTION_RESPONSE = "action_response"
     META = "meta"
+
+
+class EventIdStrategy:
+    """EventBuilder 生成事件 ID 的策略.
+
+    Attributes:
+        UUID4 (str): 随机 UUID4，默认策略.
+        UUID7 (str): 按时间排序的 UUIDv7，生成更便宜，且可按时间排序和范围扫描.
+    """
+
+    UUID4 = "uuid4"
+    UUID7 = "uuid7"
+
+
+class OverflowPolicy:
+    """EventScheduler 中优先级类别满时的处理策略.
+
+    Attributes:
+        BLOCK (str): 入队方等待空位；非阻塞入队时拒绝新事件.
+        DROP_NEWEST (str): 丢弃新到的事件.
+        DROP_OLDEST (str): 丢弃该类别中等待最久的事件，为新事件腾出空间.
+    """
+
+    BLOCK = "block"
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+
+
+class MetricOperation:
+    """指标记录器统计的热点操作.
+
+    Attributes:
+        TO_DICT (str): Event.to_dict.
+        FROM_DICT (str): Event.from_dict，包括 lazy 模式.
+        ENCODE (str): Event.to_json_bytes，同时记录输出的字节数.
+        DECODE (str): Event.from_json_bytes，同时记录输入的字节数；
+            lazy 模式下耗时包含其中的 from_dict.
+        VALIDATE (str): EventValidator.validate，发现 ERROR 级别的问题时记为失败.
+        BUILD (str): EventBuilder 的 create_* 方法.
+    """
+
+    TO_DICT = "to_dict"
+    FROM_DICT = "from_dict"
+    ENCODE = "encode"
+    DECODE = "decode"
+    VALIDATE = "validate"
+    BUILD = "build"
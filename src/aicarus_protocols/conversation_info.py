@@ -3,11 +3,14 @@
 用于描述会话信息的数据结构.
 """
 
-from dataclasses import asdict, dataclass
+import copy
+from dataclasses import FrozenInstanceError, asdict, dataclass, fields
 from typing import Any, Optional
 
+from . import interning
 
-@dataclass
+
+@dataclass(slots=True)
 class ConversationInfo:
     """2.3. ConversationInfo 对象.
 
@@ -53,10 +56,79 @@ class ConversationInfo:
         if data is None:
             return None
         # 移除 platform 的读取
-        return cls(
-            conversation_id=data.get("conversation_id", "unknown_conversation"),
-            type=data.get("type", "unknown"),
-            name=data.get("name"),
-            parent_id=data.get("parent_id"),
-            extra=data.get("extra"),
+        values = (
+            data.get("conversation_id", "unknown_conversation"),
+            data.get("type", "unknown"),
+            data.get("name"),
+            data.get("parent_id"),
+            data.get("extra"),
         )
+        cache = interning.conversation_info_cache
+        if cache is None or cls is not ConversationInfo:
+            return cls(*values)
+        nested = values[-1]
+        if nested is not None:
+            if nested or not isinstance(nested, dict):
+                # 共享实例的 extra 会被所有使用它的事件看到，只驻留空字典的情况
+                return cls(*values)
+            values = (*values[:-1], interning.EMPTY_READONLY_DICT)
+        try:
+            key = interning.freeze_value(values)
+        except TypeError:
+            return cls(*values)
+        return cache.get_or_create(key, lambda: _InternedConversationInfo(*values))
+
+
+class _InternedConversationInfo(ConversationInfo):
+    """驻留缓存中共享的不可变 ConversationInfo，并缓存了 to_dict() 的结果.
+
+    extra 总是 None 或只读的空字典 interning.EMPTY_READONLY_DICT.
+    与字段相同的普通 ConversationInfo 相等；copy / pickle 得到的是普通的可变 ConversationInfo.
+    """
+
+    __slots__ = ("_dict",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        ConversationInfo.__init__(self, *args, **kwargs)
+        object.__setattr__(self, "_dict", ConversationInfo.to_dict(self))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """初始化完成后禁止赋值."""
+        try:
+            self._dict  # noqa: B018
+        except AttributeError:
+            object.__setattr__(self, name, value)
+            return
+        raise FrozenInstanceError(f"驻留的 ConversationInfo 不可修改: {name}")
+
+    def __delattr__(self, name: str) -> None:
+        """禁止删除字段."""
+        raise FrozenInstanceError(f"驻留的 ConversationInfo 不可修改: {name}")
+
+    def __eq__(self, other: object) -> bool:
+        """按字段与任意 ConversationInfo 比较."""
+        if not isinstance(other, ConversationInfo):
+            return NotImplemented
+        return _field_values(self) == _field_values(other)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """序列化和复制时还原为普通的可变 ConversationInfo."""
+        return (ConversationInfo, _field_values(self))
+
+    def to_dict(self) -> dict[str, Any]:
+        """返回缓存的字典表示的拷贝.
+
+        与 ConversationInfo.to_dict() 一样，extra 会被深拷贝.
+
+        Returns:
+            dict[str, Any]: 包含会话信息的字典表示.
+        """
+        result = dict(self._dict)
+        if "extra" in result:
+            result["extra"] = copy.deepcopy(result["extra"])
+        return result
+
+
+def _field_values(conversation_info: ConversationInfo) -> tuple[Any, ...]:
+    """按字段顺序返回 ConversationInfo 的所有字段值."""
+    return tuple(getattr(conversation_info, f.name) for f in fields(ConversationInfo))
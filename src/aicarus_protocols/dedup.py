@@ -0,0 +1,420 @@
+"""AIcarus-Message-Protocol v1.6.0 - 有界内存的重复事件抑制.
+
+Adapter 重连 NapCat 一类的后端时，后端会重放最近的事件，同一条消息可能被投递两三次.
+DuplicateFilter 按 event_id 和 (平台, message_id) 两种键识别重复事件：
+
+*   精确层：按最后一次出现时间排序的 LRU 集合，只保留 window 秒内出现过的键，
+    且最多保留 max_entries 个. 在这一层命中的一定是重复事件.
+*   概率层（可选）：RotatingBloomFilter 把时间窗口分成若干代，每代一个固定大小的
+    Bloom 过滤器，过期时整代丢弃. 用固定内存覆盖比精确层长得多的窗口，
+    代价是少量唯一事件会被误判为重复；误判率的估计值和累计的预期误判数会计入统计.
+    概率层只记录 (平台, message_id)：Adapter 会为重放的事件生成新的 event_id，
+    event_id 相同的重复投递只发生在很短的时间内，由精确层处理.
+
+用法:
+
+    dedup = DuplicateFilter(window=300.0, bloom_window=86400.0)
+    for event in dedup.filter(events):
+        ...
+"""
+
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+
+from .event import Event
+
+# 精确层默认的时间窗口（秒）
+DEFAULT_DEDUP_WINDOW = 300.0
+# 精确层默认最多保留的键数
+DEFAULT_DEDUP_MAX_ENTRIES = 200_000
+# 概率层每一代默认最多记录的键数
+DEFAULT_BLOOM_CAPACITY = 1_000_000
+# 概率层每一代默认的目标误判率
+DEFAULT_BLOOM_ERROR_RATE = 0.001
+# 概率层默认的代数
+DEFAULT_BLOOM_GENERATIONS = 4
+
+_HASH_MASK = (1 << 64) - 1
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+# 概率层误判率估计的刷新间隔（次查询）
+_FP_REFRESH = 1024
+
+
+class RotatingBloomFilter:
+    """按代轮换的 Bloom 过滤器.
+
+    新键写入最新一代；查询时检查所有代. 最新一代写满 capacity 个键，或距上次轮换超过
+    window / generations 秒时轮换：丢弃最旧的一代并新建一代. 因此一个键在最后一次写入后
+    至少被记住 (generations - 1) / generations 个窗口，内存固定为 generations 个位数组.
+
+    键使用 Python 内置 hash，结果只在同一进程内有效.
+
+    Attributes:
+        capacity (int): 每一代最多记录的键数.
+        error_rate (float): 每一代写满时的目标误判率.
+        window (float | None): 时间窗口（秒），为 None 时只按容量轮换.
+        generations (int): 代数.
+        bit_count (int): 每一代的位数.
+        hash_count (int): 每个键置位的个数.
+        rotations (int): 已轮换的次数.
+
+    Methods:
+        add(key: Hashable) -> None: 记录一个键.
+        check_and_add(key: Hashable) -> bool: 返回键是否可能出现过，并记录它.
+        advance(now: float) -> None: 按时间推进，必要时轮换.
+        rotate() -> None: 立即轮换.
+        false_positive_rate() -> float: 按当前填充程度估计的误判率.
+        nbytes -> int: 位数组占用的字节数.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_BLOOM_CAPACITY,
+        error_rate: float = DEFAULT_BLOOM_ERROR_RATE,
+        window: float | None = None,
+        generations: int = DEFAULT_BLOOM_GENERATIONS,
+    ) -> None:
+        """初始化过滤器.
+
+        Args:
+            capacity (int): 每一代最多记录的键数.
+            error_rate (float): 每一代写满时的目标误判率，查询所有代时的误判率约为它的
+                generations 倍.
+            window (float | None): 时间窗口（秒），为 None 时只按容量轮换.
+            generations (int): 代数，至少为 2.
+
+        Raises:
+            ValueError: 参数超出范围.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity 必须为正")
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError("error_rate 必须在 0 和 1 之间")
+        if generations < 2:
+            raise ValueError("generations 至少为 2")
+        if window is not None and window <= 0:
+            raise ValueError("window 必须为正")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.window = window
+        self.generations = generations
+        # 标准 Bloom 过滤器参数：m = -n ln p / (ln 2)^2，k = m / n ln 2
+        self.bit_count = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.rotations = 0
+        self._span = window / generations if window is not None else None
+        self._rotate_at: float | None = None
+        self._filters: deque[bytearray] = deque(
+            (self._new_bits() for _ in range(generations)), maxlen=generations
+        )
+        self._counts: deque[int] = deque([0] * generations, maxlen=generations)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """返回键是否可能出现过."""
+        return self._contains(self._positions(key))
+
+    @property
+    def nbytes(self) -> int:
+        """位数组占用的字节数."""
+        return sum(len(bits) for bits in self._filters)
+
+    def add(self, key: Hashable) -> None:
+        """记录一个键.
+
+        Args:
+            key (Hashable): 要记录的键.
+        """
+        self._add(self._positions(key))
+
+    def check_and_add(self, key: Hashable) -> bool:
+        """返回键是否可能出现过，并把它记录到最新一代.
+
+        Args:
+            key (Hashable): 要检查的键.
+
+        Returns:
+            bool: 任意一代中可能出现过该键时返回 True.
+        """
+        positions = self._positions(key)
+        current = self._filters[-1]
+        # 在最新一代中边检查边置位，只有最新一代没有命中时才检查较旧的代
+        present = True
+        for position in positions:
+            index = position >> 3
+            mask = 1 << (position & 7)
+            byte = current[index]
+            if not byte & mask:
+                present = False
+                current[index] = byte | mask
+        if not present:
+            present = self._contains(positions, skip=current)
+        self._counted()
+        return present
+
+    def advance(self, now: float) -> None:
+        """按时间推进，距上次轮换超过 window / generations 秒时轮换.
+
+        Args:
+            now (float): 当前时间（秒），与 window 的时钟一致.
+        """
+        if self._span is None:
+            return
+        if self._rotate_at is None:
+            self._rotate_at = now + self._span
+        elif now >= self._rotate_at:
+            # 长时间没有调用时一次轮换多代，最多清空全部
+            elapsed = min(self.generations, int((now - self._rotate_at) // self._span) + 1)
+            for _ in range(elapsed):
+                self.rotate()
+            self._rotate_at = now + self._span
+
+    def rotate(self) -> None:
+        """丢弃最旧的一代并新建一代."""
+        self._filters.append(self._new_bits())
+        self._counts.append(0)
+        self.rotations += 1
+
+    def false_positive_rate(self) -> float:
+        """按各代已记录的键数估计查询一个新键时的误判率.
+
+        Returns:
+            float: 0 到 1 之间的估计值.
+        """
+        miss = 1.0
+        for count in self._counts:
+            fill = 1.0 - math.exp(-self.hash_count * count / self.bit_count)
+            miss *= 1.0 - fill**self.hash_count
+        return 1.0 - miss
+
+    def _new_bits(self) -> bytearray:
+        """新建一代的位数组."""
+        return bytearray((self.bit_count + 7) // 8)
+
+    def _positions(self, key: Hashable) -> list[int]:
+        """用一次哈希的高低 32 位做双重哈希，得到 hash_count 个位置."""
+        # 乘以奇数常数打散内置 hash 中有规律的位（如 float 和小整数的 hash）
+        value = (hash(key) * _HASH_MULTIPLIER) & _HASH_MASK
+        low = value & 0xFFFFFFFF
+        step = (value >> 32) | 1
+        bit_count = self.bit_count
+        return [(low + i * step) % bit_count for i in range(self.hash_count)]
+
+    def _contains(self, positions: list[int], skip: bytearray | None = None) -> bool:
+        """返回是否有某一代（skip 除外）的所有位置都已置位."""
+        for bits in self._filters:
+            if bits is skip:
+                continue
+            for position in positions:
+                if not bits[position >> 3] & (1 << (position & 7)):
+                    break
+            else:
+                return True
+        return False
+
+    def _add(self, positions: list[int]) -> None:
+        """在最新一代中置位."""
+        bits = self._filters[-1]
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        self._counted()
+
+    def _counted(self) -> None:
+        """最新一代记录了一个键，写满时轮换."""
+        self._counts[-1] += 1
+        if self._counts[-1] >= self.capacity:
+            self.rotate()
+
+
+class DuplicateFilter:
+    """按 event_id 和 (平台, message_id) 抑制重复事件.
+
+    不是线程安全的.
+
+    Attributes:
+        window (float): 精确层的时间窗口（秒），键在最后一次出现后保留这么久.
+        max_entries (int): 精确层最多保留的键数，超过时淘汰最久未出现的键.
+        bloom (RotatingBloomFilter | None): 概率层，未启用时为 None.
+        checked (int): 已检查的事件数.
+        duplicates (int): 判定为重复的事件数.
+        bloom_duplicates (int): 其中只在概率层命中的事件数.
+        expected_false_positives (float): 概率层累计的预期误判数（估计值）.
+        evicted (int): 精确层因过期或容量淘汰的键数.
+
+    Methods:
+        check(event: Event) -> bool: 返回事件是否重复，并记录它.
+        check_ids(event_id: str, platform: str | None, message_id: str | None) -> bool:
+            按 ID 检查并记录.
+        filter(events: Iterable[Event]) -> Iterator[Event]: 只产出不重复的事件.
+        clear() -> None: 清空所有记录.
+        stats() -> dict[str, float]: 各计数器的快照.
+    """
+
+    def __init__(
+        self,
+        window: float = DEFAULT_DEDUP_WINDOW,
+        max_entries: int = DEFAULT_DEDUP_MAX_ENTRIES,
+        bloom_window: float | None = None,
+        bloom_capacity: int = DEFAULT_BLOOM_CAPACITY,
+        bloom_error_rate: float = DEFAULT_BLOOM_ERROR_RATE,
+        bloom_generations: int = DEFAULT_BLOOM_GENERATIONS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """初始化去重器.
+
+        Args:
+            window (float): 精确层的时间窗口（秒）.
+            max_entries (int): 精确层最多保留的键数.
+            bloom_window (float | None): 概率层的时间窗口（秒），为 None 时不启用概率层.
+            bloom_capacity (int): 概率层每一代最多记录的键数.
+            bloom_error_rate (float): 概率层每一代写满时的目标误判率.
+            bloom_generations (int): 概率层的代数.
+            clock (Callable[[], float]): 计时函数，默认为 time.monotonic.
+
+        Raises:
+            ValueError: window 或 max_entries 不是正数，或概率层参数超出范围.
+        """
+        if window <= 0 or max_entries <= 0:
+            raise ValueError("window 和 max_entries 必须为正")
+        self.window = window
+        self.max_entries = max_entries
+        self.bloom = (
+            RotatingBloomFilter(bloom_capacity, bloom_error_rate, bloom_window, bloom_generations)
+            if bloom_window is not None
+            else None
+        )
+        self.checked = 0
+        self.duplicates = 0
+        self.bloom_duplicates = 0
+        self.expected_false_positives = 0.0
+        self.evicted = 0
+        self._clock = clock
+        # 键 -> 最后一次出现的时间，按该时间从旧到新排列
+        self._entries: OrderedDict[Hashable, float] = OrderedDict()
+        # 概率层误判率的缓存，每次轮换或每查询 _FP_REFRESH 次后重新估计
+        self._fp_rate = 0.0
+        self._fp_refresh = 0
+        self._rotations = 0
+
+    def __len__(self) -> int:
+        """精确层当前保留的键数."""
+        return len(self._entries)
+
+    def check(self, event: Event) -> bool:
+        """返回事件是否重复，并记录它的键.
+
+        Args:
+            event (Event): 要检查的事件.
+
+        Returns:
+            bool: event_id 或 (平台, message_id) 在窗口内出现过时返回 True.
+        """
+        return self.check_ids(event.event_id, event.type_path.platform, event.get_message_id())
+
+    def check_ids(self, event_id: str, platform: str | None, message_id: str | None) -> bool:
+        """按 ID 检查事件是否重复，并记录这些键.
+
+        Args:
+            event_id (str): 事件 ID.
+            platform (str | None): 平台 ID.
+            message_id (str | None): 消息 ID，没有时只按 event_id 判断.
+
+        Returns:
+            bool: 任意一个键在窗口内出现过时返回 True.
+        """
+        now = self._clock()
+        self._expire(now)
+        self.checked += 1
+        duplicate = self._touch(event_id, now)
+        probable = False
+        if message_id is not None:
+            message_key = (platform, message_id)
+            duplicate = self._touch(message_key, now) or duplicate
+            bloom = self.bloom
+            if bloom is not None:
+                bloom.advance(now)
+                if duplicate:
+                    bloom.add(message_key)
+                else:
+                    probable = self._probe(bloom, message_key)
+        entries = self._entries
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evicted += 1
+        if duplicate or probable:
+            self.duplicates += 1
+            self.bloom_duplicates += probable
+            return True
+        return False
+
+    def filter(self, events: Iterable[Event]) -> Iterator[Event]:
+        """只产出不重复的事件.
+
+        Args:
+            events (Iterable[Event]): 输入事件.
+
+        Yields:
+            Event: 第一次出现的事件.
+        """
+        for event in events:
+            if not self.check(event):
+                yield event
+
+    def clear(self) -> None:
+        """清空精确层和概率层的所有记录，计数器保留."""
+        self._entries.clear()
+        if self.bloom is not None:
+            for _ in range(self.bloom.generations):
+                self.bloom.rotate()
+
+    def stats(self) -> dict[str, float]:
+        """返回各计数器的快照.
+
+        Returns:
+            dict[str, float]: checked、duplicates、bloom_duplicates、evicted、
+                entries（精确层键数）、bloom_bytes、false_positive_rate（概率层当前的误判率估计）
+                和 expected_false_positives.
+        """
+        bloom = self.bloom
+        return {
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "bloom_duplicates": self.bloom_duplicates,
+            "evicted": self.evicted,
+            "entries": len(self._entries),
+            "bloom_bytes": bloom.nbytes if bloom is not None else 0,
+            "false_positive_rate": bloom.false_positive_rate() if bloom is not None else 0.0,
+            "expected_false_positives": self.expected_false_positives,
+        }
+
+    def _expire(self, now: float) -> None:
+        """淘汰精确层中超过时间窗口的键."""
+        entries = self._entries
+        horizon = now - self.window
+        while entries:
+            key = next(iter(entries))
+            if entries[key] > horizon:
+                return
+            del entries[key]
+            self.evicted += 1
+
+    def _touch(self, key: Hashable, now: float) -> bool:
+        """在精确层中记录一个键，返回它是否已在窗口内."""
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+            entries[key] = now
+            return True
+        entries[key] = now
+        return False
+
+    def _probe(self, bloom: RotatingBloomFilter, key: Hashable) -> bool:
+        """在概率层中检查并记录精确层未命中的键，同时累计预期误判数."""
+        if bloom.rotations != self._rotations or self._fp_refresh <= 0:
+            self._fp_rate = bloom.false_positive_rate()
+            self._rotations = bloom.rotations
+            self._fp_refresh = _FP_REFRESH
+        self._fp_refresh -= 1
+        self.expected_false_positives += self._fp_rate
+        return bloom.check_and_add(key)
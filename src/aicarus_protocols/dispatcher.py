@@ -0,0 +1,256 @@
+"""AIcarus-Message-Protocol v1.6.0 - 基于 event_type 命名空间的事件分发器.
+
+处理器按匹配模式订阅事件，例如 "message.qq.group.*"、"action_response.**".
+所有模式被编译进同一棵按段组织的前缀树，分发一个事件只需沿 event_type 的各段走一遍，
+开销与订阅数量无关；同一 event_type 的匹配结果还会被缓存，直到订阅发生变化.
+"""
+
+import inspect
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .event import Event
+from .event_type import WILDCARD_ANY, WILDCARD_ONE, split_event_type_pattern
+
+EventHandler = Callable[[Event], Any | Awaitable[Any]]
+
+# 匹配结果缓存的容量，超出后整体清空
+DISPATCH_CACHE_SIZE = 4096
+
+
+@dataclass(slots=True, eq=False)
+class Subscription:
+    """一条事件订阅.
+
+    Attributes:
+        pattern (str): 匹配模式，"*" 匹配恰好一段，"**" 匹配零段或多段.
+        handler (EventHandler): 事件处理器，可以是普通函数或 async 函数.
+        priority (int): 优先级，数值越大越先执行；相同优先级按订阅顺序执行.
+        order (int): 订阅序号，由分发器分配.
+    """
+
+    pattern: str
+    handler: EventHandler
+    priority: int = 0
+    order: int = field(default=0, repr=False)
+
+
+class _PatternNode:
+    """模式前缀树的节点."""
+
+    __slots__ = ("any_child", "children", "is_any", "one_child", "subscriptions")
+
+    def __init__(self, is_any: bool = False) -> None:
+        self.children: dict[str, _PatternNode] = {}
+        self.one_child: _PatternNode | None = None  # "*" 边
+        self.any_child: _PatternNode | None = None  # "**" 边
+        self.is_any = is_any  # 经由 "**" 到达的节点可以继续吞掉任意多段
+        self.subscriptions: list[Subscription] = []  # 在此节点结束的订阅
+
+
+class EventDispatcher:
+    """基于 event_type 匹配模式的事件分发器.
+
+    Methods:
+        subscribe(pattern: str, handler: EventHandler, priority: int = 0) -> Subscription:
+            订阅匹配模式.
+        on(pattern: str, priority: int = 0) -> Callable: 以装饰器形式订阅匹配模式.
+        unsubscribe(subscription: Subscription) -> bool: 取消订阅.
+        handlers_for(event_type: str) -> tuple[Subscription, ...]: 返回匹配某个事件类型的
+            所有订阅，按执行顺序排列.
+        dispatch(event: Event) -> int: 把事件依次交给匹配的处理器，await async 处理器.
+        dispatch_sync(event: Event) -> int: 只在同步上下文中分发，不允许 async 处理器.
+    """
+
+    def __init__(self) -> None:
+        self._root = _PatternNode()
+        self._next_order = 0
+        self._count = 0
+        self._cache: dict[str, tuple[Subscription, ...]] = {}
+
+    def __len__(self) -> int:
+        """返回当前的订阅数量.
+
+        Returns:
+            int: 订阅数量.
+        """
+        return self._count
+
+    def subscribe(self, pattern: str, handler: EventHandler, priority: int = 0) -> Subscription:
+        """订阅匹配模式.
+
+        Args:
+            pattern (str): 匹配模式，如 "message.qq.group.*" 或 "action_response.**".
+            handler (EventHandler): 事件处理器，接收 Event 作为唯一参数.
+            priority (int): 优先级，数值越大越先执行.
+
+        Returns:
+            Subscription: 订阅对象，可用于 unsubscribe.
+
+        Raises:
+            ValueError: 模式为空或包含空段.
+        """
+        node = self._root
+        for part in split_event_type_pattern(pattern):
+            node = self._child(node, part)
+        subscription = Subscription(pattern, handler, priority, self._next_order)
+        self._next_order += 1
+        node.subscriptions.append(subscription)
+        self._count += 1
+        self._cache.clear()
+        return subscription
+
+    def on(self, pattern: str, priority: int = 0) -> Callable[[EventHandler], EventHandler]:
+        """以装饰器形式订阅匹配模式.
+
+        Args:
+            pattern (str): 匹配模式.
+            priority (int): 优先级，数值越大越先执行.
+
+        Returns:
+            Callable[[EventHandler], EventHandler]: 原样返回处理器的装饰器.
+        """
+
+        def decorator(handler: EventHandler) -> EventHandler:
+            self.subscribe(pattern, handler, priority)
+            return handler
+
+        return decorator
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """取消订阅.
+
+        Args:
+            subscription (Subscription): subscribe 返回的订阅对象.
+
+        Returns:
+            bool: 如果找到并移除了该订阅返回 True，否则返回 False.
+        """
+        node: _PatternNode | None = self._root
+        for part in split_event_type_pattern(subscription.pattern):
+            if part == WILDCARD_ANY:
+                node = node.any_child
+            elif part == WILDCARD_ONE:
+                node = node.one_child
+            else:
+                node = node.children.get(part)
+            if node is None:
+                return False
+        for i, existing in enumerate(node.subscriptions):
+            if existing is subscription:
+                del node.subscriptions[i]
+                self._count -= 1
+                self._cache.clear()
+                return True
+        return False
+
+    def handlers_for(self, event_type: str) -> tuple[Subscription, ...]:
+        """返回匹配某个事件类型的所有订阅，按执行顺序排列.
+
+        Args:
+            event_type (str): 事件类型字符串.
+
+        Returns:
+            tuple[Subscription, ...]: 按优先级从高到低、同优先级按订阅顺序排列的订阅.
+        """
+        cached = self._cache.get(event_type)
+        if cached is not None:
+            return cached
+        result = self._match(event_type)
+        if len(self._cache) >= DISPATCH_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[event_type] = result
+        return result
+
+    async def dispatch(self, event: Event) -> int:
+        """把事件依次交给匹配的处理器.
+
+        处理器按优先级顺序串行执行；返回 awaitable 的处理器会先被 await 再执行下一个.
+        处理器抛出的异常会直接向上传播.
+
+        Args:
+            event (Event): 要分发的事件.
+
+        Returns:
+            int: 被调用的处理器数量.
+        """
+        subscriptions = self.handlers_for(event.event_type)
+        for subscription in subscriptions:
+            result = subscription.handler(event)
+            if inspect.isawaitable(result):
+                await result
+        return len(subscriptions)
+
+    def dispatch_sync(self, event: Event) -> int:
+        """在同步上下文中分发事件.
+
+        Args:
+            event (Event): 要分发的事件.
+
+        Returns:
+            int: 被调用的处理器数量.
+
+        Raises:
+            TypeError: 某个处理器返回了 awaitable.
+        """
+        subscriptions = self.handlers_for(event.event_type)
+        for subscription in subscriptions:
+            result = subscription.handler(event)
+            if inspect.isawaitable(result):
+                if inspect.iscoroutine(result):
+                    result.close()
+                raise TypeError(f"处理器 {subscription.handler!r} 是异步的，请使用 dispatch() 分发")
+        return len(subscriptions)
+
+    @staticmethod
+    def _child(node: _PatternNode, part: str) -> _PatternNode:
+        """返回 node 在 part 边上的子节点，不存在时创建."""
+        if part == WILDCARD_ANY:
+            if node.any_child is None:
+                node.any_child = _PatternNode(is_any=True)
+            return node.any_child
+        if part == WILDCARD_ONE:
+            if node.one_child is None:
+                node.one_child = _PatternNode()
+            return node.one_child
+        child = node.children.get(part)
+        if child is None:
+            child = node.children[part] = _PatternNode()
+        return child
+
+    def _match(self, event_type: str) -> tuple[Subscription, ...]:
+        """沿 event_type 的各段同时推进所有可能的模式节点，收集匹配的订阅."""
+        states = _closure([self._root])
+        for part in event_type.split("."):
+            step: list[_PatternNode] = []
+            for node in states:
+                child = node.children.get(part)
+                if child is not None:
+                    step.append(child)
+                if node.one_child is not None:
+                    step.append(node.one_child)
+                if node.is_any:
+                    step.append(node)
+            if not step:
+                return ()
+            states = _closure(step)
+        matched = [sub for node in states for sub in node.subscriptions]
+        matched.sort(key=lambda sub: (-sub.priority, sub.order))
+        return tuple(matched)
+
+
+def _closure(nodes: list[_PatternNode]) -> list[_PatternNode]:
+    """补上经由 "**" 匹配零段可达的节点，并去除重复."""
+    seen: set[int] = set()
+    result: list[_PatternNode] = []
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        result.append(node)
+        if node.any_child is not None:
+            stack.append(node.any_child)
+    return result
@@ -3,19 +3,43 @@
 所有交互的顶层载体，platform 的信息已整合到 event_type 中.
 """
 
+from collections.abc import Iterable
 from dataclasses import dataclass
+from time import perf_counter_ns
 from typing import Any
 
+from . import json_codec, metrics
+from .constants import EventTypePrefix, MetricOperation
 from .conversation_info import ConversationInfo
-from .seg import Seg
+from .event_type import EventTypePath
+from .seg import (
+    INDEX_MIN_SEGS,
+    Seg,
+    SegList,
+    _indexed_segs,
+    first_seg,
+    segs_of_type,
+)
 from .user_info import UserInfo
 
 
-@dataclass
-class Event:
+class _EventCacheSlots:
+    """为 Event 提供派生数据缓存的存储位置.
+
+    这些 slot 不是 dataclass 字段，不参与 to_dict、比较和序列化.
+    """
+
+    __slots__ = ("_type_path",)
+
+
+@dataclass(slots=True)
+class Event(_EventCacheSlots):
     """2.1. Event 对象.
 
     所有交互的顶层载体。platform 字段已被移除，其信息被整合进 event_type.
+    Event 及其组成对象均使用 __slots__，Core 中长期驻留的大量事件不再为每个实例分配 __dict__.
+    按类型查找 Seg 的方法不会替换调用方传入的 content. content 为 SegList（解码得到的事件
+    都是如此）时使用其类型索引，否则按当前内容扫描；两种情况下结果都与当前内容一致.
 
     Attributes:
         event_id (str): 事件包装对象的唯一标识符.
@@ -28,11 +52,18 @@ class Event:
         raw_data (str | None): 原始事件的字符串表示.
 
     Methods:
+        type_path -> EventTypePath: 解析后的 event_type 路径（缓存属性）.
         get_platform() -> str | None: 从 event_type 中解析并返回平台 ID.
         to_dict() -> dict[str, Any]: 将 Event 实例转换为字典.
-        from_dict(data: dict[str, Any]) -> Event: 从字典创建 Event 实例.
+        from_dict(data: dict[str, Any], lazy: bool = False) -> Event: 从字典创建 Event 实例.
+        to_json_bytes() -> bytes: 将 Event 实例直接编码为 UTF-8 JSON 字节.
+        from_json_bytes(data: bytes) -> Event: 从 JSON 字节创建 Event 实例.
+        list_to_json_bytes(events: Iterable[Event]) -> bytes: 将多个事件编码为 JSON 数组.
+        list_from_json_bytes(data: bytes) -> list[Event]: 从 JSON 数组创建多个事件.
         get_message_id() -> str | None: 从 content 中提取消息 ID（如果存在）.
         get_text_content() -> str: 提取所有文本内容并拼接.
+        find_seg(seg_type: str) -> Seg | None: 返回 content 中指定类型的第一个 Seg.
+        filter_segs(seg_type: str) -> list[Seg]: 返回 content 中指定类型的所有 Seg.
         is_message_event() -> bool: 判断是否为消息事件.
         is_notice_event() -> bool: 判断是否为通知事件.
         is_request_event() -> bool: 判断是否为请求事件.
@@ -52,6 +83,24 @@ class Event:
     conversation_info: ConversationInfo | None = None  # 事件发生的会话上下文信息。
     raw_data: str | None = None  # 原始事件的字符串表示。
 
+    @property
+    def type_path(self) -> EventTypePath:
+        """解析后的 event_type 路径.
+
+        首次访问时解析并缓存在实例上；event_type 被重新赋值后会自动重新解析.
+
+        Returns:
+            EventTypePath: 与当前 event_type 对应的路径对象.
+        """
+        try:
+            path = self._type_path
+            if path.raw == self.event_type:
+                return path
+        except AttributeError:
+            pass
+        path = self._type_path = EventTypePath.parse(self.event_type)
+        return path
+
     def get_platform(self) -> str | None:
         """从 event_type 中解析并返回平台 ID.
 
@@ -60,8 +109,7 @@ class Event:
         Returns:
             str | None: 平台 ID，如果 event_type 格式不正确则返回 None.
         """
-        parts = self.event_type.split(".")
-        return parts[1] if len(parts) >= 2 else None
+        return self.type_path.platform
 
     def to_dict(self) -> dict[str, Any]:
         """将 Event 实例转换为字典.
@@ -69,12 +117,15 @@ class Event:
         Returns:
             dict[str, Any]: 包含事件信息的字典表示.
         """
+        recorder = metrics.recorder
+        if recorder is not None:
+            started = perf_counter_ns()
         result = {
             "event_id": self.event_id,
             "event_type": self.event_type,
             "time": self.time,
             "bot_id": self.bot_id,
-            "content": [seg.to_dict() for seg in self.content],
+            "content": self._content_dicts(),
         }
 
         if self.user_info is not None:
@@ -86,56 +137,151 @@ class Event:
         if self.raw_data is not None:
             result["raw_data"] = self.raw_data
 
+        if recorder is not None:
+            recorder.observe(MetricOperation.TO_DICT, self.event_type, perf_counter_ns() - started)
         return result
 
+    def _content_dicts(self) -> list[dict[str, Any]]:
+        """返回 content 的字典列表表示，供 to_dict 和编解码器使用."""
+        return [seg.to_dict() for seg in self.content]
+
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> "Event":
+    def from_dict(cls, data: dict[str, Any], lazy: bool = False) -> "Event":
         """从字典创建 Event 实例.
 
         Args:
             data (dict[str, Any]): 包含事件信息的字典.
+            lazy (bool): 为 True 时返回 LazyEvent，只解析事件头部，
+                content、user_info 和 raw_data 在首次访问时才构建.
 
         Returns:
             Event: 创建的 Event 实例.
         """
-        # 确保必需字段存在。
-        event_id = data.get("event_id", "unknown_event")
-        event_type = data.get("event_type", "unknown.unknown.unknown")  # 给个符合格式的默认值。
-        time = data.get("time", 0.0)
-        bot_id = data.get("bot_id", "unknown")
+        recorder = metrics.recorder
+        if recorder is not None:
+            return recorder.measure(
+                MetricOperation.FROM_DICT, data.get("event_type"), cls._from_dict, data, lazy
+            )
+        return cls._from_dict(data, lazy)
 
-        # 处理 content 字段。
-        content_data = data.get("content", [])
-        if not isinstance(content_data, list):
-            content_data = []
-        content = [
-            Seg.from_dict(seg_data) for seg_data in content_data if isinstance(seg_data, dict)
-        ]
+    @classmethod
+    def _from_dict(cls, data: dict[str, Any], lazy: bool) -> "Event":
+        """from_dict 的实际实现."""
+        if lazy:
+            return LazyEvent.from_source(data)
 
         # 处理可选字段。
         user_info_data = data.get("user_info")
-        conversation_info_data = data.get("conversation_info")
 
         return cls(
-            event_id=event_id,
-            event_type=event_type,
-            time=time,
-            bot_id=bot_id,
-            content=content,
+            event_id=data.get("event_id", "unknown_event"),
+            event_type=data.get("event_type", "unknown.unknown.unknown"),  # 给个符合格式的默认值。
+            time=data.get("time", 0.0),
+            bot_id=data.get("bot_id", "unknown"),
+            content=_parse_content(data.get("content")),
             user_info=UserInfo.from_dict(user_info_data) if user_info_data else None,
-            conversation_info=ConversationInfo.from_dict(conversation_info_data)
-            if conversation_info_data
-            else None,
+            conversation_info=_parse_conversation_info(data.get("conversation_info")),
             raw_data=data.get("raw_data"),
         )
 
+    def to_json_bytes(self) -> bytes:
+        """将 Event 实例直接编码为 UTF-8 JSON 字节.
+
+        结果与 json.dumps(self.to_dict()) 等价，但不会构造并拷贝中间字典.
+
+        Returns:
+            bytes: 事件的 JSON 表示.
+        """
+        return json_codec.encode_event(self)
+
+    @classmethod
+    def from_json_bytes(
+        cls, data: bytes | bytearray | memoryview | str, lazy: bool = False
+    ) -> "Event":
+        """从 JSON 字节创建 Event 实例.
+
+        Args:
+            data (bytes | bytearray | memoryview | str): 事件的 JSON 表示.
+            lazy (bool): 为 True 时返回 LazyEvent，详见 from_dict.
+
+        Returns:
+            Event: 创建的 Event 实例.
+
+        Raises:
+            ValueError: 数据不是合法的 JSON 对象.
+        """
+        return json_codec.decode_event(data, cls, lazy)
+
+    @staticmethod
+    def list_to_json_bytes(events: Iterable["Event"]) -> bytes:
+        """将多个 Event 编码为一个 JSON 数组.
+
+        Args:
+            events (Iterable[Event]): 要编码的事件序列.
+
+        Returns:
+            bytes: 事件列表的 JSON 表示.
+        """
+        return json_codec.encode_events(events)
+
+    @classmethod
+    def list_from_json_bytes(
+        cls, data: bytes | bytearray | memoryview | str, lazy: bool = False
+    ) -> list["Event"]:
+        """从 JSON 数组创建多个 Event 实例.
+
+        Args:
+            data (bytes | bytearray | memoryview | str): 事件列表的 JSON 表示.
+            lazy (bool): 为 True 时返回 LazyEvent 列表，详见 from_dict.
+
+        Returns:
+            list[Event]: 创建的 Event 实例列表.
+
+        Raises:
+            ValueError: 数据不是合法的 JSON 数组.
+        """
+        return json_codec.decode_events(data, cls, lazy)
+
+    def find_seg(self, seg_type: str) -> Seg | None:
+        """返回 content 中指定类型的第一个 Seg.
+
+        Args:
+            seg_type (str): 要查找的 Seg 类型.
+
+        Returns:
+            Seg | None: 找到的第一个 Seg 对象或 None.
+        """
+        return first_seg(self.content, seg_type)
+
+    def filter_segs(self, seg_type: str) -> list[Seg]:
+        """返回 content 中指定类型的所有 Seg.
+
+        Args:
+            seg_type (str): 要查找的 Seg 类型.
+
+        Returns:
+            list[Seg]: 所有匹配的 Seg 对象列表.
+        """
+        content = self.content
+        if len(content) >= INDEX_MIN_SEGS:
+            return segs_of_type(content, seg_type)
+        return [seg for seg in content if seg.type == seg_type]
+
     def get_message_id(self) -> str | None:
         """从 content 中提取消息 ID（如果存在）.
 
         Returns:
             str | None: 如果 content 中包含消息 ID，则返回该 ID，否则返回 None.
         """
-        for seg in self.content:
+        content = self.content
+        if len(content) >= INDEX_MIN_SEGS:
+            matched = _indexed_segs(content, "message_metadata")
+            if matched is not None:
+                for seg in matched:
+                    if "message_id" in seg.data:
+                        return seg.data["message_id"]
+                return None
+        for seg in content:
             if seg.type == "message_metadata" and "message_id" in seg.data:
                 return seg.data["message_id"]
         return None
@@ -146,8 +292,16 @@ class Event:
         Returns:
             str: 提取的所有文本内容，按顺序连接成一个字符串.
         """
+        content = self.content
         text_parts = []
-        for seg in self.content:
+        if len(content) >= INDEX_MIN_SEGS:
+            matched = _indexed_segs(content, "text")
+            if matched is not None:
+                for seg in matched:
+                    if "text" in seg.data:
+                        text_parts.append(seg.data["text"])
+                return "".join(text_parts)
+        for seg in content:
             if seg.type == "text" and "text" in seg.data:
                 text_parts.append(seg.data["text"])
         return "".join(text_parts)
@@ -158,7 +312,7 @@ class Event:
         Returns:
             bool: 如果 event_type 以 "message." 开头，则返回 True，否则返回 False.
         """
-        return self.event_type.startswith("message.")
+        return self.type_path.prefix == EventTypePrefix.MESSAGE
 
     def is_notice_event(self) -> bool:
         """判断是否为通知事件.
@@ -166,7 +320,7 @@ class Event:
         Returns:
             bool: 如果 event_type 以 "notice." 开头，则返回 True，否则返回 False.
         """
-        return self.event_type.startswith("notice.")
+        return self.type_path.prefix == EventTypePrefix.NOTICE
 
     def is_request_event(self) -> bool:
         """判断是否为请求事件.
@@ -174,7 +328,7 @@ class Event:
         Returns:
             bool: 如果 event_type 以 "request." 开头，则返回 True，否则返回 False.
         """
-        return self.event_type.startswith("request.")
+        return self.type_path.prefix == EventTypePrefix.REQUEST
 
     def is_action_event(self) -> bool:
         """判断是否为动作事件.
@@ -182,7 +336,7 @@ class Event:
         Returns:
             bool: 如果 event_type 以 "action." 开头，则返回 True，否则返回 False.
         """
-        return self.event_type.startswith("action.")
+        return self.type_path.prefix == EventTypePrefix.ACTION
 
     def is_action_response_event(self) -> bool:
         """判断是否为动作响应事件.
@@ -190,7 +344,7 @@ class Event:
         Returns:
             bool: 如果 event_type 以 "action_response." 开头，则返回 True，否则返回 False.
         """
-        return self.event_type.startswith("action_response.")
+        return self.type_path.prefix == EventTypePrefix.ACTION_RESPONSE
 
     def is_meta_event(self) -> bool:
         """判断是否为元事件.
@@ -198,7 +352,7 @@ class Event:
         Returns:
             bool: 如果 event_type 以 "meta." 开头，则返回 True，否则返回 False.
         """
-        return self.event_type.startswith("meta.")
+        return self.type_path.prefix == EventTypePrefix.META
 
     def __str__(self) -> str:
         """返回 Event 的字符串表示.
@@ -215,3 +369,122 @@ class Event:
             str: Event 的简短字符串表示.
         """
         return self.__str__()
+
+
+def _parse_content(content_data: Any) -> SegList:
+    """把 content 的字典列表解析为 SegList，忽略非字典元素."""
+    if not isinstance(content_data, list):
+        return SegList()
+    return SegList(
+        Seg.from_dict(seg_data) for seg_data in content_data if isinstance(seg_data, dict)
+    )
+
+
+def _parse_conversation_info(data: Any) -> ConversationInfo | None:
+    """解析 conversation_info 字段，空值返回 None."""
+    return ConversationInfo.from_dict(data) if data else None
+
+
+def _normalize_seg_dict(seg_data: dict[str, Any]) -> dict[str, Any]:
+    """得到与 Seg.from_dict(seg_data).to_dict() 相同的结果，但不构造 Seg 对象."""
+    data = seg_data.get("data", {})
+    if not isinstance(data, dict):
+        data = {"value": data} if data is not None else {}
+    return {"type": seg_data.get("type", "unknown"), "data": data}
+
+
+# Event 中各字段的底层 slot 描述符，LazyEvent 通过它们读写真实存储
+_content_slot = Event.__dict__["content"]
+_user_info_slot = Event.__dict__["user_info"]
+_raw_data_slot = Event.__dict__["raw_data"]
+
+
+class LazyEvent(Event):
+    """按需解码的 Event.
+
+    只在创建时解析 event_id、event_type、time、bot_id 和 conversation_info 等路由常用的头部字段，
+    content、user_info 和 raw_data 在首次访问时才从源字典构建. 只转发而不读取内容的事件
+    调用 to_dict() / to_json_bytes() 时，也不会为 content 构造 Seg 对象.
+
+    LazyEvent 持有源字典的引用，在所有字段被构建之前调用方不应修改它.
+    除了解码时机，其行为与 Event 完全一致，包括 is_message_event()、get_platform()
+    和 get_text_content() 等方法.
+
+    Methods:
+        from_source(data: dict[str, Any]) -> LazyEvent: 从事件字典创建 LazyEvent.
+    """
+
+    __slots__ = ("_source",)
+
+    @classmethod
+    def from_source(cls, data: dict[str, Any]) -> "LazyEvent":
+        """从事件字典创建 LazyEvent，只解析头部字段.
+
+        Args:
+            data (dict[str, Any]): 包含事件信息的字典.
+
+        Returns:
+            LazyEvent: 创建的 LazyEvent 实例.
+        """
+        event = cls.__new__(cls)
+        event.event_id = data.get("event_id", "unknown_event")
+        event.event_type = data.get("event_type", "unknown.unknown.unknown")
+        event.time = data.get("time", 0.0)
+        event.bot_id = data.get("bot_id", "unknown")
+        event.conversation_info = _parse_conversation_info(data.get("conversation_info"))
+        event._source = data
+        return event
+
+    @property
+    def content(self) -> list[Seg]:
+        """事件的具体内容，首次访问时构建."""
+        try:
+            return _content_slot.__get__(self)
+        except AttributeError:
+            content = _parse_content(self._source.get("content"))
+            _content_slot.__set__(self, content)
+            return content
+
+    @content.setter
+    def content(self, value: list[Seg]) -> None:
+        _content_slot.__set__(self, value)
+
+    @property
+    def user_info(self) -> UserInfo | None:
+        """与事件最直接相关的用户信息，首次访问时构建."""
+        try:
+            return _user_info_slot.__get__(self)
+        except AttributeError:
+            data = self._source.get("user_info")
+            user_info = UserInfo.from_dict(data) if data else None
+            _user_info_slot.__set__(self, user_info)
+            return user_info
+
+    @user_info.setter
+    def user_info(self, value: UserInfo | None) -> None:
+        _user_info_slot.__set__(self, value)
+
+    @property
+    def raw_data(self) -> str | None:
+        """原始事件的字符串表示，首次访问时读取."""
+        try:
+            return _raw_data_slot.__get__(self)
+        except AttributeError:
+            raw_data = self._source.get("raw_data")
+            _raw_data_slot.__set__(self, raw_data)
+            return raw_data
+
+    @raw_data.setter
+    def raw_data(self, value: str | None) -> None:
+        _raw_data_slot.__set__(self, value)
+
+    def _content_dicts(self) -> list[dict[str, Any]]:
+        """在 content 尚未构建时直接从源字典生成字典列表，不构造 Seg 对象."""
+        try:
+            content = _content_slot.__get__(self)
+        except AttributeError:
+            content_data = self._source.get("content")
+            if not isinstance(content_data, list):
+                return []
+            return [_normalize_seg_dict(item) for item in content_data if isinstance(item, dict)]
+        return [seg.to_dict() for seg in content]
@@ -0,0 +1,482 @@
+"""AIcarus-Message-Protocol v1.6.0 - 列式事件批.
+
+把大量事件转换为按列存放的紧凑数组，用于统计分析（如按平台、会话、小时计数）.
+每个事件只保留分析常用的几个字段：
+
+*   time：float64 毫秒时间戳.
+*   event_type、platform、conversation_id、user_id：字典编码的 int32 代码，
+    缺失值的代码为 -1.
+*   text_length：文本内容的字符数.
+
+安装了 NumPy 时各列是 numpy.ndarray，过滤和分组计数都是向量化运算；
+否则回退到标准库 array，以逐列循环完成同样的计算，结果完全一致.
+"""
+
+import math
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from .event import Event
+from .event_type import EventTypePath
+from .seg import segs_of_type
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 取决于运行环境
+    np = None
+
+# 当前使用的数组后端名称，"numpy" 或 "array"
+ARRAY_BACKEND = "numpy" if np is not None else "array"
+
+# 字典编码的列
+CATEGORICAL_COLUMNS = ("event_type", "platform", "conversation_id", "user_id")
+# 数值列
+NUMERIC_COLUMNS = ("time", "text_length")
+# 缺失值的代码
+MISSING_CODE = -1
+# count_by 对 time 列分桶的默认宽度：一小时（毫秒）
+HOUR_MS = 3_600_000
+
+_CODE_TYPECODE = "i"
+_TIME_TYPECODE = "d"
+
+
+class _Dictionary:
+    """字典编码：把字符串映射为从 0 开始的连续整数代码."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def encode(self, value: Any) -> int:
+        """返回值对应的代码，新值会被追加到字典末尾."""
+        if value is None:
+            return MISSING_CODE
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> str | None:
+        """返回代码对应的值."""
+        return None if code == MISSING_CODE else self.values[code]
+
+
+class EventBatch:
+    """列式事件批.
+
+    通过 from_events() 从 Event 或事件字典的列表、迭代器构建. 子批（select()、filter()
+    的结果）与原批共享字典，因此同一个值在两者中的代码相同.
+
+    过滤条件中的字符串列只在字典上求值一次，再把结果代码集合应用到整列，
+    因此 prefix 等条件的开销与不同值的数量相关，而不是与事件数量相关.
+
+    Attributes:
+        backend (str): 数组后端，"numpy" 或 "array".
+
+    Methods:
+        from_events(events, keep_rows: bool = True) -> EventBatch: 从事件构建列式批.
+        column(name: str) -> Any: 返回某一列的数组.
+        categories(name: str) -> list[str]: 返回字符串列的字典.
+        decode(name: str, row: int) -> Any: 返回某一行在某列上的原始值.
+        mask(...) -> Any: 按条件生成布尔掩码.
+        select(selector) -> EventBatch: 按掩码或行号选出子批.
+        filter(...) -> EventBatch: 按条件选出子批.
+        count_by(*columns: str, bucket_ms: int = HOUR_MS) -> dict: 按一列或多列分组计数.
+        to_events(selector=None) -> list[Event]: 把选中的行转换回 Event.
+    """
+
+    __slots__ = ("_columns", "_dictionaries", "_rows", "backend")
+
+    def __init__(
+        self,
+        columns: dict[str, Any],
+        dictionaries: dict[str, _Dictionary],
+        rows: list[Event | dict[str, Any]] | None,
+    ) -> None:
+        self._columns = columns
+        self._dictionaries = dictionaries
+        self._rows = rows
+        self.backend = ARRAY_BACKEND
+
+    @classmethod
+    def from_events(
+        cls,
+        events: Iterable[Event | dict[str, Any]],
+        keep_rows: bool = True,
+    ) -> "EventBatch":
+        """从 Event 或事件字典构建列式批.
+
+        事件字典直接读取所需字段，不会先构造 Event. LazyEvent 只会读取其头部字段和
+        content，user_info 仅在需要 user_id 时构建.
+
+        Args:
+            events (Iterable[Event | dict[str, Any]]): 事件，可以是生成器.
+            keep_rows (bool): 是否保留对原始事件的引用以供 to_events() 使用.
+                只做统计时设为 False 可以让原始事件在构建后被释放.
+
+        Returns:
+            EventBatch: 构建的列式批.
+        """
+        dictionaries = {name: _Dictionary() for name in CATEGORICAL_COLUMNS}
+        encode_type = dictionaries["event_type"].encode
+        encode_platform = dictionaries["platform"].encode
+        encode_conversation = dictionaries["conversation_id"].encode
+        encode_user = dictionaries["user_id"].encode
+        times = array(_TIME_TYPECODE)
+        type_codes = array(_CODE_TYPECODE)
+        platform_codes = array(_CODE_TYPECODE)
+        conversation_codes = array(_CODE_TYPECODE)
+        user_codes = array(_CODE_TYPECODE)
+        text_lengths = array(_CODE_TYPECODE)
+        rows: list[Event | dict[str, Any]] | None = [] if keep_rows else None
+
+        for event in events:
+            if isinstance(event, Event):
+                event_type = event.event_type
+                time = event.time
+                conversation_id = _conversation_id(event.conversation_info)
+                user_id = event.user_info.user_id if event.user_info is not None else None
+                text_length = _text_length(event)
+            else:
+                event_type = event.get("event_type", "unknown.unknown.unknown")
+                time = event.get("time", 0.0)
+                conversation_id = _dict_field(event.get("conversation_info"), "conversation_id")
+                user_id = _dict_field(event.get("user_info"), "user_id")
+                text_length = _dict_text_length(event.get("content"))
+            type_codes.append(encode_type(event_type))
+            platform_codes.append(encode_platform(EventTypePath.parse(event_type).platform))
+            conversation_codes.append(encode_conversation(conversation_id))
+            user_codes.append(encode_user(user_id))
+            times.append(time)
+            text_lengths.append(text_length)
+            if rows is not None:
+                rows.append(event)
+
+        columns = {
+            "time": times,
+            "event_type": type_codes,
+            "platform": platform_codes,
+            "conversation_id": conversation_codes,
+            "user_id": user_codes,
+            "text_length": text_lengths,
+        }
+        if np is not None:
+            # 通过缓冲区协议直接包装 array 的内存，不复制数据
+            columns = {name: np.asarray(values) for name, values in columns.items()}
+        return cls(columns, dictionaries, rows)
+
+    def __len__(self) -> int:
+        """返回事件数量."""
+        return len(self._columns["time"])
+
+    def column(self, name: str) -> Any:
+        """返回某一列的数组.
+
+        字符串列返回代码数组，可通过 categories() 或 decode() 还原.
+
+        Args:
+            name (str): 列名，见 CATEGORICAL_COLUMNS 和 NUMERIC_COLUMNS.
+
+        Returns:
+            Any: numpy.ndarray 或 array.array.
+
+        Raises:
+            ValueError: 未知的列名.
+        """
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise ValueError(f"未知的列: {name!r}") from None
+
+    def categories(self, name: str) -> list[str]:
+        """返回字符串列的字典，下标即代码.
+
+        Args:
+            name (str): 字符串列名.
+
+        Returns:
+            list[str]: 字典中的全部值.
+
+        Raises:
+            ValueError: 不是字符串列.
+        """
+        return list(self._dictionary(name).values)
+
+    def decode(self, name: str, row: int) -> Any:
+        """返回某一行在某列上的原始值.
+
+        Args:
+            name (str): 列名.
+            row (int): 行号.
+
+        Returns:
+            Any: 字符串列返回字符串（缺失时为 None），数值列返回数值.
+
+        Raises:
+            ValueError: 未知的列名.
+        """
+        value = self.column(name)[row]
+        if name in self._dictionaries:
+            return self._dictionaries[name].decode(int(value))
+        return value.item() if np is not None else value
+
+    def mask(
+        self,
+        *,
+        event_type: str | Iterable[str] | None = None,
+        prefix: str | None = None,
+        platform: str | Iterable[str] | None = None,
+        conversation_id: str | Iterable[str] | None = None,
+        user_id: str | Iterable[str] | None = None,
+        start: float | None = None,
+        end: float | None = None,
+        min_text_length: int | None = None,
+    ) -> Any:
+        """按条件生成布尔掩码，所有条件之间是“与”关系.
+
+        字符串条件可以是单个值或值的集合.
+
+        Args:
+            event_type (str | Iterable[str] | None): event_type 取值.
+            prefix (str | None): event_type 的基础分类，如 "message".
+            platform (str | Iterable[str] | None): 平台 ID.
+            conversation_id (str | Iterable[str] | None): 会话 ID.
+            user_id (str | Iterable[str] | None): 用户 ID.
+            start (float | None): 时间下限（含），毫秒时间戳.
+            end (float | None): 时间上限（不含），毫秒时间戳.
+            min_text_length (int | None): 文本长度下限（含）.
+
+        Returns:
+            Any: NumPy 后端为 bool 数组，否则为 list[bool].
+        """
+        masks = []
+        for name, wanted in (
+            ("event_type", event_type),
+            ("platform", platform),
+            ("conversation_id", conversation_id),
+            ("user_id", user_id),
+        ):
+            if wanted is not None:
+                values = {wanted} if isinstance(wanted, str) else set(wanted)
+                masks.append(self._match_codes(name, lambda value, values=values: value in values))
+        if prefix is not None:
+            masks.append(
+                self._match_codes(
+                    "event_type", lambda value: EventTypePath.parse(value).prefix == prefix
+                )
+            )
+        times = self._columns["time"]
+        if start is not None:
+            masks.append(times >= start if np is not None else [t >= start for t in times])
+        if end is not None:
+            masks.append(times < end if np is not None else [t < end for t in times])
+        if min_text_length is not None:
+            lengths = self._columns["text_length"]
+            masks.append(
+                lengths >= min_text_length
+                if np is not None
+                else [n >= min_text_length for n in lengths]
+            )
+
+        if not masks:
+            return np.ones(len(self), dtype=bool) if np is not None else [True] * len(self)
+        result = masks[0]
+        for other in masks[1:]:
+            if np is not None:
+                result = result & other
+            else:
+                result = [a and b for a, b in zip(result, other, strict=True)]
+        return result
+
+    def select(self, selector: Any) -> "EventBatch":
+        """按掩码或行号选出子批.
+
+        Args:
+            selector (Any): mask() 返回的布尔掩码，或行号序列.
+
+        Returns:
+            EventBatch: 子批，与原批共享字典.
+        """
+        indices = self._indices(selector)
+        if np is not None:
+            columns = {name: values[indices] for name, values in self._columns.items()}
+        else:
+            columns = {
+                name: array(values.typecode, [values[i] for i in indices])
+                for name, values in self._columns.items()
+            }
+        rows = None if self._rows is None else [self._rows[i] for i in indices]
+        return EventBatch(columns, self._dictionaries, rows)
+
+    def filter(self, **conditions: Any) -> "EventBatch":
+        """按条件选出子批，条件与 mask() 相同.
+
+        Returns:
+            EventBatch: 子批.
+        """
+        return self.select(self.mask(**conditions))
+
+    def count_by(self, *columns: str, bucket_ms: int = HOUR_MS) -> dict[Any, int]:
+        """按一列或多列分组计数.
+
+        字符串列的分组键是原始字符串（缺失时为 None）；time 列按 bucket_ms 分桶，
+        分组键是桶的起始毫秒时间戳. 只有一列时分组键是单个值，否则是元组.
+
+        Args:
+            *columns (str): 分组列，如 "platform"、"conversation_id"、"time".
+            bucket_ms (int): time 列的分桶宽度，默认一小时.
+
+        Returns:
+            dict[Any, int]: 分组键到事件数量的映射，按计数从多到少排列，
+                计数相同时按代码顺序排列.
+
+        Raises:
+            ValueError: 没有给出分组列、列名未知，或 bucket_ms 不是正数.
+        """
+        if not columns:
+            raise ValueError("count_by 至少需要一个分组列")
+        if bucket_ms <= 0:
+            raise ValueError(f"bucket_ms 必须为正数: {bucket_ms}")
+        keys = [self._group_keys(name, bucket_ms) for name in columns]
+        decoders = [self._group_decoder(name, bucket_ms) for name in columns]
+
+        if np is not None:
+            if len(keys) == 1:
+                uniques, counts = np.unique(keys[0], return_counts=True)
+                pairs = zip(uniques.tolist(), counts.tolist(), strict=True)
+            else:
+                uniques, counts = np.unique(np.stack(keys, axis=1), axis=0, return_counts=True)
+                pairs = zip(map(tuple, uniques.tolist()), counts.tolist(), strict=True)
+        else:
+            counter = Counter(keys[0]) if len(keys) == 1 else Counter(zip(*keys, strict=True))
+            # 与 np.unique 一样按键排序，使两种后端在计数相同时的顺序一致
+            pairs = sorted(counter.items())
+
+        if len(decoders) == 1:
+            (decoder,) = decoders
+            result = {decoder(key): count for key, count in pairs}
+        else:
+            result = {
+                tuple(decoder(part) for decoder, part in zip(decoders, key, strict=True)): count
+                for key, count in pairs
+            }
+        return dict(sorted(result.items(), key=lambda item: -item[1]))
+
+    def to_events(self, selector: Any = None) -> list[Event]:
+        """把选中的行转换回 Event.
+
+        由 Event 构建的行返回原对象，由字典构建的行通过 Event.from_dict 创建.
+
+        Args:
+            selector (Any): 布尔掩码或行号序列，为 None 时转换全部行.
+
+        Returns:
+            list[Event]: 选中行对应的事件.
+
+        Raises:
+            ValueError: 构建时 keep_rows 为 False.
+        """
+        if self._rows is None:
+            raise ValueError("该 EventBatch 构建时未保留原始事件 (keep_rows=False)")
+        indices = range(len(self)) if selector is None else self._indices(selector)
+        rows = self._rows
+        return [
+            row if isinstance(row, Event) else Event.from_dict(row)
+            for row in (rows[i] for i in indices)
+        ]
+
+    def __repr__(self) -> str:
+        """返回 EventBatch 的简要表示."""
+        return f"EventBatch(len={len(self)}, backend={self.backend!r})"
+
+    def _dictionary(self, name: str) -> _Dictionary:
+        """返回字符串列的字典."""
+        try:
+            return self._dictionaries[name]
+        except KeyError:
+            raise ValueError(f"不是字符串列: {name!r}") from None
+
+    def _match_codes(self, name: str, predicate: Callable[[str], bool]) -> Any:
+        """在字典上求值 predicate，再把匹配的代码集合应用到整列."""
+        values = self._dictionary(name).values
+        wanted = [code for code, value in enumerate(values) if predicate(value)]
+        codes = self._columns[name]
+        if np is not None:
+            return np.isin(codes, wanted)
+        wanted_set = set(wanted)
+        return [code in wanted_set for code in codes]
+
+    def _indices(self, selector: Any) -> Any:
+        """把布尔掩码或行号序列统一转换为行号."""
+        if np is not None:
+            selector = np.asarray(selector)
+            if selector.dtype == bool:
+                if len(selector) != len(self):
+                    raise ValueError(f"掩码长度 {len(selector)} 与事件数量 {len(self)} 不一致")
+                return np.flatnonzero(selector)
+            return selector.astype(np.intp, copy=False)
+        selector = list(selector)
+        if selector and isinstance(selector[0], bool):
+            if len(selector) != len(self):
+                raise ValueError(f"掩码长度 {len(selector)} 与事件数量 {len(self)} 不一致")
+            return [i for i, keep in enumerate(selector) if keep]
+        return selector
+
+    def _group_keys(self, name: str, bucket_ms: int) -> Any:
+        """返回分组用的整数键列."""
+        values = self.column(name)
+        if name == "time":
+            if np is not None:
+                return np.floor_divide(values, bucket_ms).astype(np.int64)
+            return [math.floor(t / bucket_ms) for t in values]
+        if np is not None:
+            return values.astype(np.int64)
+        return values
+
+    def _group_decoder(self, name: str, bucket_ms: int) -> Callable[[int], Any]:
+        """返回把整数键还原为分组值的函数."""
+        if name == "time":
+            return lambda key: key * bucket_ms
+        if name in self._dictionaries:
+            return self._dictionaries[name].decode
+        return lambda key: key
+
+
+def _conversation_id(conversation_info: Any) -> str | None:
+    """从 ConversationInfo 中读取会话 ID."""
+    return conversation_info.conversation_id if conversation_info is not None else None
+
+
+def _dict_field(data: Any, key: str) -> Any:
+    """从可能缺失的子字典中读取字段."""
+    return data.get(key) if isinstance(data, dict) else None
+
+
+def _text_length(event: Event) -> int:
+    """统计 Event 中 text 段的字符数，与 get_text_content() 的长度相同."""
+    total = 0
+    for seg in segs_of_type(event.content, "text"):
+        text = seg.data.get("text")
+        if isinstance(text, str):
+            total += len(text)
+    return total
+
+
+def _dict_text_length(content: Sequence[Any] | None) -> int:
+    """统计事件字典 content 中 text 段的字符数."""
+    if not isinstance(content, list):
+        return 0
+    total = 0
+    for seg in content:
+        if isinstance(seg, dict) and seg.get("type") == "text":
+            data = seg.get("data")
+            text = data.get("text") if isinstance(data, dict) else None
+            if isinstance(text, str):
+                total += len(text)
+    return total
@@ -8,17 +8,25 @@ import time
 import uuid
 from typing import Any
 
+from . import metrics
+from .constants import EventIdStrategy, MetricOperation
 from .conversation_info import ConversationInfo
 from .event import Event
-from .seg import Seg, SegBuilder
+from .event_id import default_generator
+from .seg import INDEX_MIN_SEGS, Seg, SegBuilder, SegList
 from .user_info import UserInfo
 
 
 class EventBuilder:
     """Event 构建器，提供快速创建各种事件的方法.
 
+    事件 ID 的生成策略由 set_id_strategy() 全局配置，create_* 方法都会使用它.
+
     Methods:
+        set_id_strategy(strategy: str) -> None: 设置事件 ID 的生成策略.
+        get_id_strategy() -> str: 返回当前的事件 ID 生成策略.
         generate_event_id() -> str: 生成唯一的事件ID.
+        generate_event_ids(n: int) -> list[str]: 一次生成 n 个唯一的事件ID.
         get_current_timestamp() -> float: 获取当前Unix毫秒时间戳.
         create_message_event(
             event_type: str,
@@ -38,15 +46,58 @@ class EventBuilder:
         ) -> Event: 创建动作响应事件.
     """
 
+    _id_strategy: str = EventIdStrategy.UUID4
+
+    @staticmethod
+    def set_id_strategy(strategy: str) -> None:
+        """设置事件 ID 的生成策略.
+
+        Args:
+            strategy (str): EventIdStrategy 中定义的策略.
+
+        Raises:
+            ValueError: 未知的策略.
+        """
+        if strategy not in (EventIdStrategy.UUID4, EventIdStrategy.UUID7):
+            raise ValueError(f"未知的事件 ID 生成策略: {strategy!r}")
+        EventBuilder._id_strategy = strategy
+
+    @staticmethod
+    def get_id_strategy() -> str:
+        """返回当前的事件 ID 生成策略.
+
+        Returns:
+            str: EventIdStrategy 中定义的策略.
+        """
+        return EventBuilder._id_strategy
+
     @staticmethod
     def generate_event_id() -> str:
         """生成唯一的事件ID.
 
         Returns:
-            str: 生成的唯一事件ID，格式为 UUID4 字符串.
+            str: 生成的唯一事件ID，格式为 UUID4 或 UUIDv7 字符串，取决于当前策略.
         """
+        if EventBuilder._id_strategy == EventIdStrategy.UUID7:
+            return default_generator.generate()
         return str(uuid.uuid4())
 
+    @staticmethod
+    def generate_event_ids(n: int) -> list[str]:
+        """一次生成 n 个唯一的事件ID.
+
+        UUIDv7 策略下整批只读取一次时钟，且结果按生成顺序递增.
+
+        Args:
+            n (int): 要生成的数量.
+
+        Returns:
+            list[str]: 生成的事件ID列表.
+        """
+        if EventBuilder._id_strategy == EventIdStrategy.UUID7:
+            return default_generator.generate_batch(n)
+        return [str(uuid.uuid4()) for _ in range(n)]
+
     @staticmethod
     def get_current_timestamp() -> float:
         """获取当前Unix毫秒时间戳.
@@ -80,10 +131,16 @@ class EventBuilder:
         Returns:
             Event: 创建的消息事件对象.
         """
+        recorder = metrics.recorder
+        if recorder is not None:
+            started = time.perf_counter_ns()
         metadata_seg = SegBuilder.message_metadata(message_id, **kwargs)
         all_content = [metadata_seg, *content_segs]
+        if len(all_content) >= INDEX_MIN_SEGS:
+            # 足够长的内容使用 SegList，以便按类型查找时建立索引
+            all_content = SegList(all_content)
 
-        return Event(
+        event = Event(
             event_id=EventBuilder.generate_event_id(),
             event_type=event_type,
             time=EventBuilder.get_current_timestamp(),
@@ -92,6 +149,9 @@ class EventBuilder:
             user_info=user_info,
             conversation_info=conversation_info,
         )
+        if recorder is not None:
+            recorder.observe(MetricOperation.BUILD, event_type, time.perf_counter_ns() - started)
+        return event
 
     @staticmethod
     def create_action_response_event(
@@ -113,7 +173,10 @@ class EventBuilder:
         Returns:
             Event: 创建的动作响应事件对象.
         """
-        original_platform = original_event.get_platform() or "unknown"
+        recorder = metrics.recorder
+        if recorder is not None:
+            started = time.perf_counter_ns()
+        original_platform = original_event.type_path.platform or "unknown"
         response_event_type = f"action_response.{original_platform}.{response_type}"
 
         response_data = {
@@ -129,12 +192,17 @@ class EventBuilder:
 
         response_seg = Seg(type=response_event_type, data=response_data)
 
-        return Event(
+        event = Event(
             event_id=EventBuilder.generate_event_id(),
             event_type=response_event_type,
             time=EventBuilder.get_current_timestamp(),
             bot_id=original_event.bot_id,
             content=[response_seg],
         )
+        if recorder is not None:
+            recorder.observe(
+                MetricOperation.BUILD, response_event_type, time.perf_counter_ns() - started
+            )
+        return event
 
     # ... 可以根据需要添加其他 create_*_event 方法，都移除 platform 参数 ...
@@ -0,0 +1,122 @@
+"""AIcarus-Message-Protocol v1.6.0 - 按时间排序的事件 ID.
+
+生成 RFC 9562 UUIDv7 格式的事件 ID：高 48 位是 Unix 毫秒时间戳，随后 12 位是同一毫秒内的
+单调计数器，最低 62 位是每个进程启动（或 fork）时随机生成一次的种子.
+因此同一进程生成的 ID 按字符串排序即按生成顺序排序，不同进程的 ID 由种子区分，
+而每个 ID 只需读一次时钟、不需要访问 os.urandom.
+
+生成的 ID 是规范格式（小写、带连字符）的 UUID 字符串，可以直接作为 event_id 使用，
+二进制编解码器也会把它压缩为 16 字节传输.
+"""
+
+import os
+import threading
+import time
+
+# 同一毫秒内计数器的上限，超出后借用下一毫秒
+_COUNTER_LIMIT = 1 << 12
+_VERSION_BITS = 0x7 << 76
+_VARIANT_BITS = 0b10 << 62
+
+
+class TimeOrderedIdGenerator:
+    """UUIDv7 事件 ID 生成器.
+
+    线程安全；检测到 fork 后会自动重新生成随机种子，父子进程不会产生相同的 ID.
+    同一毫秒内生成超过 4096 个 ID 时，时间戳部分会提前进入下一毫秒以保持单调递增.
+
+    Methods:
+        generate() -> str: 生成一个事件 ID.
+        generate_batch(n: int) -> list[str]: 一次生成 n 个连续递增的事件 ID.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pid = -1
+        self._seed = 0
+        self._last_ms = 0
+        self._counter = 0
+
+    def generate(self) -> str:
+        """生成一个事件 ID.
+
+        Returns:
+            str: UUIDv7 格式的事件 ID.
+        """
+        with self._lock:
+            ms, counter = self._reserve(1)
+            seed = self._seed
+        return _format(ms, counter, seed)
+
+    def generate_batch(self, n: int) -> list[str]:
+        """一次生成 n 个连续递增的事件 ID.
+
+        整批只读取一次时钟、只加一次锁.
+
+        Args:
+            n (int): 要生成的数量.
+
+        Returns:
+            list[str]: 按生成顺序（即排序顺序）排列的事件 ID.
+        """
+        if n <= 0:
+            return []
+        with self._lock:
+            ms, counter = self._reserve(n)
+            seed = self._seed
+        result = []
+        for _ in range(n):
+            result.append(_format(ms, counter, seed))
+            counter += 1
+            if counter == _COUNTER_LIMIT:
+                ms += 1
+                counter = 0
+        return result
+
+    def _reserve(self, n: int) -> tuple[int, int]:
+        """保留 n 个连续的 (毫秒, 计数器) 位置，返回第一个. 调用方需持有锁."""
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._seed = int.from_bytes(os.urandom(8)) & ((1 << 62) - 1)
+            self._last_ms = 0
+            self._counter = 0
+        now = time.time_ns() // 1_000_000
+        if now > self._last_ms:
+            ms, counter = now, 0
+        else:
+            # 时钟未前进（或回拨）时沿用上一次的时间戳继续计数
+            ms, counter = self._last_ms, self._counter
+        end = counter + n
+        self._last_ms = ms + end // _COUNTER_LIMIT
+        self._counter = end % _COUNTER_LIMIT
+        return ms, counter
+
+
+def _format(ms: int, counter: int, seed: int) -> str:
+    """把各部分拼成规范格式的 UUID 字符串."""
+    h = f"{(ms << 80) | _VERSION_BITS | (counter << 64) | _VARIANT_BITS | seed:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def event_id_timestamp(event_id: str) -> int | None:
+    """从 UUIDv7 事件 ID 中取出毫秒时间戳.
+
+    可用于按时间范围扫描以 event_id 为键的存储.
+
+    Args:
+        event_id (str): 事件 ID.
+
+    Returns:
+        int | None: Unix 毫秒时间戳；event_id 不是 UUIDv7 时返回 None.
+    """
+    if len(event_id) != 36 or event_id[14] != "7":
+        return None
+    try:
+        return int(event_id[:8] + event_id[9:13], 16)
+    except ValueError:
+        return None
+
+
+# 进程内共享的默认生成器
+default_generator = TimeOrderedIdGenerator()
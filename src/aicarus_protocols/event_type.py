@@ -6,14 +6,102 @@
 
 import re
 import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
+# EventTypePath 解析缓存的容量，超出后按 LRU 淘汰
+EVENT_TYPE_PATH_CACHE_SIZE = 4096
+# validate_event_type 判定结果缓存的容量，超出后按 LRU 淘汰
+EVENT_TYPE_VERDICT_CACHE_SIZE = 4096
+# 注册器中结构检查函数缓存的容量，超出后整体清空
+CHECKER_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class EventTypePath:
+    """解析后的事件类型路径.
+
+    event_type 字符串 "{prefix}.{platform}.{...}" 的不可变结构化表示. 通过 parse() 获取的
+    实例按字符串驻留：同一个 event_type 在缓存有效期内总是返回同一个对象，
+    因此只需为每个不同的字符串切分一次.
+
+    Attributes:
+        raw (str): 原始 event_type 字符串.
+        parts (tuple[str, ...]): 按 "." 切分后的全部段.
+        prefix (str | None): 基础分类，如 "message". 字符串中没有 "." 时为 None.
+        platform (str | None): 平台 ID，即第二段. 字符串中没有 "." 时为 None.
+        segments (tuple[str, ...]): 平台之后的其余各段.
+        is_valid (bool): 是否符合协议的命名规范.
+
+    Methods:
+        parse(event_type: str) -> EventTypePath: 解析事件类型字符串，结果会被缓存.
+        has_prefix(prefix: str) -> bool: 判断事件是否属于某个基础分类.
+    """
+
+    raw: str
+    parts: tuple[str, ...]
+    prefix: str | None
+    platform: str | None
+    segments: tuple[str, ...]
+    is_valid: bool
+
+    @staticmethod
+    def parse(event_type: str) -> "EventTypePath":
+        """解析事件类型字符串，结果会被缓存.
+
+        Args:
+            event_type (str): 要解析的事件类型字符串.
+
+        Returns:
+            EventTypePath: 解析结果.
+        """
+        return _parse_event_type_path(event_type)
+
+    def has_prefix(self, prefix: str) -> bool:
+        """判断事件是否属于某个基础分类.
+
+        与 event_type.startswith(f"{prefix}.") 等价.
+
+        Args:
+            prefix (str): 基础分类，如 EventTypePrefix.MESSAGE.
+
+        Returns:
+            bool: 如果属于该分类返回 True，否则返回 False.
+        """
+        return self.prefix == prefix
+
+    def __str__(self) -> str:
+        """返回原始 event_type 字符串.
+
+        Returns:
+            str: 原始 event_type 字符串.
+        """
+        return self.raw
+
+
+@lru_cache(maxsize=EVENT_TYPE_PATH_CACHE_SIZE)
+def _parse_event_type_path(event_type: str) -> EventTypePath:
+    """解析事件类型字符串的实际实现，由 lru_cache 负责驻留."""
+    parts = tuple(event_type.split("."))
+    has_dot = len(parts) >= 2
+    return EventTypePath(
+        raw=event_type,
+        parts=parts,
+        prefix=parts[0] if has_dot else None,
+        platform=parts[1] if has_dot else None,
+        segments=parts[2:],
+        is_valid=_cached_verdict(event_type),
+    )
+
 
 def validate_event_type(event_type: str) -> bool:
     """验证一个事件类型字符串是否符合协议的命名规范.
 
     事件类型必须以 "message", "notice", "request", "action", "action_response" 或 "meta" 开头，
     并且后面跟随一个或多个由点分隔的标识符，标识符只能包含字母、数字、下划线和点.
+    最近的判定结果会被缓存，重复校验同一个字符串只需一次字典查找.
 
     Args:
         event_type (str): 要验证的事件类型字符串.
@@ -23,22 +111,82 @@ def validate_event_type(event_type: str) -> bool:
     """
     if not isinstance(event_type, str):
         return False
+    return _cached_verdict(event_type)
+
+
+def validate_event_types(event_types: Iterable[str]) -> list[bool]:
+    """批量验证事件类型字符串.
+
+    适用于归档、回放等需要一次检查大量事件的场景. 结果与逐个调用
+    validate_event_type 相同，但省去了每次调用的函数和类型检查开销.
+
+    Args:
+        event_types (Iterable[str]): 要验证的事件类型字符串.
+
+    Returns:
+        list[bool]: 与输入一一对应的布尔掩码.
+    """
+    verdict = _cached_verdict
+    return [isinstance(event_type, str) and verdict(event_type) for event_type in event_types]
+
+
+# 事件类型必须只包含字母、数字、下划线和点，且不能有连续点、首尾点
+_EVENT_TYPE_PATTERN = re.compile(
+    r"(message|notice|request|action|action_response|meta)\.[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)+"
+)
+
+
+def _check_event_type(event_type: str) -> bool:
+    """对事件类型字符串执行命名规范检查，不经过缓存."""
+    # 每段都至少有一个字符，因此完整匹配已经排除了连续点和首尾点
+    return _EVENT_TYPE_PATTERN.fullmatch(event_type) is not None
 
-    # 事件类型必须只包含字母、数字、下划线和点，且不能有连续点、首尾点
-    pattern = (
-        r"^(message|notice|request|action|action_response|meta)\.[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)+$"
-    )
-    if not re.match(pattern, event_type):
-        return False
 
-    # 额外检查：不允许连续点
-    return ".." not in event_type
+_cached_verdict = lru_cache(maxsize=EVENT_TYPE_VERDICT_CACHE_SIZE)(_check_event_type)
+
+
+# 通配符：匹配恰好一段 / 匹配零段或多段
+WILDCARD_ONE = "*"
+WILDCARD_ANY = "**"
+
+
+def split_event_type_pattern(pattern: str) -> tuple[str, ...]:
+    """把事件类型匹配模式切分为段.
+
+    模式与 event_type 一样以 "." 分隔，其中 "*" 匹配恰好一段，"**" 匹配零段或多段，
+    例如 "notice.qq.*"、"message.*.group.**"、"action_response.**".
+
+    Args:
+        pattern (str): 匹配模式.
+
+    Returns:
+        tuple[str, ...]: 切分后的各段.
+
+    Raises:
+        ValueError: 模式为空或包含空段.
+    """
+    parts = tuple(pattern.split("."))
+    if not pattern or "" in parts:
+        raise ValueError(f"无效的事件类型匹配模式: {pattern!r}")
+    return parts
+
+
+class _TrieNode:
+    """事件类型段前缀树的节点."""
+
+    __slots__ = ("children", "event_type")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.event_type: str | None = None  # 在此节点结束的已注册事件类型
 
 
 class EventTypeRegistry:
     """动态事件类型注册器.
 
     在V1.6.0版本中，其职责被简化，主要用于记录和查询符合命名规范的事件类型.
+    已注册的类型同时按 "." 分段存入一棵前缀树，因此前缀查询、通配符查询和
+    “最具体的已注册祖先”查询的开销只与层级深度（和结果数量）有关，而与注册总数无关.
 
     Attributes:
         _registered_types (dict[str, dict[str, Any]]): 存储已注册事件类型的字典，
@@ -49,10 +197,17 @@ class EventTypeRegistry:
             前提是它必须符合命名规范.
         is_registered(event_type: str) -> bool: 检查事件类型是否已在注册表中明确注册.
         get_description(event_type: str) -> str: 获取已注册事件类型的描述.
+        find_by_prefix(prefix: str) -> list[str]: 返回位于某个前缀之下的所有已注册类型.
+        match(pattern: str) -> list[str]: 返回匹配通配符模式的所有已注册类型.
+        find_ancestor(event_type: str, include_self: bool = True) -> str | None: 返回
+            最具体的已注册祖先类型.
+        get_checker(event_type: str) -> Callable: 返回该事件类型编译好的 content 结构检查函数.
     """
 
     def __init__(self) -> None:
         self._registered_types: dict[str, dict[str, Any]] = {}
+        self._root = _TrieNode()
+        self._checkers: dict[str, Callable[..., None]] = {}
 
     def register(self, event_type: str, description: str = "") -> bool:
         """注册一个新的事件类型，前提是它必须符合命名规范.
@@ -71,6 +226,14 @@ class EventTypeRegistry:
             "description": description,
             "registered_at": time.time(),
         }
+        node = self._root
+        for part in EventTypePath.parse(event_type).parts:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _TrieNode()
+            node = child
+        node.event_type = event_type
+        self._checkers.pop(event_type, None)
         return True
 
     def is_registered(self, event_type: str) -> bool:
@@ -95,6 +258,137 @@ class EventTypeRegistry:
         """
         return self._registered_types.get(event_type, {}).get("description", "")
 
+    def find_by_prefix(self, prefix: str) -> list[str]:
+        """返回位于某个前缀之下的所有已注册类型.
+
+        前缀按整段匹配，"notice.qq" 匹配 "notice.qq" 本身和 "notice.qq.group.member_increase"，
+        但不匹配 "notice.qqguild.xxx".
+
+        Args:
+            prefix (str): 由整段组成的前缀，如 "notice.qq".
+
+        Returns:
+            list[str]: 匹配的已注册类型，按注册顺序深度优先排列.
+        """
+        node = self._root
+        for part in prefix.split("."):
+            node = node.children.get(part)
+            if node is None:
+                return []
+        result: list[str] = []
+        self._collect(node, result)
+        return result
+
+    def match(self, pattern: str) -> list[str]:
+        """返回匹配通配符模式的所有已注册类型.
+
+        "*" 匹配恰好一段，"**" 匹配零段或多段. 例如 "notice.qq.*" 匹配
+        "notice.qq.friend_add"，"notice.qq.**" 还会匹配 "notice.qq.group.member_increase".
+        不含通配符的模式等价于精确查询.
+
+        Args:
+            pattern (str): 匹配模式.
+
+        Returns:
+            list[str]: 匹配的已注册类型，不含重复项.
+
+        Raises:
+            ValueError: 模式为空或包含空段.
+        """
+        parts = split_event_type_pattern(pattern)
+        result: dict[str, None] = {}
+        self._match(self._root, parts, 0, result, set())
+        return list(result)
+
+    def find_ancestor(self, event_type: str, include_self: bool = True) -> str | None:
+        """返回最具体的已注册祖先类型.
+
+        例如只注册了 "message.qq" 和 "message.qq.group" 时，
+        "message.qq.group.normal" 的最具体祖先是 "message.qq.group".
+
+        Args:
+            event_type (str): 要查询的事件类型字符串.
+            include_self (bool): event_type 自身已注册时是否直接返回它.
+
+        Returns:
+            str | None: 最具体的已注册祖先，不存在时返回 None.
+        """
+        parts = EventTypePath.parse(event_type).parts
+        if not include_self:
+            parts = parts[:-1]
+        found = None
+        node = self._root
+        for part in parts:
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.event_type is not None:
+                found = node.event_type
+        return found
+
+    def get_checker(self, event_type: str) -> Callable[..., None]:
+        """返回该事件类型编译好的 content 结构检查函数.
+
+        每个事件类型只编译一次，详见 validator 模块.
+
+        Args:
+            event_type (str): 事件类型字符串.
+
+        Returns:
+            Callable[..., None]: 检查函数.
+        """
+        checker = self._checkers.get(event_type)
+        if checker is None:
+            from .validator import compile_checker
+
+            if len(self._checkers) >= CHECKER_CACHE_SIZE:
+                self._checkers.clear()
+            checker = self._checkers[event_type] = compile_checker(event_type)
+        return checker
+
+    def _collect(self, node: _TrieNode, result: list[str]) -> None:
+        """深度优先收集 node 子树下的所有已注册类型."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.event_type is not None:
+                result.append(current.event_type)
+            stack.extend(reversed(current.children.values()))
+
+    def _match(
+        self,
+        node: _TrieNode,
+        parts: tuple[str, ...],
+        index: int,
+        result: dict[str, None],
+        visited: set[tuple[int, int]],
+    ) -> None:
+        """从 node 开始匹配 parts[index:]，把匹配的类型写入 result.
+
+        visited 记录已经展开过的 (节点, 模式位置) 组合，避免多个 "**" 时重复搜索.
+        """
+        key = (id(node), index)
+        if key in visited:
+            return
+        visited.add(key)
+        if index == len(parts):
+            if node.event_type is not None:
+                result[node.event_type] = None
+            return
+        part = parts[index]
+        if part == WILDCARD_ANY:
+            # "**" 匹配零段：跳过它继续匹配；匹配一段或多段：消耗一段后保持在 "**" 上
+            self._match(node, parts, index + 1, result, visited)
+            for child in node.children.values():
+                self._match(child, parts, index, result, visited)
+        elif part == WILDCARD_ONE:
+            for child in node.children.values():
+                self._match(child, parts, index + 1, result, visited)
+        else:
+            child = node.children.get(part)
+            if child is not None:
+                self._match(child, parts, index + 1, result, visited)
+
 
 # 全局事件类型注册器实例
 event_registry = EventTypeRegistry()
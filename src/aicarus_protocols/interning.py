@@ -0,0 +1,197 @@
+"""AIcarus-Message-Protocol v1.6.0 - UserInfo / ConversationInfo 驻留缓存.
+
+同一会话里连续的大量事件往往携带完全相同的 conversation_info 和少数几种 user_info.
+开启驻留后，UserInfo.from_dict 和 ConversationInfo.from_dict 对结构相同的输入返回同一个
+共享实例，而不是每次都新建一个；共享实例还缓存了自己的 to_dict() 结果.
+
+驻留是可选的，默认关闭：
+
+    from aicarus_protocols import interning
+
+    interning.enable_interning(maxsize=4096)
+    ...
+    print(interning.interning_stats())
+
+共享实例是不可变的，给字段赋值会抛出 dataclasses.FrozenInstanceError. 只有 additional_data /
+extra 为空或为 None 的对象会被驻留，其中的空字典替换为只读的 EMPTY_READONLY_DICT，
+修改它会抛出 TypeError；带有非空嵌套字典的输入总是得到新的普通实例.
+需要修改时，用 copy.copy() 得到一个普通的可变副本.
+
+缓存可以在多个线程中同时使用.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, NoReturn
+
+# 默认的驻留缓存容量
+DEFAULT_INTERN_CACHE_SIZE = 4096
+
+
+class ReadOnlyDict(dict):
+    """不可修改的 dict.
+
+    仍是 dict 的子类，编码器和校验器可以照常处理；所有原地修改的方法都会抛出 TypeError.
+    copy()、copy.copy()、copy.deepcopy() 和 pickle 得到的是普通的可变 dict.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> NoReturn:
+        """拒绝修改."""
+        raise TypeError("驻留对象中的字典是只读的")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> tuple[type[dict], tuple[dict[Any, Any]]]:
+        """复制和序列化时还原为普通的 dict."""
+        return dict, (dict(self),)
+
+
+# 驻留实例共享的只读空字典
+EMPTY_READONLY_DICT = ReadOnlyDict()
+
+
+class InternCache:
+    """按结构键驻留对象的有界 LRU 缓存，线程安全.
+
+    Attributes:
+        maxsize (int): 最多保留的对象数量，超出后淘汰最久未使用的.
+        hits (int): 命中次数.
+        misses (int): 未命中次数.
+
+    Methods:
+        get_or_create(key: Any, factory: Callable[[], Any]) -> Any: 返回 key 对应的对象，
+            不存在时用 factory 创建并缓存.
+        clear() -> None: 清空缓存和计数器.
+        stats() -> dict[str, int]: 返回缓存大小和命中统计.
+    """
+
+    __slots__ = ("_entries", "_lock", "hits", "maxsize", "misses")
+
+    def __init__(self, maxsize: int = DEFAULT_INTERN_CACHE_SIZE) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize 必须是正整数")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Any, Any] = OrderedDict()
+        # 查找、调整顺序和淘汰必须整体完成，否则并发时可能对刚被淘汰的键调用 move_to_end
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """返回当前缓存的对象数量.
+
+        Returns:
+            int: 缓存的对象数量.
+        """
+        return len(self._entries)
+
+    def get_or_create(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """返回 key 对应的对象，不存在时用 factory 创建并缓存.
+
+        Args:
+            key (Any): 可哈希的结构键.
+            factory (Callable[[], Any]): 创建对象的函数.
+
+        Returns:
+            Any: 缓存中的共享对象.
+        """
+        entries = self._entries
+        with self._lock:
+            obj = entries.get(key)
+            if obj is not None:
+                entries.move_to_end(key)
+                self.hits += 1
+                return obj
+            self.misses += 1
+            obj = entries[key] = factory()
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+            return obj
+
+    def clear(self) -> None:
+        """清空缓存和计数器."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """返回缓存大小和命中统计.
+
+        Returns:
+            dict[str, int]: 包含 size、maxsize、hits、misses 的字典.
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def freeze_value(value: Any) -> Any:
+    """把 JSON 风格的值转换为可哈希的结构键.
+
+    字典和列表被转换为带类型标记的元组，标量值带上类型，以免 1、1.0 和 True 被视为相同.
+
+    Args:
+        value (Any): 要转换的值.
+
+    Returns:
+        Any: 可哈希的结构键.
+
+    Raises:
+        TypeError: 值中含有无法哈希的对象.
+    """
+    if value is None or type(value) is str:
+        return value
+    if isinstance(value, dict):
+        return (dict, tuple((k, freeze_value(v)) for k, v in value.items()))
+    if isinstance(value, list | tuple):
+        return (type(value), tuple(freeze_value(v) for v in value))
+    hash(value)
+    return (type(value), value)
+
+
+# 当前生效的缓存，为 None 时表示未开启驻留
+user_info_cache: InternCache | None = None
+conversation_info_cache: InternCache | None = None
+
+
+def enable_interning(maxsize: int = DEFAULT_INTERN_CACHE_SIZE) -> None:
+    """开启 UserInfo 和 ConversationInfo 的驻留.
+
+    重复调用会以新的容量重建缓存.
+
+    Args:
+        maxsize (int): 每种对象最多驻留的实例数量.
+    """
+    global user_info_cache, conversation_info_cache
+    user_info_cache = InternCache(maxsize)
+    conversation_info_cache = InternCache(maxsize)
+
+
+def disable_interning() -> None:
+    """关闭驻留并释放缓存. 已经分发出去的共享实例不受影响."""
+    global user_info_cache, conversation_info_cache
+    user_info_cache = None
+    conversation_info_cache = None
+
+
+def interning_stats() -> dict[str, dict[str, int] | None]:
+    """返回两个驻留缓存的统计信息.
+
+    Returns:
+        dict[str, dict[str, int] | None]: 键为 "user_info" 和 "conversation_info"，
+            未开启驻留时值为 None.
+    """
+    return {
+        "user_info": user_info_cache.stats() if user_info_cache is not None else None,
+        "conversation_info": (
+            conversation_info_cache.stats() if conversation_info_cache is not None else None
+        ),
+    }
@@ -0,0 +1,295 @@
+"""AIcarus-Message-Protocol v1.6.0 - Event 的 JSON 字节编解码.
+
+在对象与 UTF-8 JSON 字节之间直接转换：编码时省去 to_dict() 逐层构造并拷贝中间字典的开销，
+解码时由解析得到的对象直接构造 Event 和 Seg，不经过 from_dict 的逐层分派.
+安装了 orjson 时自动使用它作为后端，否则回退到标准库 json；解析本身占了解码的大部分耗时，
+因此解码的明显提速主要来自 orjson，标准库后端下只省去了对象构造的一部分开销.
+"""
+
+import json
+from collections.abc import Iterable
+from functools import cache
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any
+
+from . import metrics
+from .constants import MetricOperation
+from .conversation_info import ConversationInfo
+from .seg import Seg, SegList
+from .user_info import UserInfo
+
+if TYPE_CHECKING:
+    from .event import Event
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+
+# 当前使用的 JSON 后端名称，"orjson" 或 "json"
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+# 标准库后端：紧凑分隔符，不转义非 ASCII 字符，与 orjson 的输出保持一致
+_std_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_std_decode = json.JSONDecoder().decode
+
+_USER_INFO_FIELDS = (
+    "user_id",
+    "user_nickname",
+    "user_cardname",
+    "user_titlename",
+    "permission_level",
+    "role",
+    "level",
+    "sex",
+    "age",
+    "area",
+)
+
+
+def _dumps(obj: Any) -> bytes:
+    """使用当前后端把普通对象序列化为 UTF-8 JSON 字节."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson 不支持的数据（如非字符串键、超过 64 位的整数），交给标准库处理
+            pass
+    return _std_encode(obj).encode("utf-8")
+
+
+def _loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """使用当前后端解析 JSON 字节或字符串."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, str):
+        return _std_decode(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    if data[:3] == b"\xef\xbb\xbf":
+        # 带 BOM 或非 UTF-8 编码的输入交给 json.loads 识别编码
+        return json.loads(data)
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return json.loads(data)
+    return _std_decode(text)
+
+
+def user_info_to_obj(user_info: UserInfo) -> dict[str, Any]:
+    """生成与 UserInfo.to_dict() 等价的普通字典，不经过 dataclass 字段反射.
+
+    Args:
+        user_info (UserInfo): 要转换的用户信息.
+
+    Returns:
+        dict[str, Any]: 用户信息的字典表示，直接引用 additional_data；
+            驻留的共享实例直接返回其缓存的字典.
+    """
+    cached = getattr(user_info, "_dict", None)
+    if cached is not None:
+        return cached
+    result = {}
+    for name in _USER_INFO_FIELDS:
+        value = getattr(user_info, name)
+        if value is not None:
+            result[name] = value
+    if user_info.additional_data:
+        result["additional_data"] = user_info.additional_data
+    return result
+
+
+def conversation_info_to_obj(conversation_info: ConversationInfo) -> dict[str, Any]:
+    """生成与 ConversationInfo.to_dict() 等价的普通字典，不做深拷贝.
+
+    Args:
+        conversation_info (ConversationInfo): 要转换的会话信息.
+
+    Returns:
+        dict[str, Any]: 会话信息的字典表示，直接引用 extra；
+            驻留的共享实例直接返回其缓存的字典.
+    """
+    cached = getattr(conversation_info, "_dict", None)
+    if cached is not None:
+        return cached
+    result: dict[str, Any] = {
+        "conversation_id": conversation_info.conversation_id,
+        "type": conversation_info.type,
+    }
+    if conversation_info.name is not None:
+        result["name"] = conversation_info.name
+    if conversation_info.parent_id is not None:
+        result["parent_id"] = conversation_info.parent_id
+    if conversation_info.extra is not None:
+        result["extra"] = conversation_info.extra
+    return result
+
+
+def event_to_obj(event: "Event") -> dict[str, Any]:
+    """生成与 Event.to_dict() 结构相同的普通对象，仅供立即序列化使用.
+
+    与 to_dict() 不同，返回值会直接引用事件内部的字典（如 Seg.data），调用方不应修改它.
+
+    Args:
+        event (Event): 要转换的事件.
+
+    Returns:
+        dict[str, Any]: 可直接交给 JSON 后端序列化的对象.
+    """
+    result: dict[str, Any] = {
+        "event_id": event.event_id,
+        "event_type": event.event_type,
+        "time": event.time,
+        "bot_id": event.bot_id,
+        "content": event._content_dicts(),
+    }
+    if event.user_info is not None:
+        result["user_info"] = user_info_to_obj(event.user_info)
+    if event.conversation_info is not None:
+        result["conversation_info"] = conversation_info_to_obj(event.conversation_info)
+    if event.raw_data is not None:
+        result["raw_data"] = event.raw_data
+    return result
+
+
+def encode_event(event: "Event") -> bytes:
+    """把单个 Event 编码为 UTF-8 JSON 字节.
+
+    Args:
+        event (Event): 要编码的事件.
+
+    Returns:
+        bytes: 事件的 JSON 表示.
+    """
+    recorder = metrics.recorder
+    if recorder is None:
+        return _dumps(event_to_obj(event))
+    started = perf_counter_ns()
+    data = _dumps(event_to_obj(event))
+    recorder.observe(
+        MetricOperation.ENCODE, event.event_type, perf_counter_ns() - started, len(data)
+    )
+    return data
+
+
+def encode_events(events: Iterable["Event"]) -> bytes:
+    """把多个 Event 编码为一个 JSON 数组.
+
+    Args:
+        events (Iterable[Event]): 要编码的事件序列.
+
+    Returns:
+        bytes: 事件列表的 JSON 表示.
+    """
+    return _dumps([event_to_obj(event) for event in events])
+
+
+def decode_event(
+    data: bytes | bytearray | memoryview | str, cls: type["Event"], lazy: bool = False
+) -> "Event":
+    """从 JSON 字节解码单个 Event.
+
+    Args:
+        data (bytes | bytearray | memoryview | str): JSON 数据.
+        cls (type[Event]): 要构造的事件类.
+        lazy (bool): 为 True 时返回只解析了头部的 LazyEvent.
+
+    Returns:
+        Event: 解码得到的事件.
+
+    Raises:
+        ValueError: 数据不是合法的 JSON 对象.
+    """
+    recorder = metrics.recorder
+    if recorder is not None:
+        size = data.nbytes if isinstance(data, memoryview) else len(data)
+        return recorder.measure(
+            MetricOperation.DECODE, None, _decode_event, data, cls, lazy, size=size
+        )
+    return _decode_event(data, cls, lazy)
+
+
+def _decode_event(
+    data: bytes | bytearray | memoryview | str, cls: type["Event"], lazy: bool
+) -> "Event":
+    """decode_event 的实际实现."""
+    obj = _loads(data)
+    if not isinstance(obj, dict):
+        raise ValueError("Event 的 JSON 表示必须是一个对象")
+    if lazy or not _has_default_from_dict(cls):
+        return cls.from_dict(obj, lazy)
+    return event_from_obj(obj, cls)
+
+
+@cache
+def _has_default_from_dict(cls: type["Event"]) -> bool:
+    """判断 cls 是否沿用 Event.from_dict；覆盖了 from_dict 的子类仍交给它自己解析."""
+    from .event import Event  # event 模块导入了本模块，只能在调用时导入
+
+    return cls.from_dict.__func__ is Event.from_dict.__func__
+
+
+def _segs_from_objs(content: Any) -> SegList:
+    """与 Seg.from_dict 逐个解析 content 的结果相同，忽略非字典元素."""
+    segs = SegList()
+    if not isinstance(content, list):
+        return segs
+    # 新建的列表还没有索引，绕过 SegList.append 丢弃索引的开销
+    append = list.append
+    for item in content:
+        if type(item) is dict:
+            data = item.get("data")
+            if type(data) is not dict:
+                data = {"value": data} if data is not None else {}
+            append(segs, Seg(item.get("type", "unknown"), data))
+    return segs
+
+
+def event_from_obj(obj: dict[str, Any], cls: type["Event"]) -> "Event":
+    """由 JSON 解析得到的对象直接构造 Event，结果与 cls.from_dict(obj) 相同.
+
+    Args:
+        obj (dict[str, Any]): JSON 解析得到的事件对象.
+        cls (type[Event]): 要构造的事件类.
+
+    Returns:
+        Event: 构造的事件.
+    """
+    get = obj.get
+    user_info = get("user_info")
+    conversation_info = get("conversation_info")
+    return cls(
+        get("event_id", "unknown_event"),
+        get("event_type", "unknown.unknown.unknown"),
+        get("time", 0.0),
+        get("bot_id", "unknown"),
+        _segs_from_objs(get("content")),
+        UserInfo.from_dict(user_info) if user_info else None,
+        ConversationInfo.from_dict(conversation_info) if conversation_info else None,
+        get("raw_data"),
+    )
+
+
+def decode_events(
+    data: bytes | bytearray | memoryview | str, cls: type["Event"], lazy: bool = False
+) -> list["Event"]:
+    """从 JSON 数组字节解码多个 Event.
+
+    Args:
+        data (bytes | bytearray | memoryview | str): JSON 数组数据.
+        cls (type[Event]): 要构造的事件类.
+        lazy (bool): 为 True 时返回只解析了头部的 LazyEvent 列表.
+
+    Returns:
+        list[Event]: 解码得到的事件列表，数组中非对象的元素会被忽略.
+
+    Raises:
+        ValueError: 数据不是合法的 JSON 数组.
+    """
+    obj = _loads(data)
+    if not isinstance(obj, list):
+        raise ValueError("事件列表的 JSON 表示必须是一个数组")
+    if lazy or not _has_default_from_dict(cls):
+        from_dict = cls.from_dict
+        return [from_dict(item, lazy) for item in obj if isinstance(item, dict)]
+    return [event_from_obj(item, cls) for item in obj if isinstance(item, dict)]
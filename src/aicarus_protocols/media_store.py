@@ -0,0 +1,448 @@
+"""AIcarus-Message-Protocol v1.6.0 - 以 hash 为键的媒体存储.
+
+image / video 等媒体 Seg 可以在 data["base64"] 中内联媒体数据，这些数 MB 的字符串会随着
+每一次 to_dict、序列化、日志和队列转发被反复复制. 本模块提供按 Seg 的 hash 字段寻址的
+媒体存储（内存 LRU 层 + 内存映射读取的磁盘层），以及把 base64 从外发事件中剥离、
+在接收端按需还原的 MediaOffloader.
+
+剥离后的 Seg 不再携带 "base64"，而是携带 "base64_ref"，其值就是该 Seg 的 hash.
+接收端在本地存储中找不到某个 hash 时，通过 action.adapter.media.get 动作向对端索取.
+"""
+
+import base64
+import binascii
+import contextlib
+import dataclasses
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from .event import Event
+from .event_builder import EventBuilder
+from .seg import Seg
+
+# 可以内联 base64 数据的 Seg 类型
+MEDIA_SEG_TYPES = frozenset({"image", "video"})
+# 剥离后替代 "base64" 的字段名
+BASE64_REF_KEY = "base64_ref"
+# 内存层的默认容量（字节）
+DEFAULT_MEMORY_TIER_BYTES = 64 * 1024 * 1024
+
+_SAFE_HASH = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+class MediaStore(ABC):
+    """按 hash 寻址的媒体存储的抽象基类. 子类必须实现 get 和 put.
+
+    Methods:
+        get(media_hash: str) -> bytes | None: 读取媒体数据.
+        put(media_hash: str, data: bytes) -> None: 写入媒体数据.
+        contains(media_hash: str) -> bool: 判断是否已保存该媒体.
+    """
+
+    @abstractmethod
+    def get(self, media_hash: str) -> bytes | None:
+        """读取媒体数据.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+
+        Returns:
+            bytes | None: 媒体数据，不存在时返回 None.
+        """
+
+    @abstractmethod
+    def put(self, media_hash: str, data: bytes) -> None:
+        """写入媒体数据. 同一个 hash 重复写入时保留已有数据.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+            data (bytes): 媒体数据.
+        """
+
+    def contains(self, media_hash: str) -> bool:
+        """判断是否已保存该媒体.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+
+        Returns:
+            bool: 已保存返回 True，否则返回 False.
+        """
+        return self.get(media_hash) is not None
+
+    def __contains__(self, media_hash: str) -> bool:
+        """与 contains() 相同."""
+        return self.contains(media_hash)
+
+
+class MemoryMediaStore(MediaStore):
+    """按总字节数限制容量的内存 LRU 媒体存储.
+
+    单个超过容量的媒体不会被保存.
+
+    Attributes:
+        max_bytes (int): 最多保存的字节数.
+        size_bytes (int): 当前保存的字节数.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_TIER_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        """返回保存的媒体数量.
+
+        Returns:
+            int: 媒体数量.
+        """
+        return len(self._entries)
+
+    def get(self, media_hash: str) -> bytes | None:
+        """读取媒体数据，并把它标记为最近使用.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+
+        Returns:
+            bytes | None: 媒体数据，不存在时返回 None.
+        """
+        data = self._entries.get(media_hash)
+        if data is not None:
+            self._entries.move_to_end(media_hash)
+        return data
+
+    def put(self, media_hash: str, data: bytes) -> None:
+        """写入媒体数据，必要时淘汰最久未使用的媒体.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+            data (bytes): 媒体数据.
+        """
+        if media_hash in self._entries:
+            self._entries.move_to_end(media_hash)
+            return
+        if len(data) > self.max_bytes:
+            return
+        data = bytes(data)
+        self._entries[media_hash] = data
+        self.size_bytes += len(data)
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    def contains(self, media_hash: str) -> bool:
+        """判断是否已保存该媒体，不影响 LRU 顺序.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+
+        Returns:
+            bool: 已保存返回 True，否则返回 False.
+        """
+        return media_hash in self._entries
+
+
+class DiskMediaStore(MediaStore):
+    """保存在目录中的媒体存储，读取时使用内存映射.
+
+    每个媒体一个文件，按 hash 的前两个字符分子目录. 只含字母、数字、"_" 和 "-" 的 hash
+    直接作为文件名，其他 hash 先取 SHA-256. 写入先落到临时文件再原子替换，
+    并发写入同一个 hash 不会产生半截文件.
+
+    Attributes:
+        directory (str): 存储目录.
+
+    Methods:
+        open(media_hash: str) -> memoryview | None: 以内存映射方式打开媒体，不复制数据.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def open(self, media_hash: str) -> memoryview | None:
+        """以内存映射方式打开媒体，不复制数据.
+
+        返回的 memoryview 被释放后映射才会关闭.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+
+        Returns:
+            memoryview | None: 只读的媒体数据视图，不存在时返回 None.
+        """
+        try:
+            with open(self._path(media_hash), "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return memoryview(b"")
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except FileNotFoundError:
+            return None
+
+    def get(self, media_hash: str) -> bytes | None:
+        """读取媒体数据.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+
+        Returns:
+            bytes | None: 媒体数据，不存在时返回 None.
+        """
+        view = self.open(media_hash)
+        if view is None:
+            return None
+        with view:
+            return view.tobytes()
+
+    def put(self, media_hash: str, data: bytes) -> None:
+        """写入媒体数据. 文件已存在时不再写入.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+            data (bytes): 媒体数据.
+        """
+        path = self._path(media_hash)
+        if os.path.exists(path):
+            return
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
+
+    def contains(self, media_hash: str) -> bool:
+        """判断是否已保存该媒体.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+
+        Returns:
+            bool: 已保存返回 True，否则返回 False.
+        """
+        return os.path.exists(self._path(media_hash))
+
+    def _path(self, media_hash: str) -> str:
+        """返回 hash 对应的文件路径."""
+        name = media_hash
+        if not _SAFE_HASH.match(name):
+            name = hashlib.sha256(media_hash.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name[:2], name)
+
+
+class TieredMediaStore(MediaStore):
+    """内存层 + 磁盘层的两级媒体存储.
+
+    读取时先查内存层，未命中再查磁盘层并把结果放回内存层；写入时两层都写.
+
+    Attributes:
+        memory (MemoryMediaStore): 内存层.
+        disk (DiskMediaStore): 磁盘层.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        max_memory_bytes: int = DEFAULT_MEMORY_TIER_BYTES,
+    ) -> None:
+        self.memory = MemoryMediaStore(max_memory_bytes)
+        self.disk = DiskMediaStore(directory)
+
+    def get(self, media_hash: str) -> bytes | None:
+        """读取媒体数据.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+
+        Returns:
+            bytes | None: 媒体数据，不存在时返回 None.
+        """
+        data = self.memory.get(media_hash)
+        if data is None:
+            data = self.disk.get(media_hash)
+            if data is not None:
+                self.memory.put(media_hash, data)
+        return data
+
+    def put(self, media_hash: str, data: bytes) -> None:
+        """同时写入内存层和磁盘层.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+            data (bytes): 媒体数据.
+        """
+        self.disk.put(media_hash, data)
+        self.memory.put(media_hash, data)
+
+    def contains(self, media_hash: str) -> bool:
+        """判断是否已保存该媒体.
+
+        Args:
+            media_hash (str): 媒体的 hash.
+
+        Returns:
+            bool: 已保存返回 True，否则返回 False.
+        """
+        return self.memory.contains(media_hash) or self.disk.contains(media_hash)
+
+
+class MediaOffloader:
+    """在事件中剥离和还原内联的 base64 媒体数据.
+
+    发送端调用 strip() 把媒体存入存储并从事件中移除 base64；接收端调用 rehydrate() 从本地
+    存储还原，本地缺失的 hash 用 media_get_actions() 生成 action.adapter.media.get 动作向对端索取，
+    收到带 base64 的回应后用 ingest() 存入存储.
+
+    Attributes:
+        store (MediaStore): 使用的媒体存储.
+        min_size (int): base64 字符串短于该长度时不剥离.
+
+    Methods:
+        strip(event: Event) -> Event: 剥离事件中的 base64 媒体数据.
+        rehydrate(event: Event) -> list[str]: 用存储中的数据还原被剥离的 base64.
+        ingest(event: Event) -> int: 把事件中内联的媒体数据存入存储.
+        media_get_actions(hashes: Iterable[str], platform_id: str, bot_id: str) -> list[Event]:
+            为缺失的媒体生成 action.adapter.media.get 动作事件.
+    """
+
+    def __init__(self, store: MediaStore, min_size: int = 1024) -> None:
+        self.store = store
+        self.min_size = min_size
+
+    def strip(self, event: Event) -> Event:
+        """剥离事件中的 base64 媒体数据.
+
+        媒体数据被解码后存入存储，Seg 中的 "base64" 被替换为 "base64_ref". 原事件不会被修改；
+        没有可剥离的 Seg 时直接返回原事件.
+
+        Args:
+            event (Event): 要外发的事件.
+
+        Returns:
+            Event: 剥离后的事件.
+        """
+        content = event.content
+        new_content: list[Seg] | None = None
+        for i, seg in enumerate(content):
+            stripped = self._strip_seg(seg)
+            if stripped is not None:
+                if new_content is None:
+                    new_content = list(content)
+                new_content[i] = stripped
+        if new_content is None:
+            return event
+        return dataclasses.replace(event, content=new_content)
+
+    def rehydrate(self, event: Event) -> list[str]:
+        """用存储中的数据还原被剥离的 base64，直接修改事件中的 Seg.
+
+        Args:
+            event (Event): 接收到的事件.
+
+        Returns:
+            list[str]: 存储中缺失、未能还原的 hash，不含重复项.
+        """
+        missing: dict[str, None] = {}
+        for seg in event.content:
+            if seg.type not in MEDIA_SEG_TYPES:
+                continue
+            media_hash = seg.data.get(BASE64_REF_KEY)
+            if media_hash is None:
+                continue
+            data = self.store.get(media_hash)
+            if data is None:
+                missing[media_hash] = None
+                continue
+            seg.data["base64"] = base64.b64encode(data).decode("ascii")
+            del seg.data[BASE64_REF_KEY]
+        return list(missing)
+
+    def ingest(self, event: Event) -> int:
+        """把事件中内联的媒体数据存入存储.
+
+        适用于 action.adapter.media.get 的回应以及任何携带 base64 的事件，事件本身不会被修改.
+
+        Args:
+            event (Event): 携带媒体数据的事件.
+
+        Returns:
+            int: 新存入的媒体数量.
+        """
+        count = 0
+        for seg in event.content:
+            media_hash = seg.data.get("hash")
+            encoded = seg.data.get("base64")
+            if not isinstance(media_hash, str) or not isinstance(encoded, str):
+                continue
+            if self.store.contains(media_hash):
+                continue
+            try:
+                self.store.put(media_hash, base64.b64decode(encoded, validate=True))
+            except binascii.Error:
+                continue
+            count += 1
+        return count
+
+    def media_get_actions(
+        self, hashes: Iterable[str], platform_id: str, bot_id: str
+    ) -> list[Event]:
+        """为缺失的媒体生成 action.adapter.media.get 动作事件.
+
+        按协议 3.4 节，每个事件的 content 只有一个 action_params Seg，其 data 为
+        {"hash": ..., "platform_id": ...}.
+
+        Args:
+            hashes (Iterable[str]): 缺失的媒体 hash，通常来自 rehydrate() 的返回值.
+            platform_id (str): 目标平台 ID.
+            bot_id (str): 机器人 ID.
+
+        Returns:
+            list[Event]: 每个 hash 对应一个动作事件.
+        """
+        hashes = list(hashes)
+        event_ids = EventBuilder.generate_event_ids(len(hashes))
+        now = EventBuilder.get_current_timestamp()
+        return [
+            Event(
+                event_id=event_id,
+                event_type="action.adapter.media.get",
+                time=now,
+                bot_id=bot_id,
+                content=[
+                    Seg(type="action_params", data={"hash": media_hash, "platform_id": platform_id})
+                ],
+            )
+            for event_id, media_hash in zip(event_ids, hashes, strict=True)
+        ]
+
+    def _strip_seg(self, seg: Seg) -> Seg | None:
+        """返回剥离后的 Seg 副本，不需要剥离时返回 None."""
+        if seg.type not in MEDIA_SEG_TYPES:
+            return None
+        data = seg.data
+        encoded = data.get("base64")
+        media_hash = data.get("hash")
+        if not isinstance(encoded, str) or not isinstance(media_hash, str):
+            return None
+        if len(encoded) < self.min_size:
+            return None
+        if not self.store.contains(media_hash):
+            try:
+                self.store.put(media_hash, base64.b64decode(encoded, validate=True))
+            except binascii.Error:
+                return None
+        new_data = {k: v for k, v in data.items() if k != "base64"}
+        new_data[BASE64_REF_KEY] = media_hash
+        return Seg(type=seg.type, data=new_data)
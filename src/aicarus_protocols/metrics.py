@@ -0,0 +1,470 @@
+"""AIcarus-Message-Protocol v1.6.0 - 热点路径的可选指标统计.
+
+开启后，Event 的 to_dict / from_dict / to_json_bytes / from_json_bytes、EventValidator.validate
+以及 EventBuilder 的 create_* 方法会把调用次数、失败次数、耗时和字节数记录到当前的
+MetricsRecorder 中，按操作、event_type 前缀和平台分组，耗时和字节数以直方图保存.
+
+统计默认关闭，关闭时各个热点路径只多一次模块属性读取和 None 比较：
+
+    from aicarus_protocols import metrics
+
+    recorder = metrics.enable_metrics()
+    ...
+    print(recorder.to_prometheus())
+
+    with metrics.collect_metrics() as recorder:  # 只统计 with 块内的调用
+        ...
+
+导出器是接收快照字典的可调用对象，由调用方在合适的时机（如心跳时）调用 recorder.export()
+触发；PrometheusTextfileExporter 把快照写成 Prometheus 文本格式的文件，不需要网络.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from itertools import pairwise
+from typing import Any
+
+from .event_type import EventTypePath
+
+# 默认的耗时直方图桶上界（秒）
+DEFAULT_LATENCY_BUCKETS = (
+    1e-6,
+    2.5e-6,
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    5e-4,
+    1e-3,
+    2.5e-3,
+    1e-2,
+    0.1,
+)
+# 默认的字节数直方图桶上界
+DEFAULT_SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152)
+# 最多保留的 (操作, 前缀, 平台) 组合数，超出后新的组合合并到 OTHER_LABEL 下
+DEFAULT_MAX_SERIES = 1024
+# (操作, event_type) 到分组的缓存容量，超出后整体清空
+SERIES_CACHE_SIZE = 4096
+# 标签取值：event_type 缺失、不合规范，以及超出 max_series 时使用
+UNKNOWN_LABEL = "unknown"
+INVALID_LABEL = "invalid"
+OTHER_LABEL = "other"
+# Prometheus 指标名前缀
+PROMETHEUS_NAMESPACE = "aicarus"
+
+# 导出器接收 MetricsRecorder.snapshot() 的返回值
+MetricsExporter = Callable[[dict[str, Any]], None]
+
+
+class _Series:
+    """一个 (操作, 前缀, 平台) 组合的计数和直方图."""
+
+    __slots__ = ("bytes_sum", "count", "failures", "latency_counts", "ns_sum", "size_counts")
+
+    def __init__(self, latency_buckets: int) -> None:
+        self.count = 0
+        self.failures = 0
+        self.ns_sum = 0
+        self.bytes_sum = 0
+        # 最后一个桶对应 +Inf；size_counts 只在记录过字节数时才分配
+        self.latency_counts = [0] * (latency_buckets + 1)
+        self.size_counts: list[int] | None = None
+
+
+def _quantile(bounds: tuple[float, ...], counts: list[int], q: float) -> float | None:
+    """按直方图估计分位数，在命中的桶内线性插值；落在 +Inf 桶时返回最大的有限上界."""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(counts):
+        if count and seen + count >= rank:
+            if index == len(bounds):
+                return bounds[-1]
+            lower = bounds[index - 1] if index else 0.0
+            return lower + (bounds[index] - lower) * (rank - seen) / count
+        seen += count
+    return bounds[-1]
+
+
+class MetricsRecorder:
+    """按操作、event_type 前缀和平台分组的计数器与直方图.
+
+    所有方法都是线程安全的.
+
+    Attributes:
+        latency_buckets (tuple[float, ...]): 耗时直方图的桶上界（秒），升序.
+        size_buckets (tuple[int, ...]): 字节数直方图的桶上界，升序.
+        max_series (int): 最多保留的分组数，超出后新的分组合并到前缀和平台均为 "other" 的分组.
+        exporters (list[MetricsExporter]): export() 时依次调用的导出器.
+
+    Methods:
+        observe(operation: str, event_type: Any, elapsed_ns: int, size: int | None = None,
+            failed: bool = False) -> None: 记录一次调用.
+        measure(operation: str, event_type: Any, func: Callable[..., Any], *args: Any,
+            size: int | None = None) -> Any: 调用 func 并记录耗时，抛出异常时记为失败.
+        snapshot() -> dict[str, Any]: 返回所有分组的当前统计.
+        to_prometheus() -> str: 返回 Prometheus 文本格式的统计.
+        add_exporter(exporter: MetricsExporter) -> None: 添加导出器.
+        export() -> dict[str, Any]: 生成快照并交给所有导出器.
+        reset() -> None: 清空所有统计.
+    """
+
+    def __init__(
+        self,
+        latency_buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+        size_buckets: tuple[int, ...] = DEFAULT_SIZE_BUCKETS,
+        max_series: int = DEFAULT_MAX_SERIES,
+        exporters: list[MetricsExporter] | None = None,
+    ) -> None:
+        for bounds in (latency_buckets, size_buckets):
+            if not bounds or any(a >= b for a, b in pairwise(bounds)):
+                raise ValueError("直方图的桶上界必须非空且严格递增")
+        if max_series <= 0:
+            raise ValueError("max_series 必须是正整数")
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.max_series = max_series
+        self.exporters: list[MetricsExporter] = list(exporters or ())
+        # 桶上界换算为纳秒，observe 中直接与 elapsed_ns 比较
+        self._latency_bounds_ns = tuple(round(b * 1e9) for b in self.latency_buckets)
+        self._series: dict[tuple[str, str, str], _Series] = {}
+        # (操作, event_type) 到分组的缓存，observe 通常只需查一次字典
+        self._by_type: dict[tuple[str, str | None], _Series] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """返回当前的分组数量.
+
+        Returns:
+            int: 分组数量.
+        """
+        return len(self._series)
+
+    def _series_for(self, operation: str, event_type: str | None) -> _Series:
+        """找到或创建 (操作, event_type) 对应的分组并缓存，调用方需持有锁."""
+        if event_type is None:
+            prefix = platform = UNKNOWN_LABEL
+        else:
+            path = EventTypePath.parse(event_type)
+            if path.is_valid:
+                prefix, platform = path.prefix, path.platform
+            else:
+                prefix = platform = INVALID_LABEL
+        key = (operation, prefix, platform)
+        series = self._series.get(key)
+        if series is None:
+            if len(self._series) >= self.max_series:
+                key = (operation, OTHER_LABEL, OTHER_LABEL)
+                series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.latency_buckets))
+        if len(self._by_type) >= SERIES_CACHE_SIZE:
+            self._by_type.clear()
+        self._by_type[(operation, event_type)] = series
+        return series
+
+    def observe(
+        self,
+        operation: str,
+        event_type: Any,
+        elapsed_ns: int,
+        size: int | None = None,
+        failed: bool = False,
+    ) -> None:
+        """记录一次调用.
+
+        Args:
+            operation (str): MetricOperation 中的操作名.
+            event_type (Any): 事件类型，用于得到前缀和平台标签；不是字符串时记为 "unknown".
+            elapsed_ns (int): 耗时（纳秒）.
+            size (int | None): 处理的字节数，为 None 时不记录.
+            failed (bool): 是否记为失败.
+        """
+        if type(event_type) is not str:
+            event_type = None
+        bucket = bisect_left(self._latency_bounds_ns, elapsed_ns)
+        with self._lock:
+            series = self._by_type.get((operation, event_type))
+            if series is None:
+                series = self._series_for(operation, event_type)
+            series.count += 1
+            series.ns_sum += elapsed_ns
+            series.latency_counts[bucket] += 1
+            if failed:
+                series.failures += 1
+            if size is not None:
+                if series.size_counts is None:
+                    series.size_counts = [0] * (len(self.size_buckets) + 1)
+                series.bytes_sum += size
+                series.size_counts[bisect_left(self.size_buckets, size)] += 1
+
+    def measure(
+        self,
+        operation: str,
+        event_type: Any,
+        func: Callable[..., Any],
+        *args: Any,
+        size: int | None = None,
+    ) -> Any:
+        """调用 func 并记录耗时，抛出异常时记为失败后重新抛出.
+
+        Args:
+            operation (str): MetricOperation 中的操作名.
+            event_type (Any): 事件类型；为 None 时取返回值的 event_type 属性.
+            func (Callable[..., Any]): 要调用的函数.
+            *args (Any): 传给 func 的参数.
+            size (int | None): 处理的字节数，为 None 时不记录.
+
+        Returns:
+            Any: func 的返回值.
+        """
+        started = time.perf_counter_ns()
+        try:
+            result = func(*args)
+        except Exception:
+            self.observe(operation, event_type, time.perf_counter_ns() - started, size, True)
+            raise
+        if event_type is None:
+            event_type = getattr(result, "event_type", None)
+        self.observe(operation, event_type, time.perf_counter_ns() - started, size)
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        """返回所有分组的当前统计.
+
+        Returns:
+            dict[str, Any]: 包含 created_at、latency_buckets、size_buckets 和 series 的字典.
+                series 中每一项包含 operation、prefix、platform、count、failures、
+                seconds_sum、latency_counts、p50_seconds、p99_seconds，记录过字节数的
+                还包含 bytes_sum 和 size_counts. 直方图计数不是累积的，最后一个对应 +Inf.
+        """
+        with self._lock:
+            series = []
+            for (operation, prefix, platform), s in self._series.items():
+                entry: dict[str, Any] = {
+                    "operation": operation,
+                    "prefix": prefix,
+                    "platform": platform,
+                    "count": s.count,
+                    "failures": s.failures,
+                    "seconds_sum": s.ns_sum / 1e9,
+                    "latency_counts": list(s.latency_counts),
+                }
+                if s.size_counts is not None:
+                    entry["bytes_sum"] = s.bytes_sum
+                    entry["size_counts"] = list(s.size_counts)
+                series.append(entry)
+        for entry in series:
+            entry["p50_seconds"] = _quantile(self.latency_buckets, entry["latency_counts"], 0.5)
+            entry["p99_seconds"] = _quantile(self.latency_buckets, entry["latency_counts"], 0.99)
+        series.sort(key=lambda e: (e["operation"], e["prefix"], e["platform"]))
+        return {
+            "created_at": time.time(),
+            "latency_buckets": list(self.latency_buckets),
+            "size_buckets": list(self.size_buckets),
+            "series": series,
+        }
+
+    def to_prometheus(self) -> str:
+        """返回 Prometheus 文本格式的统计.
+
+        Returns:
+            str: 可直接作为 /metrics 响应或 textfile collector 文件内容的文本.
+        """
+        return render_prometheus(self.snapshot())
+
+    def add_exporter(self, exporter: MetricsExporter) -> None:
+        """添加导出器.
+
+        Args:
+            exporter (MetricsExporter): 接收快照字典的可调用对象.
+        """
+        self.exporters.append(exporter)
+
+    def export(self) -> dict[str, Any]:
+        """生成快照并依次交给所有导出器.
+
+        Returns:
+            dict[str, Any]: 本次导出的快照.
+        """
+        snapshot = self.snapshot()
+        for exporter in self.exporters:
+            exporter(snapshot)
+        return snapshot
+
+    def reset(self) -> None:
+        """清空所有统计."""
+        with self._lock:
+            self._series.clear()
+            self._by_type.clear()
+
+
+def _escape_label(value: str) -> str:
+    """按 Prometheus 文本格式转义标签值."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_bound(bound: float) -> str:
+    """格式化直方图桶上界."""
+    return f"{bound:g}" if isinstance(bound, float) else str(bound)
+
+
+def _histogram_lines(
+    name: str, labels: str, bounds: list[Any], counts: list[int], total: float
+) -> list[str]:
+    """生成一个分组的直方图行，桶计数转换为累积值."""
+    lines = []
+    cumulative = 0
+    for bound, count in zip([*bounds, "+Inf"], counts, strict=True):
+        cumulative += count
+        le = bound if isinstance(bound, str) else _format_bound(bound)
+        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {total}")
+    lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    return lines
+
+
+def render_prometheus(snapshot: dict[str, Any]) -> str:
+    """把 MetricsRecorder.snapshot() 的结果渲染为 Prometheus 文本格式.
+
+    Args:
+        snapshot (dict[str, Any]): 快照字典.
+
+    Returns:
+        str: Prometheus 文本格式，以换行结尾.
+    """
+    latency_name = f"{PROMETHEUS_NAMESPACE}_operation_duration_seconds"
+    size_name = f"{PROMETHEUS_NAMESPACE}_operation_size_bytes"
+    failures_name = f"{PROMETHEUS_NAMESPACE}_operation_failures_total"
+    latency_lines: list[str] = []
+    size_lines: list[str] = []
+    failure_lines: list[str] = []
+    for entry in snapshot["series"]:
+        labels = ",".join(
+            f'{key}="{_escape_label(entry[key])}"' for key in ("operation", "prefix", "platform")
+        )
+        latency_lines += _histogram_lines(
+            latency_name,
+            labels,
+            snapshot["latency_buckets"],
+            entry["latency_counts"],
+            entry["seconds_sum"],
+        )
+        if "size_counts" in entry:
+            size_lines += _histogram_lines(
+                size_name,
+                labels,
+                snapshot["size_buckets"],
+                entry["size_counts"],
+                entry["bytes_sum"],
+            )
+        failure_lines.append(f"{failures_name}{{{labels}}} {entry['failures']}")
+
+    lines = [
+        f"# HELP {latency_name} 热点操作的耗时.",
+        f"# TYPE {latency_name} histogram",
+        *latency_lines,
+        f"# HELP {size_name} 编解码处理的字节数.",
+        f"# TYPE {size_name} histogram",
+        *size_lines,
+        f"# HELP {failures_name} 抛出异常或未通过校验的调用次数.",
+        f"# TYPE {failures_name} counter",
+        *failure_lines,
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusTextfileExporter:
+    """把快照写成 Prometheus 文本格式文件的导出器.
+
+    先写入同目录下的临时文件再替换，读取方（如 node_exporter 的 textfile collector）
+    不会看到写了一半的文件.
+
+    Attributes:
+        path (str): 输出文件路径.
+
+    Methods:
+        __call__(snapshot: dict[str, Any]) -> None: 写入快照.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __call__(self, snapshot: dict[str, Any]) -> None:
+        """写入快照.
+
+        Args:
+            snapshot (dict[str, Any]): MetricsRecorder.snapshot() 的结果.
+        """
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(render_prometheus(snapshot))
+        os.replace(tmp_path, self.path)
+
+
+# 当前生效的记录器，为 None 时表示未开启统计
+recorder: MetricsRecorder | None = None
+
+
+def enable_metrics(new_recorder: MetricsRecorder | None = None) -> MetricsRecorder:
+    """开启统计.
+
+    Args:
+        new_recorder (MetricsRecorder | None): 要使用的记录器，为 None 时新建一个.
+
+    Returns:
+        MetricsRecorder: 当前生效的记录器.
+    """
+    global recorder
+    recorder = new_recorder if new_recorder is not None else MetricsRecorder()
+    return recorder
+
+
+def disable_metrics() -> MetricsRecorder | None:
+    """关闭统计.
+
+    Returns:
+        MetricsRecorder | None: 关闭前生效的记录器，其中的统计仍然可以读取.
+    """
+    global recorder
+    previous, recorder = recorder, None
+    return previous
+
+
+@contextmanager
+def collect_metrics(new_recorder: MetricsRecorder | None = None) -> Iterator[MetricsRecorder]:
+    """在 with 块内使用指定的记录器，退出时恢复之前的记录器.
+
+    记录器是进程全局的，with 块执行期间其他线程中的调用同样会被记录.
+
+    Args:
+        new_recorder (MetricsRecorder | None): 要使用的记录器，为 None 时新建一个.
+
+    Yields:
+        MetricsRecorder: with 块内生效的记录器.
+    """
+    global recorder
+    previous = recorder
+    current = enable_metrics(new_recorder)
+    try:
+        yield current
+    finally:
+        recorder = previous
+
+
+def metrics_snapshot() -> dict[str, Any] | None:
+    """返回当前记录器的快照.
+
+    Returns:
+        dict[str, Any] | None: 快照字典，未开启统计时为 None.
+    """
+    return recorder.snapshot() if recorder is not None else None
@@ -0,0 +1,272 @@
+"""AIcarus-Message-Protocol v1.6.0 - 动作与响应的关联.
+
+Core 发出 action.* 事件后，Adapter 通过 action_response.* 事件回报结果，响应 Seg 的 data 中
+original_event_id 指向原动作的 event_id. PendingActions 为每个已发出的动作登记一个
+asyncio.Future，收到匹配的响应时完成它，超时未响应则以 ActionTimeoutError 结束.
+
+所有动作的超时共用一个按截止时间排序的堆和一个 loop 定时器，而不是每个动作一个任务，
+因此同时有成千上万个动作在途时开销也只与到期的动作数量相关.
+
+用法:
+
+    pending = PendingActions(default_timeout=10.0)
+    dispatcher.subscribe("action_response.**", pending.resolve)
+
+    response = await pending.call(conn.send, kick_event)
+"""
+
+import asyncio
+import heapq
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .event import Event
+
+# 默认的动作超时（秒）
+DEFAULT_ACTION_TIMEOUT = 30.0
+# 记住最近多少个已超时的动作，用于区分迟到的响应和无法匹配的响应
+LATE_TRACKING_SIZE = 4096
+
+
+class ActionTimeoutError(TimeoutError):
+    """动作在超时之前没有收到响应.
+
+    Attributes:
+        event_id (str): 超时动作的 event_id.
+    """
+
+    def __init__(self, event_id: str, timeout: float) -> None:
+        super().__init__(f"动作 {event_id} 在 {timeout} 秒内没有收到响应")
+        self.event_id = event_id
+
+
+def original_event_id(response: Event) -> str | None:
+    """从动作响应事件中取出原动作的 event_id.
+
+    Args:
+        response (Event): action_response.* 事件.
+
+    Returns:
+        str | None: 原动作的 event_id，找不到时返回 None.
+    """
+    for seg in response.content:
+        value = seg.data.get("original_event_id")
+        if isinstance(value, str):
+            return value
+    return None
+
+
+class PendingActions:
+    """等待响应的动作表.
+
+    必须在 asyncio 事件循环中使用；同一个实例只能在一个事件循环中使用.
+
+    Attributes:
+        default_timeout (float): 未指定超时时使用的超时（秒）.
+        resolved (int): 按时收到响应的动作数.
+        timed_out (int): 超时的动作数.
+        late (int): 动作已超时之后才到达的响应数.
+        unmatched (int): 无法匹配任何已知动作的响应数.
+
+    Methods:
+        register(event: Event, timeout: float | None = None) -> asyncio.Future[Event]: 登记一个动作.
+        call(send, event: Event, timeout: float | None = None) -> Event: 登记、发送并等待响应.
+        resolve(response: Event) -> bool: 用响应完成对应的动作.
+        cancel(event_id: str) -> bool: 取消一个在途动作.
+        cancel_all() -> int: 取消所有在途动作.
+        in_flight -> int: 在途动作数.
+        stats() -> dict[str, int]: 各计数器的快照.
+    """
+
+    def __init__(self, default_timeout: float = DEFAULT_ACTION_TIMEOUT) -> None:
+        self.default_timeout = default_timeout
+        self.resolved = 0
+        self.timed_out = 0
+        self.late = 0
+        self.unmatched = 0
+        self._pending: dict[str, tuple[asyncio.Future[Event], float]] = {}
+        # (截止时间, 序号, event_id, future)；已完成的条目在到期或压缩时才被丢弃
+        self._deadlines: list[tuple[float, int, str, asyncio.Future[Event]]] = []
+        self._sequence = 0
+        self._expired: OrderedDict[str, None] = OrderedDict()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_when = float("inf")
+
+    @property
+    def in_flight(self) -> int:
+        """在途动作数."""
+        return len(self._pending)
+
+    def register(self, event: Event, timeout: float | None = None) -> "asyncio.Future[Event]":
+        """登记一个即将发送的动作.
+
+        应在发送动作之前调用，以免响应先于登记到达.
+
+        Args:
+            event (Event): action.* 事件.
+            timeout (float | None): 超时（秒），为 None 时使用 default_timeout.
+
+        Returns:
+            asyncio.Future[Event]: 收到响应时以响应事件完成，超时时以 ActionTimeoutError 结束.
+
+        Raises:
+            ValueError: 事件不是动作事件，或同一个 event_id 已在途.
+        """
+        if not event.is_action_event():
+            raise ValueError(f"只能登记 action.* 事件: {event.event_type}")
+        event_id = event.event_id
+        if event_id in self._pending:
+            raise ValueError(f"动作 {event_id} 已在等待响应")
+        loop = self._loop
+        if loop is None:
+            loop = self._loop = asyncio.get_running_loop()
+        if timeout is None:
+            timeout = self.default_timeout
+
+        future: asyncio.Future[Event] = loop.create_future()
+        future.add_done_callback(lambda f: self._discard(event_id, f))
+        self._pending[event_id] = (future, timeout)
+        deadline = loop.time() + timeout
+        self._sequence += 1
+        heapq.heappush(self._deadlines, (deadline, self._sequence, event_id, future))
+        if deadline < self._timer_when:
+            self._schedule(deadline)
+        return future
+
+    async def call(
+        self,
+        send: Callable[[Event], Awaitable[Any]],
+        event: Event,
+        timeout: float | None = None,
+    ) -> Event:
+        """登记动作、发送它并等待响应.
+
+        Args:
+            send (Callable[[Event], Awaitable[Any]]): 发送函数，如 EventConnection.send.
+            event (Event): action.* 事件.
+            timeout (float | None): 超时（秒），为 None 时使用 default_timeout.
+
+        Returns:
+            Event: 匹配的 action_response.* 事件.
+
+        Raises:
+            ActionTimeoutError: 超时未收到响应.
+            ValueError: 事件不是动作事件，或同一个 event_id 已在途.
+        """
+        future = self.register(event, timeout)
+        try:
+            await send(event)
+        except BaseException:
+            future.cancel()
+            raise
+        return await future
+
+    def resolve(self, response: Event) -> bool:
+        """用响应完成对应的动作.
+
+        可以直接注册为 EventDispatcher 的 "action_response.**" 处理函数.
+
+        Args:
+            response (Event): action_response.* 事件.
+
+        Returns:
+            bool: 匹配到在途动作时返回 True；迟到或无法匹配时返回 False 并计数.
+        """
+        event_id = original_event_id(response)
+        entry = self._pending.pop(event_id, None) if event_id is not None else None
+        if entry is None:
+            if event_id is not None and event_id in self._expired:
+                self.late += 1
+            else:
+                self.unmatched += 1
+            return False
+        future = entry[0]
+        if future.done():
+            return False
+        future.set_result(response)
+        self.resolved += 1
+        return True
+
+    def cancel(self, event_id: str) -> bool:
+        """取消一个在途动作，等待它的一方会收到 CancelledError.
+
+        Args:
+            event_id (str): 动作的 event_id.
+
+        Returns:
+            bool: 该动作在途并被取消时返回 True.
+        """
+        entry = self._pending.pop(event_id, None)
+        if entry is None:
+            return False
+        return entry[0].cancel()
+
+    def cancel_all(self) -> int:
+        """取消所有在途动作，例如连接断开时.
+
+        Returns:
+            int: 被取消的动作数.
+        """
+        pending = list(self._pending.values())
+        self._pending.clear()
+        self._deadlines.clear()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._timer_when = float("inf")
+        return sum(future.cancel() for future, _ in pending)
+
+    def stats(self) -> dict[str, int]:
+        """返回各计数器的快照.
+
+        Returns:
+            dict[str, int]: in_flight、resolved、timed_out、late 和 unmatched.
+        """
+        return {
+            "in_flight": self.in_flight,
+            "resolved": self.resolved,
+            "timed_out": self.timed_out,
+            "late": self.late,
+            "unmatched": self.unmatched,
+        }
+
+    def _discard(self, event_id: str, future: "asyncio.Future[Event]") -> None:
+        """Future 完成后的回调；被外部取消的动作此时仍在在途表中，需要移除."""
+        entry = self._pending.get(event_id)
+        if entry is not None and entry[0] is future:
+            del self._pending[event_id]
+        # 在途动作远少于堆中条目时压缩堆，避免大量已完成的动作占用内存直到各自的截止时间
+        deadlines = self._deadlines
+        if len(deadlines) > 2 * len(self._pending) + 64:
+            self._deadlines = [item for item in deadlines if not item[3].done()]
+            heapq.heapify(self._deadlines)
+
+    def _schedule(self, when: float) -> None:
+        """把唯一的定时器调整到 when."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._loop.call_at(when, self._expire)
+        self._timer_when = when
+
+    def _expire(self) -> None:
+        """让所有已到期的动作超时，并为下一个截止时间设置定时器."""
+        self._timer = None
+        self._timer_when = float("inf")
+        now = self._loop.time()
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, _, event_id, future = heapq.heappop(deadlines)
+            if future.done():
+                continue
+            _, timeout = self._pending.pop(event_id)
+            self.timed_out += 1
+            self._expired[event_id] = None
+            if len(self._expired) > LATE_TRACKING_SIZE:
+                self._expired.popitem(last=False)
+            future.set_exception(ActionTimeoutError(event_id, timeout))
+        while deadlines and deadlines[0][3].done():
+            heapq.heappop(deadlines)
+        if deadlines:
+            self._schedule(deadlines[0][0])
@@ -0,0 +1,560 @@
+"""AIcarus-Message-Protocol v1.6.0 - 按 event_type 前缀分级的事件调度.
+
+只用一个 FIFO 队列时，成批到达的 notice.* 和 meta.* 事件会推迟 action_response.* 事件的
+处理，使等待响应的插件超时. EventScheduler 按 EventTypePrefix 把事件分入若干优先级类别：
+
+*   加权公平出队：非空类别按权重轮流出队（平滑加权轮询），权重越高出队越频繁，
+    低权重类别也总能按比例得到服务.
+*   容量与丢弃策略：每个类别有独立的容量上限和 OverflowPolicy.
+*   防饥饿：某个类别的队首事件等待超过 starvation_timeout 时优先出队.
+
+EventScheduler 本身不加锁也不等待；AsyncEventScheduler 和 ThreadSafeEventScheduler
+在它之上分别提供 asyncio 和多线程的阻塞入队与出队.
+
+用法:
+
+    scheduler = AsyncEventScheduler()
+    await scheduler.put(event)       # 接收方
+    event = await scheduler.get()    # 处理方
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass
+
+from .constants import EventTypePrefix, OverflowPolicy
+from .event import Event
+
+# 默认的防饥饿等待上限（秒）
+DEFAULT_STARVATION_TIMEOUT = 1.0
+
+_POLICIES = frozenset(
+    (OverflowPolicy.BLOCK, OverflowPolicy.DROP_NEWEST, OverflowPolicy.DROP_OLDEST)
+)
+
+
+@dataclass(slots=True, frozen=True)
+class PriorityClass:
+    """一个优先级类别.
+
+    Attributes:
+        name (str): 类别名称.
+        prefixes (tuple[str, ...]): 归入该类别的 event_type 前缀，取值为 EventTypePrefix 中的常量.
+        weight (int): 出队权重，必须为正整数.
+        capacity (int): 最多积压的事件数.
+        policy (str): 类别满时的处理策略，取值为 OverflowPolicy 中的常量.
+    """
+
+    name: str
+    prefixes: tuple[str, ...] = ()
+    weight: int = 1
+    capacity: int = 1024
+    policy: str = OverflowPolicy.BLOCK
+
+
+# 默认类别：动作响应最优先；消息、请求和动作其次；通知和元事件最后，满时丢弃最旧的
+DEFAULT_PRIORITY_CLASSES = (
+    PriorityClass("response", (EventTypePrefix.ACTION_RESPONSE,), weight=8, capacity=1024),
+    PriorityClass(
+        "interactive",
+        (EventTypePrefix.MESSAGE, EventTypePrefix.REQUEST, EventTypePrefix.ACTION),
+        weight=4,
+        capacity=4096,
+    ),
+    PriorityClass(
+        "background",
+        (EventTypePrefix.NOTICE, EventTypePrefix.META),
+        weight=1,
+        capacity=4096,
+        policy=OverflowPolicy.DROP_OLDEST,
+    ),
+)
+
+
+class _Lane:
+    """一个优先级类别的队列及其计数器."""
+
+    __slots__ = (
+        "credit",
+        "dequeued",
+        "dropped",
+        "enqueued",
+        "items",
+        "max_depth",
+        "max_wait",
+        "promoted",
+        "rejected",
+        "spec",
+        "total_wait",
+    )
+
+    def __init__(self, spec: PriorityClass) -> None:
+        self.spec = spec
+        # (入队时间, 事件)
+        self.items: deque[tuple[float, Event]] = deque()
+        self.credit = 0
+        self.enqueued = 0
+        self.dequeued = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.promoted = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class EventScheduler:
+    """按优先级类别调度事件的非阻塞队列.
+
+    不是线程安全的；需要等待时使用 AsyncEventScheduler 或 ThreadSafeEventScheduler.
+
+    Attributes:
+        starvation_timeout (float | None): 队首事件等待超过该时间（秒）时优先出队，
+            为 None 时只按权重出队.
+
+    Methods:
+        classify(event: Event) -> str: 返回事件所属的类别名称.
+        offer(event: Event) -> bool: 事件入队，被拒绝或丢弃时返回 False.
+        poll() -> Event | None: 按调度顺序取出一个事件，队列为空时返回 None.
+        depth(name: str) -> int: 指定类别当前积压的事件数.
+        stats() -> dict[str, dict[str, float]]: 各类别计数器的快照.
+    """
+
+    def __init__(
+        self,
+        classes: Iterable[PriorityClass] = DEFAULT_PRIORITY_CLASSES,
+        default_class: str | None = None,
+        starvation_timeout: float | None = DEFAULT_STARVATION_TIMEOUT,
+        on_drop: Callable[[Event, str], object] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """初始化调度器.
+
+        Args:
+            classes (Iterable[PriorityClass]): 优先级类别.
+            default_class (str | None): 前缀不属于任何类别的事件归入的类别，
+                为 None 时使用最后一个类别.
+            starvation_timeout (float | None): 防饥饿等待上限（秒），为 None 时关闭.
+            on_drop (Callable[[Event, str], object] | None): 事件因容量被丢弃时调用，
+                参数为被丢弃的事件和类别名称.
+            clock (Callable[[], float]): 计时函数，默认为 time.monotonic.
+
+        Raises:
+            ValueError: 类别为空、名称或前缀重复、参数不合法，或 default_class 不存在.
+        """
+        self.starvation_timeout = starvation_timeout
+        self._on_drop = on_drop
+        self._clock = clock
+        self._lanes: list[_Lane] = []
+        self._by_name: dict[str, _Lane] = {}
+        self._by_prefix: dict[str, _Lane] = {}
+        for spec in classes:
+            if spec.weight <= 0 or spec.capacity <= 0:
+                raise ValueError(f"类别 {spec.name} 的 weight 和 capacity 必须为正")
+            if spec.policy not in _POLICIES:
+                raise ValueError(f"未知的 OverflowPolicy: {spec.policy}")
+            if spec.name in self._by_name:
+                raise ValueError(f"类别名称重复: {spec.name}")
+            lane = _Lane(spec)
+            self._lanes.append(lane)
+            self._by_name[spec.name] = lane
+            for prefix in spec.prefixes:
+                if prefix in self._by_prefix:
+                    raise ValueError(f"前缀 {prefix} 同时属于多个类别")
+                self._by_prefix[prefix] = lane
+        if not self._lanes:
+            raise ValueError("至少需要一个优先级类别")
+        if default_class is None:
+            self._default = self._lanes[-1]
+        elif default_class in self._by_name:
+            self._default = self._by_name[default_class]
+        else:
+            raise ValueError(f"未知的类别: {default_class}")
+        self._size = 0
+
+    def __len__(self) -> int:
+        """所有类别积压的事件总数."""
+        return self._size
+
+    def classify(self, event: Event) -> str:
+        """返回事件所属的类别名称.
+
+        Args:
+            event (Event): 要分类的事件.
+
+        Returns:
+            str: 类别名称.
+        """
+        return self._lane_for(event).spec.name
+
+    def depth(self, name: str) -> int:
+        """返回指定类别当前积压的事件数.
+
+        Args:
+            name (str): 类别名称.
+
+        Returns:
+            int: 积压的事件数.
+
+        Raises:
+            ValueError: 类别不存在.
+        """
+        lane = self._by_name.get(name)
+        if lane is None:
+            raise ValueError(f"未知的类别: {name}")
+        return len(lane.items)
+
+    def offer(self, event: Event) -> bool:
+        """事件入队.
+
+        类别已满时按其 OverflowPolicy 处理：BLOCK 拒绝新事件，DROP_NEWEST 丢弃新事件，
+        DROP_OLDEST 丢弃该类别中最旧的事件后接收新事件.
+
+        Args:
+            event (Event): 要入队的事件.
+
+        Returns:
+            bool: 新事件进入队列时返回 True.
+        """
+        return self._offer(self._lane_for(event), event)
+
+    def poll(self) -> Event | None:
+        """按调度顺序取出一个事件.
+
+        Returns:
+            Event | None: 取出的事件，队列为空时返回 None.
+        """
+        taken = self._poll()
+        return None if taken is None else taken[1]
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """返回各类别计数器的快照.
+
+        Returns:
+            dict[str, dict[str, float]]: 以类别名称为键，值包含 depth、max_depth、enqueued、
+                dequeued、dropped、rejected、promoted（因防饥饿提前出队的次数）、
+                mean_wait 和 max_wait（秒）.
+        """
+        result = {}
+        for lane in self._lanes:
+            result[lane.spec.name] = {
+                "depth": len(lane.items),
+                "max_depth": lane.max_depth,
+                "enqueued": lane.enqueued,
+                "dequeued": lane.dequeued,
+                "dropped": lane.dropped,
+                "rejected": lane.rejected,
+                "promoted": lane.promoted,
+                "mean_wait": lane.total_wait / lane.dequeued if lane.dequeued else 0.0,
+                "max_wait": lane.max_wait,
+            }
+        return result
+
+    def _lane_for(self, event: Event) -> _Lane:
+        """按 event_type 前缀找到事件所属的类别."""
+        return self._by_prefix.get(event.type_path.prefix, self._default)
+
+    def _offer(self, lane: _Lane, event: Event) -> bool:
+        """把事件放入指定类别，类别已满时按策略处理."""
+        items = lane.items
+        if len(items) >= lane.spec.capacity:
+            policy = lane.spec.policy
+            if policy == OverflowPolicy.DROP_OLDEST:
+                self._size -= 1
+                self._drop(lane, items.popleft()[1])
+            elif policy == OverflowPolicy.DROP_NEWEST:
+                self._drop(lane, event)
+                return False
+            else:
+                lane.rejected += 1
+                return False
+        items.append((self._clock(), event))
+        self._size += 1
+        lane.enqueued += 1
+        if len(items) > lane.max_depth:
+            lane.max_depth = len(items)
+        return True
+
+    def _drop(self, lane: _Lane, event: Event) -> None:
+        """记录一次因容量而丢弃的事件."""
+        lane.dropped += 1
+        if self._on_drop is not None:
+            self._on_drop(event, lane.spec.name)
+
+    def _poll(self) -> tuple[_Lane, Event] | None:
+        """选出下一个出队的类别并取出其队首事件."""
+        if not self._size:
+            return None
+        now = self._clock()
+        chosen = None
+        if self.starvation_timeout is not None:
+            # 等待超过上限的队首事件中最旧的一个优先出队
+            oldest = now - self.starvation_timeout
+            for lane in self._lanes:
+                if lane.items and lane.items[0][0] <= oldest:
+                    oldest = lane.items[0][0]
+                    chosen = lane
+            if chosen is not None:
+                chosen.promoted += 1
+        if chosen is None:
+            # 平滑加权轮询：每个非空类别累加自身权重，选累计值最大的，再减去本轮总权重
+            active_weight = 0
+            for lane in self._lanes:
+                if lane.items:
+                    lane.credit += lane.spec.weight
+                    active_weight += lane.spec.weight
+                    if chosen is None or lane.credit > chosen.credit:
+                        chosen = lane
+            chosen.credit -= active_weight
+
+        enqueued_at, event = chosen.items.popleft()
+        if not chosen.items:
+            chosen.credit = 0
+        self._size -= 1
+        wait = now - enqueued_at
+        chosen.dequeued += 1
+        chosen.total_wait += wait
+        if wait > chosen.max_wait:
+            chosen.max_wait = wait
+        return chosen, event
+
+
+class AsyncEventScheduler:
+    """EventScheduler 的 asyncio 前端.
+
+    只能在一个事件循环中使用. 类别策略为 BLOCK 时 put() 等待空位，其余策略立即返回.
+    关闭后 put() 返回 False，get() 取完剩余事件后返回 None.
+
+    Attributes:
+        scheduler (EventScheduler): 底层调度器.
+
+    Methods:
+        put(event: Event) -> bool: 事件入队，必要时等待空位.
+        put_nowait(event: Event) -> bool: 事件入队，不等待.
+        get() -> Event | None: 取出一个事件，必要时等待.
+        get_nowait() -> Event | None: 取出一个事件，队列为空时返回 None.
+        close() -> None: 关闭并唤醒所有等待方.
+        stats() -> dict[str, dict[str, float]]: 各类别计数器的快照.
+    """
+
+    def __init__(self, scheduler: EventScheduler | None = None) -> None:
+        self.scheduler = scheduler if scheduler is not None else EventScheduler()
+        self._getters: deque[asyncio.Future[None]] = deque()
+        self._putters: dict[_Lane, deque[asyncio.Future[None]]] = {
+            lane: deque() for lane in self.scheduler._lanes
+        }
+        self._closed = False
+
+    def __len__(self) -> int:
+        """积压的事件总数."""
+        return len(self.scheduler)
+
+    def __aiter__(self) -> AsyncIterator[Event]:
+        """逐个取出事件，关闭且取空后结束."""
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Event]:
+        """__aiter__ 使用的异步生成器."""
+        while (event := await self.get()) is not None:
+            yield event
+
+    async def put(self, event: Event) -> bool:
+        """事件入队，所属类别策略为 BLOCK 且已满时等待空位.
+
+        Args:
+            event (Event): 要入队的事件.
+
+        Returns:
+            bool: 新事件进入队列时返回 True；被丢弃或调度器已关闭时返回 False.
+        """
+        scheduler = self.scheduler
+        lane = scheduler._lane_for(event)
+        if lane.spec.policy == OverflowPolicy.BLOCK:
+            waiters = self._putters[lane]
+            while len(lane.items) >= lane.spec.capacity and not self._closed:
+                waiter = asyncio.get_running_loop().create_future()
+                waiters.append(waiter)
+                try:
+                    await waiter
+                except BaseException:
+                    waiter.cancel()
+                    with contextlib.suppress(ValueError):
+                        waiters.remove(waiter)
+                    # 被唤醒后又被取消时把空位让给下一个等待方
+                    if len(lane.items) < lane.spec.capacity and not waiter.cancelled():
+                        _wake_next(waiters)
+                    raise
+        if self._closed:
+            return False
+        accepted = scheduler._offer(lane, event)
+        if accepted:
+            _wake_next(self._getters)
+        return accepted
+
+    def put_nowait(self, event: Event) -> bool:
+        """事件入队，不等待.
+
+        Args:
+            event (Event): 要入队的事件.
+
+        Returns:
+            bool: 新事件进入队列时返回 True.
+        """
+        if self._closed or not self.scheduler.offer(event):
+            return False
+        _wake_next(self._getters)
+        return True
+
+    async def get(self) -> Event | None:
+        """按调度顺序取出一个事件，队列为空时等待.
+
+        Returns:
+            Event | None: 取出的事件；调度器已关闭且没有剩余事件时返回 None.
+        """
+        while not self.scheduler._size:
+            if self._closed:
+                return None
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                with contextlib.suppress(ValueError):
+                    self._getters.remove(getter)
+                if self.scheduler._size and not getter.cancelled():
+                    _wake_next(self._getters)
+                raise
+        return self._take()
+
+    def get_nowait(self) -> Event | None:
+        """按调度顺序取出一个事件，不等待.
+
+        Returns:
+            Event | None: 取出的事件，队列为空时返回 None.
+        """
+        if not self.scheduler._size:
+            return None
+        return self._take()
+
+    def close(self) -> None:
+        """关闭调度器并唤醒所有等待方."""
+        self._closed = True
+        for waiters in (self._getters, *self._putters.values()):
+            while waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """返回各类别计数器的快照，见 EventScheduler.stats."""
+        return self.scheduler.stats()
+
+    def _take(self) -> Event:
+        """取出一个事件，并唤醒等待该类别空位的入队方."""
+        lane, event = self.scheduler._poll()
+        _wake_next(self._putters[lane])
+        return event
+
+
+class ThreadSafeEventScheduler:
+    """EventScheduler 的多线程前端.
+
+    所有操作共用一把锁. 类别策略为 BLOCK 时 put() 等待空位，其余策略立即返回.
+    关闭后 put() 返回 False，get() 取完剩余事件后返回 None.
+
+    Attributes:
+        scheduler (EventScheduler): 底层调度器.
+
+    Methods:
+        put(event: Event, timeout: float | None = None) -> bool: 事件入队，必要时等待空位.
+        get(timeout: float | None = None) -> Event | None: 取出一个事件，必要时等待.
+        close() -> None: 关闭并唤醒所有等待的线程.
+        stats() -> dict[str, dict[str, float]]: 各类别计数器的快照.
+    """
+
+    def __init__(self, scheduler: EventScheduler | None = None) -> None:
+        self.scheduler = scheduler if scheduler is not None else EventScheduler()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = {lane: threading.Condition(self._lock) for lane in self.scheduler._lanes}
+        self._closed = False
+
+    def __len__(self) -> int:
+        """积压的事件总数."""
+        with self._lock:
+            return len(self.scheduler)
+
+    def put(self, event: Event, timeout: float | None = None) -> bool:
+        """事件入队，所属类别策略为 BLOCK 且已满时等待空位.
+
+        Args:
+            event (Event): 要入队的事件.
+            timeout (float | None): 最多等待的秒数，为 None 时一直等待，为 0 时不等待.
+
+        Returns:
+            bool: 新事件进入队列时返回 True；等待超时、被丢弃或调度器已关闭时返回 False.
+        """
+        scheduler = self.scheduler
+        lane = scheduler._lane_for(event)
+        with self._lock:
+            if lane.spec.policy == OverflowPolicy.BLOCK:
+                not_full = self._not_full[lane]
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while len(lane.items) >= lane.spec.capacity and not self._closed:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        break
+                    not_full.wait(remaining)
+            if self._closed:
+                return False
+            accepted = scheduler._offer(lane, event)
+            if accepted:
+                self._not_empty.notify()
+            return accepted
+
+    def get(self, timeout: float | None = None) -> Event | None:
+        """按调度顺序取出一个事件，队列为空时等待.
+
+        Args:
+            timeout (float | None): 最多等待的秒数，为 None 时一直等待，为 0 时不等待.
+
+        Returns:
+            Event | None: 取出的事件；等待超时或调度器已关闭且没有剩余事件时返回 None.
+        """
+        scheduler = self.scheduler
+        with self._lock:
+            if not self._not_empty.wait_for(lambda: scheduler._size or self._closed, timeout):
+                return None
+            taken = scheduler._poll()
+            if taken is None:
+                return None
+            lane, event = taken
+            self._not_full[lane].notify()
+            return event
+
+    def close(self) -> None:
+        """关闭调度器并唤醒所有等待的线程."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            for condition in self._not_full.values():
+                condition.notify_all()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """返回各类别计数器的快照，见 EventScheduler.stats."""
+        with self._lock:
+            return self.scheduler.stats()
+
+
+def _wake_next(waiters: deque[asyncio.Future[None]]) -> None:
+    """唤醒第一个仍在等待的 Future."""
+    while waiters:
+        waiter = waiters.popleft()
+        if not waiter.done():
+            waiter.set_result(None)
+            return
@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Seg:
     """2.4. Seg 对象 (通用信息单元).
 
@@ -20,6 +20,7 @@ class Seg:
     Methods:
         to_dict() -> dict[str, Any]: 将 Seg 实例转换为字典.
         from_dict(data_dict: dict[str, Any]) -> Seg: 从字典创建 Seg 实例.
+        __eq__(other: object) -> bool: 比较两个 Seg 的 type 和 data.
         __str__() -> str: 返回 Seg 的字符串表示.
         __repr__() -> str: 返回 Seg 的详细表示.
     """
@@ -53,6 +54,18 @@ class Seg:
 
         return cls(type=seg_type, data=seg_data)
 
+    def __eq__(self, other: object) -> bool:
+        """比较两个 Seg 的 type 和 data.
+
+        进入 SegList 类型索引的 Seg 会被切换为内部子类，比较时与普通 Seg 一视同仁.
+
+        Returns:
+            bool: type 和 data 都相等时返回 True.
+        """
+        if not isinstance(other, Seg):
+            return NotImplemented
+        return self.type == other.type and self.data == other.data
+
     def __str__(self) -> str:
         """返回 Seg 的字符串表示.
 
@@ -70,6 +83,263 @@ class Seg:
         return self.__str__()
 
 
+# 少于该数量的 SegList 直接扫描，此时扫描比构建和查询类型索引更快
+INDEX_MIN_SEGS = 32
+
+# 已进入类型索引的 Seg 的 type 被重新赋值的累计次数. 索引记录构建时的值，不一致时重新构建
+_type_epoch = 0
+
+
+class _TrackedSeg(Seg):
+    """已进入某个 SegList 类型索引的 Seg.
+
+    SegList 构建索引时把其中的 Seg 切换为这个子类. 它与 Seg 的内存布局和行为完全相同，
+    只是给 type 赋值时会推进 _type_epoch，使所有已构建的索引失效. 没有进入索引的 Seg
+    不受影响，构造和读写都没有额外开销.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """赋值；修改 type 时使所有类型索引失效."""
+        if name == "type":
+            global _type_epoch
+            _type_epoch += 1
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self) -> tuple[type[Seg], tuple[str, dict[str, Any]]]:
+        """复制和序列化时还原为普通的 Seg."""
+        return Seg, (self.type, self.data)
+
+
+# 索引中没有的类型对应的条目
+_NO_MATCH: tuple[tuple[int, ...], tuple[Seg, ...]] = ((), ())
+
+
+def _index_entry(segs: list[Seg], seg_type: str) -> tuple[tuple[int, ...], tuple[Seg, ...]] | None:
+    """按类型索引返回指定类型的 (位置, Seg)；segs 不是可以使用索引的 SegList 时返回 None."""
+    if len(segs) < INDEX_MIN_SEGS or not isinstance(segs, SegList):
+        return None
+    try:
+        index = segs._index
+    except AttributeError:
+        index = None
+    if index is None or segs._index_epoch != _type_epoch:
+        index = segs._type_index()
+        if index is None:
+            return None
+    return index.get(seg_type, _NO_MATCH)
+
+
+def _indexed_segs(segs: list[Seg], seg_type: str) -> tuple[Seg, ...] | None:
+    """按类型索引返回指定类型的全部 Seg；segs 不是可以使用索引的 SegList 时返回 None."""
+    entry = _index_entry(segs, seg_type)
+    return None if entry is None else entry[1]
+
+
+def seg_positions(segs: list[Seg], seg_type: str) -> tuple[int, ...]:
+    """返回 segs 中指定类型的 Seg 所在的全部位置.
+
+    segs 是 SegList 时使用其类型索引，否则按当前内容扫描.
+
+    Args:
+        segs (list[Seg]): Seg 对象列表.
+        seg_type (str): 要查找的 Seg 类型.
+
+    Returns:
+        tuple[int, ...]: 按顺序排列的位置，没有时为空元组.
+    """
+    if len(segs) >= INDEX_MIN_SEGS:
+        entry = _index_entry(segs, seg_type)
+        if entry is not None:
+            return entry[0]
+    return tuple([i for i, seg in enumerate(segs) if seg.type == seg_type])
+
+
+def first_seg(segs: list[Seg], seg_type: str) -> Seg | None:
+    """返回 segs 中指定类型的第一个 Seg.
+
+    segs 是 SegList 时使用其类型索引，否则按当前内容扫描.
+
+    Args:
+        segs (list[Seg]): Seg 对象列表.
+        seg_type (str): 要查找的 Seg 类型.
+
+    Returns:
+        Seg | None: 找到的第一个 Seg 对象或 None.
+    """
+    if len(segs) >= INDEX_MIN_SEGS:
+        matched = _indexed_segs(segs, seg_type)
+        if matched is not None:
+            return matched[0] if matched else None
+    for seg in segs:
+        if seg.type == seg_type:
+            return seg
+    return None
+
+
+def segs_of_type(segs: list[Seg], seg_type: str) -> list[Seg]:
+    """返回 segs 中指定类型的所有 Seg.
+
+    segs 是 SegList 时使用其类型索引，否则按当前内容扫描.
+
+    Args:
+        segs (list[Seg]): Seg 对象列表.
+        seg_type (str): 要查找的 Seg 类型.
+
+    Returns:
+        list[Seg]: 所有匹配的 Seg 对象列表.
+    """
+    if len(segs) >= INDEX_MIN_SEGS:
+        matched = _indexed_segs(segs, seg_type)
+        if matched is not None:
+            return list(matched)
+    return [seg for seg in segs if seg.type == seg_type]
+
+
+class SegList(list):
+    """带类型索引的 Seg 列表.
+
+    解码得到的 Event.content 的类型. 不少于 INDEX_MIN_SEGS 个 Seg 时，首次按类型查找会构建
+    一份 "Seg 类型 -> 位置和 Seg" 的索引，此后同类查找都是 O(1)；更短的列表直接扫描.
+
+    索引总是与当前内容一致：列表本身的任何修改（追加、删除、赋值、排序等）都会丢弃索引；
+    构建索引时其中的 Seg 被切换为内部子类 _TrackedSeg，此后给任一这样的 Seg.type 赋值
+    都会使所有索引失效. 列表中含有 Seg 的自定义子类或其他对象时无法察觉这类修改，
+    此时不建立索引，总是扫描.
+
+    Methods:
+        positions(seg_type: str) -> tuple[int, ...]: 返回指定类型的 Seg 所在的全部位置.
+        first(seg_type: str) -> Seg | None: 返回指定类型的第一个 Seg.
+        of_type(seg_type: str) -> list[Seg]: 返回指定类型的所有 Seg.
+    """
+
+    __slots__ = ("_index", "_index_epoch")
+
+    def _type_index(self) -> dict[str, tuple[tuple[int, ...], tuple[Seg, ...]]] | None:
+        """返回当前有效的类型索引，必要时重新构建；含有无法跟踪的元素时返回 None."""
+        try:
+            index = self._index
+        except AttributeError:
+            index = None
+        if index is not None and self._index_epoch == _type_epoch:
+            return index
+        positions: dict[str, list[int]] = {}
+        matched: dict[str, list[Seg]] = {}
+        for i, seg in enumerate(self):
+            cls = seg.__class__
+            if cls is Seg:
+                seg.__class__ = _TrackedSeg
+            elif cls is not _TrackedSeg:
+                return None
+            seg_type = seg.type
+            if seg_type in matched:
+                positions[seg_type].append(i)
+                matched[seg_type].append(seg)
+            else:
+                positions[seg_type] = [i]
+                matched[seg_type] = [seg]
+        # 同时保存位置和 Seg 本身：按位置取回 Seg 在列表子类上较慢
+        index = self._index = {
+            key: (tuple(positions[key]), tuple(value)) for key, value in matched.items()
+        }
+        self._index_epoch = _type_epoch
+        return index
+
+    def positions(self, seg_type: str) -> tuple[int, ...]:
+        """返回指定类型的 Seg 所在的全部位置.
+
+        Args:
+            seg_type (str): 要查找的 Seg 类型.
+
+        Returns:
+            tuple[int, ...]: 按顺序排列的位置，没有时为空元组.
+        """
+        return seg_positions(self, seg_type)
+
+    def first(self, seg_type: str) -> Seg | None:
+        """返回指定类型的第一个 Seg.
+
+        Args:
+            seg_type (str): 要查找的 Seg 类型.
+
+        Returns:
+            Seg | None: 找到的第一个 Seg 对象或 None.
+        """
+        return first_seg(self, seg_type)
+
+    def of_type(self, seg_type: str) -> list[Seg]:
+        """返回指定类型的所有 Seg.
+
+        Args:
+            seg_type (str): 要查找的 Seg 类型.
+
+        Returns:
+            list[Seg]: 所有匹配的 Seg 对象列表.
+        """
+        return segs_of_type(self, seg_type)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """赋值并丢弃索引."""
+        self._index = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        """删除并丢弃索引."""
+        self._index = None
+        super().__delitem__(key)
+
+    def __iadd__(self, other: Any) -> "SegList":
+        """原地拼接并丢弃索引."""
+        self._index = None
+        return super().__iadd__(other)
+
+    def __imul__(self, n: Any) -> "SegList":
+        """原地重复并丢弃索引."""
+        self._index = None
+        return super().__imul__(n)
+
+    def append(self, seg: Seg) -> None:
+        """追加并丢弃索引."""
+        self._index = None
+        super().append(seg)
+
+    def extend(self, segs: Any) -> None:
+        """扩展并丢弃索引."""
+        self._index = None
+        super().extend(segs)
+
+    def insert(self, index: Any, seg: Seg) -> None:
+        """插入并丢弃索引."""
+        self._index = None
+        super().insert(index, seg)
+
+    def pop(self, index: Any = -1) -> Seg:
+        """弹出并丢弃索引."""
+        self._index = None
+        return super().pop(index)
+
+    def remove(self, seg: Seg) -> None:
+        """移除并丢弃索引."""
+        self._index = None
+        super().remove(seg)
+
+    def clear(self) -> None:
+        """清空并丢弃索引."""
+        self._index = None
+        super().clear()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        """排序并丢弃索引."""
+        self._index = None
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        """反转并丢弃索引."""
+        self._index = None
+        super().reverse()
+
+
 class SegBuilder:
     """协议标准 Seg 构建器.
 
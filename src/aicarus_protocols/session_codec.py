@@ -0,0 +1,289 @@
+"""AIcarus-Message-Protocol v1.6.0 - 连接级上下文增量编码.
+
+同一条适配器连接上，连续的事件几乎总是携带相同的 bot_id 和 conversation_info，
+user_info 也往往只在少数几个用户之间切换. SessionEncoder 为每个方向记住最近 N 个
+不同的值，重复出现时只发送一个整数引用；SessionDecoder 按引用还原出完整的 Event.
+
+编码结果仍是一个 JSON 对象，与普通事件字典只在以下三个字段上不同：
+
+*   "bot_id_ref"、"user_info_ref"、"conversation_info_ref"：槽位号.
+    同时带有原字段时表示“把这个值存入该槽位”，单独出现时表示“使用该槽位中的值”.
+
+槽位的分配和淘汰只由编码端决定，解码端照单执行，因此两端不需要运行相同的 LRU 逻辑.
+连接断开重连后，两端都必须调用 reset()，否则解码端会拒绝无法识别的引用.
+"""
+
+from collections import OrderedDict
+from typing import Any
+
+from . import json_codec
+from .event import Event
+from .interning import freeze_value
+
+# 每种上下文默认记住的不同值的数量
+DEFAULT_SESSION_TABLE_SIZE = 64
+
+BOT_ID_REF_KEY = "bot_id_ref"
+USER_INFO_REF_KEY = "user_info_ref"
+CONVERSATION_INFO_REF_KEY = "conversation_info_ref"
+
+# 表示 lookup() 没有淘汰任何值
+_NOTHING = object()
+
+# (原字段, 引用字段)
+_CONTEXT_FIELDS = (
+    ("bot_id", BOT_ID_REF_KEY),
+    ("user_info", USER_INFO_REF_KEY),
+    ("conversation_info", CONVERSATION_INFO_REF_KEY),
+)
+
+
+class _SlotTable:
+    """编码端的槽位表：把值的结构键映射到槽位号，满时淘汰最久未使用的槽位.
+
+    驻留的 UserInfo / ConversationInfo 每次都给出同一个只读字典，bot_id 是不可变的字符串，
+    因此与上一次完全相同的对象可以直接复用上一次的结构键.
+    """
+
+    __slots__ = ("_last_key", "_last_value", "_slots", "capacity")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._slots: OrderedDict[Any, int] = OrderedDict()
+        self._last_value: Any = None
+        self._last_key: Any = None
+
+    def lookup(self, value: Any, undo: list[Any] | None = None) -> tuple[int, bool]:
+        """返回 (槽位号, 是否命中)，未命中时为该值分配槽位.
+
+        给出 undo 时，为新分配的槽位追加一条可交给 rollback() 的撤销记录.
+
+        Raises:
+            TypeError: 值无法转换为结构键.
+        """
+        if value is self._last_value:
+            key = self._last_key
+        else:
+            key = _context_key(value)
+            self._last_value = value
+            self._last_key = key
+        slots = self._slots
+        slot = slots.get(key)
+        if slot is not None:
+            slots.move_to_end(key)
+            return slot, True
+        evicted = _NOTHING
+        if len(slots) >= self.capacity:
+            evicted, slot = slots.popitem(last=False)
+        else:
+            slot = len(slots)
+        slots[key] = slot
+        if undo is not None:
+            undo.append((self, key, evicted))
+        return slot, False
+
+    def rollback(self, key: Any, evicted: Any) -> None:
+        """撤销 lookup() 的一次槽位分配，被淘汰的值放回最久未使用的位置.
+
+        命中时的 LRU 顺序调整不影响对端，不需要撤销.
+        """
+        slot = self._slots.pop(key)
+        if evicted is not _NOTHING:
+            self._slots[evicted] = slot
+            self._slots.move_to_end(evicted, last=False)
+
+    def clear(self) -> None:
+        """清空槽位表."""
+        self._slots.clear()
+        self._last_value = self._last_key = None
+
+
+class SessionEncoder:
+    """单个连接、单个方向上的上下文增量编码器.
+
+    Attributes:
+        capacity (int): 每种上下文记住的不同值的数量.
+        hits (int): 以引用代替完整值的次数.
+        misses (int): 发送完整值的次数.
+
+    Methods:
+        encode_obj(event: Event) -> dict[str, Any]: 把事件编码为带引用的 JSON 对象.
+            槽位在调用时即被占用，调用方必须把结果发送出去.
+        encode(event: Event) -> bytes: 把事件编码为带引用的 JSON 字节.
+        reset() -> None: 忘记所有已发送的值，重连时调用.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_SESSION_TABLE_SIZE) -> None:
+        if capacity <= 0:
+            raise ValueError(f"capacity 必须为正数: {capacity}")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._tables = {field: _SlotTable(capacity) for field, _ in _CONTEXT_FIELDS}
+
+    def encode_obj(self, event: Event) -> dict[str, Any]:
+        """把事件编码为带引用的 JSON 对象.
+
+        返回值与 json_codec.event_to_obj() 一样直接引用事件内部的字典，仅供立即序列化使用.
+
+        Args:
+            event (Event): 要编码的事件.
+
+        Returns:
+            dict[str, Any]: 编码后的 JSON 对象.
+        """
+        return self._encode_obj(event, None)
+
+    def _encode_obj(self, event: Event, undo: list[Any] | None) -> dict[str, Any]:
+        """encode_obj 的实际实现，undo 不为 None 时收集新分配槽位的撤销记录."""
+        obj = json_codec.event_to_obj(event)
+        for field, ref_key in _CONTEXT_FIELDS:
+            value = obj.get(field)
+            if value is None:
+                continue
+            try:
+                slot, hit = self._tables[field].lookup(value, undo)
+            except TypeError:
+                # 无法作为结构键的值（如嵌套了自定义对象）始终完整发送
+                continue
+            if hit:
+                del obj[field]
+                self.hits += 1
+            else:
+                self.misses += 1
+            obj[ref_key] = slot
+        return obj
+
+    def encode(self, event: Event) -> bytes:
+        """把事件编码为带引用的 JSON 字节.
+
+        Args:
+            event (Event): 要编码的事件.
+
+        Returns:
+            bytes: 编码后的 JSON 字节.
+
+        Raises:
+            TypeError: 事件中包含无法用 JSON 表示的数据. 此时槽位表和计数器保持编码前的状态.
+        """
+        undo: list[Any] = []
+        hits, misses = self.hits, self.misses
+        try:
+            return json_codec._dumps(self._encode_obj(event, undo))
+        except Exception:
+            # 撤销本次新分配的槽位，避免与从未收到这一帧的解码端错位
+            for table, key, evicted in reversed(undo):
+                table.rollback(key, evicted)
+            self.hits, self.misses = hits, misses
+            raise
+
+    def reset(self) -> None:
+        """忘记所有已发送的值，重连时调用."""
+        for table in self._tables.values():
+            table.clear()
+
+
+class SessionDecoder:
+    """单个连接、单个方向上的上下文增量解码器.
+
+    Methods:
+        decode_obj(obj: dict[str, Any], lazy: bool = False) -> Event: 从 JSON 对象还原事件.
+        decode(data: bytes, lazy: bool = False) -> Event: 从带引用的 JSON 字节还原事件.
+        reset() -> None: 清空已记住的值，重连时调用.
+    """
+
+    def __init__(self) -> None:
+        # 槽位号 -> (值, 是否含有嵌套的字典或列表)
+        self._tables: dict[str, dict[int, tuple[Any, bool]]] = {
+            field: {} for field, _ in _CONTEXT_FIELDS
+        }
+
+    def decode_obj(self, obj: dict[str, Any], lazy: bool = False) -> Event:
+        """从带引用的 JSON 对象还原完整的事件.
+
+        不带任何引用字段的普通事件字典也可以直接解码.
+
+        Args:
+            obj (dict[str, Any]): 编码端产生的 JSON 对象，不会被修改.
+            lazy (bool): 为 True 时返回只解析了头部的 LazyEvent.
+
+        Returns:
+            Event: 还原的事件.
+
+        Raises:
+            ValueError: 引用了未知的槽位，通常说明两端没有同时 reset().
+        """
+        data = dict(obj)
+        for field, ref_key in _CONTEXT_FIELDS:
+            slot = data.pop(ref_key, None)
+            if slot is None:
+                continue
+            table = self._tables[field]
+            if field in data:
+                value = data[field]
+                nested = _is_nested(value)
+                table[slot] = (_copy_json(value) if nested else value, nested)
+                continue
+            try:
+                value, nested = table[slot]
+            except KeyError:
+                raise ValueError(
+                    f"{ref_key} 引用了未知的槽位 {slot}，两端的会话状态不一致"
+                ) from None
+            # 扁平的值在解码时只会被读取，可以直接共享；嵌套的值每个事件各复制一份
+            data[field] = _copy_json(value) if nested else value
+        return Event.from_dict(data, lazy)
+
+    def decode(self, data: bytes | bytearray | memoryview | str, lazy: bool = False) -> Event:
+        """从带引用的 JSON 字节还原完整的事件.
+
+        Args:
+            data (bytes | bytearray | memoryview | str): 编码端产生的 JSON 数据.
+            lazy (bool): 为 True 时返回只解析了头部的 LazyEvent.
+
+        Returns:
+            Event: 还原的事件.
+
+        Raises:
+            ValueError: 数据不是 JSON 对象，或引用了未知的槽位.
+        """
+        obj = json_codec._loads(data)
+        if not isinstance(obj, dict):
+            raise ValueError("Event 的 JSON 表示必须是一个对象")
+        return self.decode_obj(obj, lazy)
+
+    def reset(self) -> None:
+        """清空已记住的值，重连时调用."""
+        for table in self._tables.values():
+            table.clear()
+
+
+def _context_key(value: Any) -> Any:
+    """返回上下文值的结构键.
+
+    字典按键值对展开，其中字符串值原样保留，其余值交给带类型标记的 freeze_value；
+    freeze_value 不会返回字符串，因此两类值不会相互冲突.
+    """
+    if isinstance(value, dict):
+        freeze = freeze_value
+        return tuple([(key, v if type(v) is str else freeze(v)) for key, v in value.items()])
+    return freeze_value(value)
+
+
+def _is_nested(value: Any) -> bool:
+    """判断上下文字典中是否含有嵌套的字典或列表."""
+    if not isinstance(value, dict):
+        return False
+    return any(isinstance(item, dict | list) for item in value.values())
+
+
+def _copy_json(value: Any) -> Any:
+    """复制由字典、列表和标量组成的 JSON 值."""
+    if isinstance(value, dict):
+        return {
+            key: _copy_json(item) if isinstance(item, dict | list) else item
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_copy_json(item) if isinstance(item, dict | list) else item for item in value]
+    return value
@@ -0,0 +1,398 @@
+"""AIcarus-Message-Protocol v1.6.0 - 按会话分片的多进程事件流水线.
+
+单个 Python 进程处理插件逻辑的速度有限. ShardedPipeline 把事件按会话分配到 N 个工作进程：
+同一会话的事件总是进入同一个进程并按提交顺序处理，不同会话的事件在多个进程中并行处理.
+
+*   分片键：conversation_info.conversation_id，没有会话时用 user_info.user_id，
+    都没有时用 bot_id. 分片号为分片键的 CRC32 对进程数取模，与进程启动方式和哈希种子无关.
+*   跨进程传输：事件按 batch_codec 的长度前缀格式编码为 JSON 帧，多个帧合并为一批
+    通过 Pipe 以字节发送，工作进程用 BatchDecoder 解码，不经过 pickle.
+*   流量控制：每个进程最多有 max_inflight 批未确认，超过时 submit() 等待确认.
+*   健康与重启：工作进程意外退出时立即重启，并按顺序重发所有未确认的批. 重启后的进程可能
+    重复处理崩溃前已处理但尚未确认的事件（至少一次）. 处理函数抛出的异常只计数，不会导致重启.
+
+handler 和 initializer 会被传给子进程，必须是可 pickle 的模块级函数. ShardedPipeline
+不是线程安全的，应只在一个线程中提交事件.
+
+用法:
+
+    with ShardedPipeline(handle_event, workers=4) as pipeline:
+        for event in events:
+            pipeline.submit(event)
+"""
+
+import contextlib
+import multiprocessing
+import multiprocessing.connection
+import signal
+import struct
+import zlib
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from .batch_codec import BatchDecoder, BatchFraming, encode_frame
+from .event import Event
+
+# 每批最多合并的事件数
+DEFAULT_SHARD_BATCH_SIZE = 128
+# 每个工作进程最多未确认的批数
+DEFAULT_MAX_INFLIGHT_BATCHES = 8
+# 每个分片最多重启工作进程的次数
+DEFAULT_MAX_RESTARTS = 10
+# 等待确认时检查进程存活的间隔（秒）
+HEALTH_CHECK_INTERVAL = 1.0
+
+# 批消息头：批序号
+_BATCH_HEADER = struct.Struct(">Q")
+# 确认消息：批序号、处理的事件数、处理函数抛出异常的次数，后接最后一个异常的描述
+_ACK = struct.Struct(">QII")
+_MAX_ERROR_TEXT = 1024
+
+
+class ShardWorkerError(RuntimeError):
+    """工作进程反复崩溃，超过了重启次数上限."""
+
+
+def shard_key(event: Event) -> str:
+    """返回事件的分片键.
+
+    Args:
+        event (Event): 要分片的事件.
+
+    Returns:
+        str: conversation_id，没有会话时为 user_id，都没有时为 bot_id.
+    """
+    conversation = event.conversation_info
+    if conversation is not None and conversation.conversation_id:
+        return conversation.conversation_id
+    user = event.user_info
+    if user is not None and user.user_id:
+        return user.user_id
+    return event.bot_id
+
+
+def _worker_main(
+    handler: Callable[[Event], object],
+    conn: multiprocessing.connection.Connection,
+    initializer: Callable[[], object] | None,
+    lazy: bool,
+) -> None:
+    """工作进程主循环：逐批接收、按顺序处理并确认."""
+    # 中断由主进程统一处理，工作进程在 close() 时正常退出
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if initializer is not None:
+        initializer()
+    decoder = BatchDecoder(BatchFraming.LENGTH_PREFIXED, lazy=lazy)
+    while True:
+        try:
+            message = conn.recv_bytes()
+        except EOFError:
+            return
+        if not message:
+            return
+        (sequence,) = _BATCH_HEADER.unpack_from(message)
+        processed = errors = 0
+        error_text = b""
+        for event in decoder.feed(memoryview(message)[_BATCH_HEADER.size :]):
+            try:
+                handler(event)
+            except Exception as exc:
+                errors += 1
+                error_text = repr(exc).encode("utf-8", "replace")[:_MAX_ERROR_TEXT]
+            processed += 1
+        conn.send_bytes(_ACK.pack(sequence, processed, errors) + error_text)
+
+
+class _Worker:
+    """主进程中一个分片的状态."""
+
+    __slots__ = (
+        "conn",
+        "errors",
+        "frames",
+        "index",
+        "last_error",
+        "process",
+        "processed",
+        "restarts",
+        "sequence",
+        "submitted",
+        "unacked",
+    )
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.process: Any = None
+        self.conn: multiprocessing.connection.Connection | None = None
+        # 尚未发送的帧
+        self.frames: list[bytes] = []
+        # 已发送未确认的批：(批序号, 事件数, 消息)
+        self.unacked: deque[tuple[int, int, bytes]] = deque()
+        self.sequence = 0
+        self.submitted = 0
+        self.processed = 0
+        self.errors = 0
+        self.restarts = 0
+        self.last_error: str | None = None
+
+
+class ShardedPipeline:
+    """按会话分片的多进程事件流水线.
+
+    Attributes:
+        workers (int): 工作进程数.
+        batch_size (int): 每批最多合并的事件数.
+        max_inflight (int): 每个工作进程最多未确认的批数.
+        max_restarts (int): 每个分片最多重启工作进程的次数.
+
+    Methods:
+        start() -> None: 启动所有工作进程.
+        shard_of(event: Event) -> int: 返回事件所属的分片号.
+        submit(event: Event) -> int: 提交一个事件，返回分片号.
+        flush() -> None: 发送所有缓冲的事件并等待全部处理完毕.
+        close(timeout: float = 5.0) -> None: 处理完剩余事件后停止所有工作进程.
+        stats() -> list[dict[str, Any]]: 各分片计数器的快照.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Event], object],
+        workers: int | None = None,
+        batch_size: int = DEFAULT_SHARD_BATCH_SIZE,
+        max_inflight: int = DEFAULT_MAX_INFLIGHT_BATCHES,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+        initializer: Callable[[], object] | None = None,
+        lazy: bool = False,
+        start_method: str | None = None,
+    ) -> None:
+        """初始化流水线，工作进程在 start() 或进入 with 语句时启动.
+
+        Args:
+            handler (Callable[[Event], object]): 在工作进程中处理每个事件的函数.
+            workers (int | None): 工作进程数，为 None 时使用 CPU 核数.
+            batch_size (int): 每批最多合并的事件数.
+            max_inflight (int): 每个工作进程最多未确认的批数.
+            max_restarts (int): 每个分片最多重启工作进程的次数.
+            initializer (Callable[[], object] | None): 工作进程启动时调用一次，如加载插件.
+            lazy (bool): 为 True 时 handler 收到只解析了头部的 LazyEvent.
+            start_method (str | None): multiprocessing 启动方式，为 None 时使用平台默认值.
+
+        Raises:
+            ValueError: workers、batch_size 或 max_inflight 不是正数，或 max_restarts 为负.
+        """
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        if workers <= 0 or batch_size <= 0 or max_inflight <= 0 or max_restarts < 0:
+            raise ValueError("workers、batch_size 和 max_inflight 必须为正，max_restarts 不能为负")
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_inflight = max_inflight
+        self.max_restarts = max_restarts
+        self._handler = handler
+        self._initializer = initializer
+        self._lazy = lazy
+        self._context = multiprocessing.get_context(start_method)
+        self._shards = [_Worker(index) for index in range(workers)]
+        self._started = False
+        self._closed = False
+
+    def __enter__(self) -> "ShardedPipeline":
+        """启动工作进程."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """处理完剩余事件后停止工作进程."""
+        self.close()
+
+    def start(self) -> None:
+        """启动所有工作进程，重复调用没有效果.
+
+        Raises:
+            ValueError: 流水线已关闭.
+        """
+        if self._closed:
+            raise ValueError("流水线已关闭")
+        if self._started:
+            return
+        for shard in self._shards:
+            self._spawn(shard)
+        self._started = True
+
+    def shard_of(self, event: Event) -> int:
+        """返回事件所属的分片号.
+
+        Args:
+            event (Event): 要分片的事件.
+
+        Returns:
+            int: 0 到 workers - 1 之间的分片号.
+        """
+        return zlib.crc32(shard_key(event).encode("utf-8")) % self.workers
+
+    def submit(self, event: Event) -> int:
+        """提交一个事件.
+
+        事件先在所属分片的缓冲区中攒批，攒满 batch_size 个后发送. 该分片未确认的批
+        达到 max_inflight 时等待工作进程确认.
+
+        Args:
+            event (Event): 要处理的事件.
+
+        Returns:
+            int: 事件所属的分片号.
+
+        Raises:
+            ValueError: 流水线未启动或已关闭.
+            ShardWorkerError: 工作进程反复崩溃，超过了重启次数上限.
+        """
+        if not self._started or self._closed:
+            raise ValueError("流水线未启动或已关闭")
+        index = self.shard_of(event)
+        shard = self._shards[index]
+        shard.frames.append(encode_frame(event, BatchFraming.LENGTH_PREFIXED))
+        shard.submitted += 1
+        if len(shard.frames) >= self.batch_size:
+            self._send_batch(shard)
+        return index
+
+    def flush(self) -> None:
+        """发送所有缓冲的事件，并等待所有工作进程处理完毕.
+
+        Raises:
+            ShardWorkerError: 工作进程反复崩溃，超过了重启次数上限.
+        """
+        for shard in self._shards:
+            if shard.frames:
+                self._send_batch(shard)
+        while any(shard.unacked for shard in self._shards):
+            self._pump(HEALTH_CHECK_INTERVAL)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """处理完剩余事件后停止所有工作进程，重复调用没有效果.
+
+        Args:
+            timeout (float): 等待每个工作进程退出的秒数，超时后强制终止.
+        """
+        if self._closed or not self._started:
+            self._closed = True
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            for shard in self._shards:
+                with contextlib.suppress(OSError):
+                    shard.conn.send_bytes(b"")
+            for shard in self._shards:
+                shard.process.join(timeout)
+                if shard.process.is_alive():
+                    shard.process.terminate()
+                    shard.process.join()
+                shard.conn.close()
+
+    def stats(self) -> list[dict[str, Any]]:
+        """返回各分片计数器的快照.
+
+        Returns:
+            list[dict[str, Any]]: 每个分片一项，包含 shard、pid、alive、submitted、processed、
+                errors（处理函数抛出异常的次数）、restarts、in_flight（已提交未处理的事件数）
+                和 last_error.
+        """
+        result = []
+        for shard in self._shards:
+            process = shard.process
+            result.append(
+                {
+                    "shard": shard.index,
+                    "pid": process.pid if process is not None else None,
+                    "alive": process is not None and process.is_alive(),
+                    "submitted": shard.submitted,
+                    "processed": shard.processed,
+                    "errors": shard.errors,
+                    "restarts": shard.restarts,
+                    "in_flight": shard.submitted - shard.processed,
+                    "last_error": shard.last_error,
+                }
+            )
+        return result
+
+    def _spawn(self, shard: _Worker) -> None:
+        """为分片启动一个新的工作进程."""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self._handler, child_conn, self._initializer, self._lazy),
+            name=f"aicarus-shard-{shard.index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        shard.process = process
+        shard.conn = parent_conn
+
+    def _send_batch(self, shard: _Worker) -> None:
+        """把分片缓冲的帧作为一批发送，必要时先等待确认."""
+        while len(shard.unacked) >= self.max_inflight:
+            self._pump(HEALTH_CHECK_INTERVAL)
+        shard.sequence += 1
+        message = _BATCH_HEADER.pack(shard.sequence) + b"".join(shard.frames)
+        shard.unacked.append((shard.sequence, len(shard.frames), message))
+        shard.frames.clear()
+        try:
+            shard.conn.send_bytes(message)
+        except OSError:
+            self._restart(shard)
+
+    def _pump(self, timeout: float | None) -> None:
+        """等待任意工作进程的确认或退出，处理所有已就绪的确认并重启已退出的进程."""
+        waitables: dict[Any, _Worker] = {}
+        for shard in self._shards:
+            waitables[shard.conn] = shard
+            waitables[shard.process.sentinel] = shard
+        ready = multiprocessing.connection.wait(list(waitables), timeout)
+        for shard in {waitables[item] for item in ready}:
+            alive = self._drain_acks(shard)
+            if not alive or not shard.process.is_alive():
+                self._restart(shard)
+
+    def _drain_acks(self, shard: _Worker) -> bool:
+        """读取分片所有已到达的确认，连接已断开时返回 False."""
+        conn = shard.conn
+        try:
+            while conn.poll():
+                ack = conn.recv_bytes()
+                sequence, processed, errors = _ACK.unpack_from(ack)
+                while shard.unacked and shard.unacked[0][0] <= sequence:
+                    shard.unacked.popleft()
+                shard.processed += processed
+                if errors:
+                    shard.errors += errors
+                    shard.last_error = ack[_ACK.size :].decode("utf-8", "replace")
+        except (EOFError, OSError):
+            return False
+        return True
+
+    def _restart(self, shard: _Worker) -> None:
+        """重启分片的工作进程，并按顺序重发所有未确认的批."""
+        while True:
+            shard.restarts += 1
+            if shard.restarts > self.max_restarts:
+                raise ShardWorkerError(
+                    f"分片 {shard.index} 的工作进程已重启 {self.max_restarts} 次，"
+                    f"最后退出码 {shard.process.exitcode}"
+                )
+            shard.process.join(HEALTH_CHECK_INTERVAL)
+            if shard.process.is_alive():
+                shard.process.kill()
+                shard.process.join()
+            shard.conn.close()
+            # 未确认的批还没有计入 processed，重发后只会在确认时计数一次
+            self._spawn(shard)
+            try:
+                for _, _, message in shard.unacked:
+                    shard.conn.send_bytes(message)
+            except OSError:
+                continue
+            return
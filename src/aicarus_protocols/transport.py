@@ -0,0 +1,434 @@
+"""AIcarus-Message-Protocol v1.6.0 - asyncio 参考传输实现.
+
+基于 asyncio streams 的 Core ↔ Adapter 事件传输，帧格式与 batch_codec 的长度前缀分帧相同
+（4 字节大端长度 + 事件 JSON）.
+
+*   背压：发送和接收队列都有上限. 发送队列满时 send() 会等待；接收队列满时停止从 socket 读取，
+    由 TCP 流量控制把压力传回对端.
+*   写合并：发送任务每次把队列中已积压的帧合并为一次写入，减少系统调用和小包.
+*   心跳：定期发送 meta.system.heartbeat 事件，超过 heartbeat_timeout 没有收到任何数据时
+    关闭连接. 因接收队列满而暂停读取的时间不计入超时. 心跳事件由传输层处理，
+    不会出现在 recv() 的结果中.
+
+用法:
+
+    async def handle(conn: EventConnection) -> None:
+        async for event in conn:
+            await conn.send(event)
+
+    server = await serve(handle, "127.0.0.1", 0)
+    conn = await connect("127.0.0.1", server.port)
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+
+from .batch_codec import DEFAULT_MAX_FRAME_SIZE, BatchDecoder, BatchFraming, encode_frame
+from .event import Event
+from .event_builder import EventBuilder
+from .seg import Seg
+
+# 心跳事件的 event_type
+HEARTBEAT_EVENT_TYPE = "meta.system.heartbeat"
+# 每次从 socket 读取的最大字节数
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ConnectionClosedError(ConnectionError):
+    """连接已关闭，无法继续收发事件."""
+
+
+@dataclass(slots=True)
+class TransportOptions:
+    """连接参数.
+
+    Attributes:
+        send_queue_size (int): 发送队列中最多积压的帧数，满时 send() 等待.
+        recv_queue_size (int): 接收队列中最多积压的事件数，满时暂停读取 socket.
+        coalesce_bytes (int): 一次写入最多合并的字节数.
+        max_frame_size (int): 单个事件帧的上限.
+        heartbeat_interval (float | None): 心跳间隔（秒），为 None 时不发送心跳也不检测超时.
+        heartbeat_timeout (float | None): 多久没有收到任何数据就关闭连接（秒），
+            为 None 时取 heartbeat_interval 的 3 倍；因接收队列满而暂停读取的时间不计入.
+        bot_id (str): 心跳事件中的 bot_id.
+        lazy (bool): 为 True 时收到的是只解析了头部的 LazyEvent.
+    """
+
+    send_queue_size: int = 1024
+    recv_queue_size: int = 1024
+    coalesce_bytes: int = 64 * 1024
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE
+    heartbeat_interval: float | None = 15.0
+    heartbeat_timeout: float | None = None
+    bot_id: str = "unknown"
+    lazy: bool = False
+
+
+class EventConnection:
+    """一条事件连接.
+
+    连接建立后立即在后台启动读取、发送和心跳任务. 可以用 async for 逐个接收事件，
+    也可以用作异步上下文管理器，退出时关闭连接.
+
+    Attributes:
+        options (TransportOptions): 连接参数.
+        events_sent (int): 已写入 socket 的事件数（不含心跳）.
+        events_received (int): 已收到的事件数（不含心跳）.
+
+    Methods:
+        send(event: Event) -> None: 发送一个事件，发送队列满时等待.
+        recv() -> Event: 接收一个事件.
+        close(flush: bool = True) -> None: 关闭连接.
+        closed -> bool: 连接是否已关闭.
+        peername -> object: 对端地址.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        options: TransportOptions | None = None,
+    ) -> None:
+        self.options = options or TransportOptions()
+        self.events_sent = 0
+        self.events_received = 0
+        self._reader = reader
+        self._writer = writer
+        self._send_queue: asyncio.Queue[bytes] = asyncio.Queue(self.options.send_queue_size)
+        # 接收队列本身不设上限，以保证表示连接结束的 None 总能放入；容量由信号量控制
+        self._recv_queue: asyncio.Queue[Event | None] = asyncio.Queue()
+        self._recv_slots = asyncio.Semaphore(self.options.recv_queue_size)
+        self._closed = False
+        self._error: BaseException | None = None
+        self._last_received = time.monotonic()
+        # 读取任务因接收队列满而等待时为 True，此时不读取 socket，不能据此判断对端无响应
+        self._reader_parked = False
+        self._tasks = [
+            asyncio.create_task(self._read_loop()),
+            asyncio.create_task(self._write_loop()),
+        ]
+        if self.options.heartbeat_interval is not None:
+            self._tasks.append(asyncio.create_task(self._heartbeat_loop()))
+
+    @property
+    def closed(self) -> bool:
+        """连接是否已关闭."""
+        return self._closed
+
+    @property
+    def peername(self) -> object:
+        """对端地址."""
+        return self._writer.get_extra_info("peername")
+
+    async def send(self, event: Event) -> None:
+        """发送一个事件.
+
+        事件在调用方的上下文中立即编码，因此无法序列化的事件会在这里抛出异常.
+        发送队列满时等待，直到发送任务腾出空间.
+
+        Args:
+            event (Event): 要发送的事件.
+
+        Raises:
+            ConnectionClosedError: 连接已关闭.
+        """
+        self._check_open()
+        await self._send_queue.put(encode_frame(event, BatchFraming.LENGTH_PREFIXED))
+        # 等待期间连接可能已被关闭，此时帧已被丢弃
+        self._check_open()
+
+    async def recv(self) -> Event:
+        """接收一个事件.
+
+        连接关闭前已收到的事件仍会被依次返回.
+
+        Returns:
+            Event: 收到的事件.
+
+        Raises:
+            ConnectionClosedError: 连接已关闭且没有剩余事件.
+        """
+        event = await self._recv_queue.get()
+        if event is None:
+            # 放回结束标记，让其他等待者也能结束
+            self._recv_queue.put_nowait(None)
+            raise ConnectionClosedError("连接已关闭") from self._error
+        self._recv_slots.release()
+        return event
+
+    def __aiter__(self) -> AsyncIterator[Event]:
+        """逐个接收事件，直到连接关闭."""
+        return self._iter_events()
+
+    async def _iter_events(self) -> AsyncIterator[Event]:
+        """__aiter__ 的实现."""
+        while True:
+            try:
+                yield await self.recv()
+            except ConnectionClosedError:
+                return
+
+    async def close(self, flush: bool = True) -> None:
+        """关闭连接.
+
+        Args:
+            flush (bool): 为 True 时先把发送队列中已积压的帧写出.
+        """
+        if self._closed:
+            return
+        if flush and self._error is None and not self._tasks[1].done():
+            with contextlib.suppress(ConnectionError):
+                await self._send_queue.join()
+        await self._shutdown(None)
+
+    async def __aenter__(self) -> "EventConnection":
+        """进入上下文."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """退出上下文时关闭连接."""
+        await self.close()
+
+    def _check_open(self) -> None:
+        """连接已关闭时抛出 ConnectionClosedError."""
+        if self._closed:
+            raise ConnectionClosedError("连接已关闭") from self._error
+
+    async def _shutdown(self, error: BaseException | None) -> None:
+        """停止后台任务并关闭 socket."""
+        if self._closed:
+            return
+        self._closed = True
+        self._error = error
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+        # 唤醒所有等待中的发送方和接收方
+        while not self._send_queue.empty():
+            self._send_queue.get_nowait()
+            self._send_queue.task_done()
+        self._recv_queue.put_nowait(None)
+        self._writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self._writer.wait_closed()
+
+    async def _read_loop(self) -> None:
+        """从 socket 读取并解码事件."""
+        options = self.options
+        decoder = BatchDecoder(BatchFraming.LENGTH_PREFIXED, options.max_frame_size, options.lazy)
+        error: BaseException | None = None
+        try:
+            while True:
+                chunk = await self._reader.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                self._last_received = time.monotonic()
+                for event in decoder.feed(chunk):
+                    if event.event_type == HEARTBEAT_EVENT_TYPE:
+                        continue
+                    if self._recv_slots.locked():
+                        self._reader_parked = True
+                        try:
+                            await self._recv_slots.acquire()
+                        finally:
+                            self._reader_parked = False
+                        # 等待期间对端的数据留在 socket 中，从恢复读取时重新计时
+                        self._last_received = time.monotonic()
+                    else:
+                        await self._recv_slots.acquire()
+                    self._recv_queue.put_nowait(event)
+                    self.events_received += 1
+            # 对端关闭时不应留下半个帧
+            for _ in decoder.finish():
+                pass
+        except Exception as e:
+            # 连接错误和无法解码的帧都会结束连接，错误通过 recv() 的异常链暴露
+            error = e
+        await self._shutdown(error)
+
+    async def _write_loop(self) -> None:
+        """把发送队列中的帧合并后写入 socket."""
+        queue = self._send_queue
+        writer = self._writer
+        limit = self.options.coalesce_bytes
+        frames: list[bytes] = []
+        try:
+            while True:
+                frames = [await queue.get()]
+                size = len(frames[0])
+                while size < limit and not queue.empty():
+                    frame = queue.get_nowait()
+                    frames.append(frame)
+                    size += len(frame)
+                writer.write(b"".join(frames) if len(frames) > 1 else frames[0])
+                await writer.drain()
+                self.events_sent += len(frames)
+                done, frames = frames, []
+                for _ in done:
+                    queue.task_done()
+        except Exception as e:
+            await self._shutdown(e)
+        finally:
+            # 出错或被取消时，已取出但没有写完的帧也要标记完成，否则 close() 中的 join() 永远等待
+            for _ in frames:
+                queue.task_done()
+
+    async def _heartbeat_loop(self) -> None:
+        """定期发送心跳，并在对端长时间无数据时关闭连接."""
+        interval = self.options.heartbeat_interval
+        timeout = self.options.heartbeat_timeout
+        if timeout is None:
+            timeout = interval * 3
+        while True:
+            await asyncio.sleep(interval)
+            if not self._reader_parked and time.monotonic() - self._last_received > timeout:
+                await self._shutdown(TimeoutError(f"{timeout} 秒内没有收到任何数据"))
+                return
+            # 心跳直接写入 socket，不占用发送队列，也不计入 events_sent
+            self._writer.write(
+                encode_frame(heartbeat_event(self.options.bot_id), BatchFraming.LENGTH_PREFIXED)
+            )
+            try:
+                # 对端不读取时最多等待一个间隔，然后回到超时检测
+                await asyncio.wait_for(self._writer.drain(), interval)
+            except TimeoutError:
+                continue
+            except ConnectionError as e:
+                await self._shutdown(e)
+                return
+
+
+def heartbeat_event(bot_id: str) -> Event:
+    """创建一个 meta.system.heartbeat 事件.
+
+    Args:
+        bot_id (str): 发送方的 bot_id.
+
+    Returns:
+        Event: 心跳事件.
+    """
+    return Event(
+        event_id=EventBuilder.generate_event_id(),
+        event_type=HEARTBEAT_EVENT_TYPE,
+        time=EventBuilder.get_current_timestamp(),
+        bot_id=bot_id,
+        content=[Seg(HEARTBEAT_EVENT_TYPE, {})],
+    )
+
+
+async def connect(host: str, port: int, options: TransportOptions | None = None) -> EventConnection:
+    """连接到事件服务器.
+
+    Args:
+        host (str): 服务器地址.
+        port (int): 服务器端口.
+        options (TransportOptions | None): 连接参数.
+
+    Returns:
+        EventConnection: 建立的连接.
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=READ_CHUNK_SIZE)
+    return EventConnection(reader, writer, options)
+
+
+class EventServer:
+    """事件服务器.
+
+    每个新连接都会以 EventConnection 的形式交给 handler；handler 返回或抛出异常后连接被关闭.
+    关闭服务器时，仍在运行的 handler 会被取消.
+
+    Attributes:
+        connections (dict[EventConnection, asyncio.Task]): 当前活动的连接及其 handler 任务.
+
+    Methods:
+        port -> int: 实际监听的端口，绑定端口 0 时可用于获取系统分配的端口.
+        close() -> None: 停止监听并关闭所有连接.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[EventConnection], Awaitable[None]],
+        options: TransportOptions | None = None,
+    ) -> None:
+        self.connections: dict[EventConnection, asyncio.Task] = {}
+        self._handler = handler
+        self._options = options
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str, port: int) -> None:
+        """开始监听.
+
+        Args:
+            host (str): 监听地址.
+            port (int): 监听端口，0 表示由系统分配.
+        """
+        self._server = await asyncio.start_server(
+            self._on_connected, host, port, limit=READ_CHUNK_SIZE
+        )
+
+    @property
+    def port(self) -> int:
+        """实际监听的端口."""
+        if self._server is None:
+            raise ValueError("服务器尚未启动")
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """停止监听并关闭所有连接."""
+        if self._server is not None:
+            self._server.close()
+        handlers = list(self.connections.values())
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "EventServer":
+        """进入上下文."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """退出上下文时关闭服务器."""
+        await self.close()
+
+    async def _on_connected(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """为新连接运行 handler."""
+        conn = EventConnection(reader, writer, self._options)
+        self.connections[conn] = asyncio.current_task()
+        try:
+            await self._handler(conn)
+        except asyncio.CancelledError:
+            # 服务器关闭时取消的 handler 正常结束，不再向 asyncio 报告
+            await conn.close(flush=False)
+        finally:
+            self.connections.pop(conn, None)
+            await conn.close()
+
+
+async def serve(
+    handler: Callable[[EventConnection], Awaitable[None]],
+    host: str,
+    port: int,
+    options: TransportOptions | None = None,
+) -> EventServer:
+    """创建并启动事件服务器.
+
+    Args:
+        handler (Callable[[EventConnection], Awaitable[None]]): 处理单个连接的协程函数.
+        host (str): 监听地址.
+        port (int): 监听端口，0 表示由系统分配.
+        options (TransportOptions | None): 每个连接的参数.
+
+    Returns:
+        EventServer: 已开始监听的服务器.
+    """
+    server = EventServer(handler, options)
+    await server.start(host, port)
+    return server
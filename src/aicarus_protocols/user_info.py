@@ -3,12 +3,14 @@
 用于描述用户信息的数据结构.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import FrozenInstanceError, dataclass, field
 from dataclasses import fields as dataclass_fields
 from typing import Any, Optional
 
+from . import interning
 
-@dataclass
+
+@dataclass(slots=True)
 class UserInfo:
     """2.2. UserInfo 对象.
 
@@ -75,16 +77,80 @@ class UserInfo:
         if data is None:
             return None
         # 移除 platform 的读取
-        return cls(
-            user_id=data.get("user_id"),
-            user_nickname=data.get("user_nickname"),
-            user_cardname=data.get("user_cardname"),
-            user_titlename=data.get("user_titlename"),
-            permission_level=data.get("permission_level"),
-            role=data.get("role"),
-            level=data.get("level"),
-            sex=data.get("sex"),
-            age=data.get("age"),
-            area=data.get("area"),
-            additional_data=data.get("additional_data", {}),
+        values = (
+            data.get("user_id"),
+            data.get("user_nickname"),
+            data.get("user_cardname"),
+            data.get("user_titlename"),
+            data.get("permission_level"),
+            data.get("role"),
+            data.get("level"),
+            data.get("sex"),
+            data.get("age"),
+            data.get("area"),
+            data.get("additional_data", {}),
         )
+        cache = interning.user_info_cache
+        if cache is None or cls is not UserInfo:
+            return cls(*values)
+        nested = values[-1]
+        if nested is not None:
+            if nested or not isinstance(nested, dict):
+                # 共享实例的 additional_data 会被所有使用它的事件看到，只驻留空字典的情况
+                return cls(*values)
+            values = (*values[:-1], interning.EMPTY_READONLY_DICT)
+        try:
+            key = interning.freeze_value(values)
+        except TypeError:
+            return cls(*values)
+        return cache.get_or_create(key, lambda: _InternedUserInfo(*values))
+
+
+class _InternedUserInfo(UserInfo):
+    """驻留缓存中共享的不可变 UserInfo，并缓存了 to_dict() 的结果.
+
+    additional_data 总是 None 或只读的空字典 interning.EMPTY_READONLY_DICT.
+    与字段相同的普通 UserInfo 相等；copy / pickle 得到的是普通的可变 UserInfo.
+    """
+
+    __slots__ = ("_dict",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        UserInfo.__init__(self, *args, **kwargs)
+        object.__setattr__(self, "_dict", UserInfo.to_dict(self))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """初始化完成后禁止赋值."""
+        try:
+            self._dict  # noqa: B018
+        except AttributeError:
+            object.__setattr__(self, name, value)
+            return
+        raise FrozenInstanceError(f"驻留的 UserInfo 不可修改: {name}")
+
+    def __delattr__(self, name: str) -> None:
+        """禁止删除字段."""
+        raise FrozenInstanceError(f"驻留的 UserInfo 不可修改: {name}")
+
+    def __eq__(self, other: object) -> bool:
+        """按字段与任意 UserInfo 比较."""
+        if not isinstance(other, UserInfo):
+            return NotImplemented
+        return _field_values(self) == _field_values(other)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """序列化和复制时还原为普通的可变 UserInfo."""
+        return (UserInfo, _field_values(self))
+
+    def to_dict(self) -> dict[str, Any]:
+        """返回缓存的字典表示的浅拷贝.
+
+        Returns:
+            dict[str, Any]: 包含用户信息的字典表示.
+        """
+        return dict(self._dict)
+
+
+def _field_values(user_info: UserInfo) -> tuple[Any, ...]:
+    """按字段顺序返回 UserInfo 的所有字段值."""
+    return tuple(getattr(user_info, f.name) for f in dataclass_fields(UserInfo))
@@ -1,29 +1,44 @@
-# src/aicarus_protocols/utils.py
 """AIcarus-Message-Protocol v1.6.0 - 通用工具函数."""
 
-from .seg import Seg
+from typing import TYPE_CHECKING
 
+from .seg import INDEX_MIN_SEGS, Seg, _indexed_segs, first_seg, segs_of_type
 
-def extract_text_from_content(content: list[Seg]) -> str:
+if TYPE_CHECKING:
+    from .event import Event
+
+
+def _segs_of(content: "list[Seg] | Event") -> list[Seg]:
+    """取得 Seg 列表；传入 Event 时返回其 content."""
+    return content if isinstance(content, list) else content.content
+
+
+def extract_text_from_content(content: "list[Seg] | Event") -> str:
     """从 content 中提取所有文本内容.
 
     Args:
-        content (list[Seg]): Seg 对象列表，可能包含多种类型的 Seg.
+        content (list[Seg] | Event): Seg 对象列表，可能包含多种类型的 Seg，或 Event；
+            Event.content 或传入的列表为 SegList 时使用其类型索引.
 
     Returns:
         str: 提取的所有文本内容，按顺序连接成一个字符串.
     """
     if not content:
         return ""
-    text_parts = [seg.data["text"] for seg in content if seg.type == "text" and "text" in seg.data]
+    segs = _segs_of(content)
+    if len(segs) >= INDEX_MIN_SEGS:
+        matched = _indexed_segs(segs, "text")
+        if matched is not None:
+            segs = matched
+    text_parts = [seg.data["text"] for seg in segs if seg.type == "text" and "text" in seg.data]
     return "".join(text_parts)
 
 
-def find_seg_by_type(content: list[Seg], seg_type: str) -> Seg | None:
+def find_seg_by_type(content: "list[Seg] | Event", seg_type: str) -> Seg | None:
     """在 content 中查找指定类型的第一个 Seg.
 
     Args:
-        content (list[Seg]): Seg 对象列表.
+        content (list[Seg] | Event): Seg 对象列表或 Event；为 SegList 时使用其类型索引.
         seg_type (str): 要查找的 Seg 类型.
 
     Returns:
@@ -31,20 +46,22 @@ def find_seg_by_type(content: list[Seg], seg_type: str) -> Seg | None:
     """
     if not content:
         return None
-    for seg in content:
-        if seg.type == seg_type:
-            return seg
-    return None
+    return first_seg(_segs_of(content), seg_type)
 
 
-def filter_segs_by_type(content: list[Seg], seg_type: str) -> list[Seg]:
+def filter_segs_by_type(content: "list[Seg] | Event", seg_type: str) -> list[Seg]:
     """在 content 中查找指定类型的所有 Seg.
 
     Args:
-        content (list[Seg]): Seg 对象列表.
+        content (list[Seg] | Event): Seg 对象列表或 Event；为 SegList 时使用其类型索引.
         seg_type (str): 要查找的 Seg 类型.
 
     Returns:
         list[Seg]: 所有匹配的 Seg 对象列表.
     """
-    return [] if not content else [seg for seg in content if seg.type == seg_type]
+    if not content:
+        return []
+    segs = _segs_of(content)
+    if len(segs) >= INDEX_MIN_SEGS:
+        return segs_of_type(segs, seg_type)
+    return [seg for seg in segs if seg.type == seg_type]
@@ -0,0 +1,412 @@
+"""AIcarus-Message-Protocol v1.6.0 - 整个事件的结构校验.
+
+validate_event_type 只检查 event_type 字符串. 本模块按协议第 2、3 节的规则检查整个事件：
+头部字段的类型、user_info / conversation_info 的字段类型，以及各类事件对 content 结构的要求，
+例如 notice / request / meta / action_response 的第一个 Seg 的 type 必须与 event_type 相同，
+action 必须只携带一个 action_params Seg（send_message 除外）.
+
+每个 event_type 的检查函数只编译一次，缓存在 EventTypeRegistry 中；校验时对事件只遍历一遍.
+Event 对象和尚未解析的事件字典都可以直接校验.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Any
+
+from . import metrics
+from .constants import EventTypePrefix, MetricOperation
+from .conversation_info import ConversationInfo
+from .event import Event
+from .event_type import EventTypePath, EventTypeRegistry, event_registry
+from .seg import Seg
+from .user_info import UserInfo
+
+
+class Severity:
+    """校验问题的严重程度.
+
+    Attributes:
+        ERROR (str): 违反协议中的 MUST 规则.
+        WARNING (str): 违反协议中的 SHOULD 规则或惯例.
+    """
+
+    ERROR = "error"
+    WARNING = "warning"
+
+
+@dataclass(frozen=True, slots=True)
+class ValidationIssue:
+    """一个校验问题.
+
+    Attributes:
+        path (str): 出问题的位置，如 "event_type"、"content[0].type".
+        code (str): 机器可读的问题代码，如 "missing"、"wrong_type"、"seg_type_mismatch".
+        message (str): 人类可读的说明.
+        severity (str): Severity.ERROR 或 Severity.WARNING.
+    """
+
+    path: str
+    code: str
+    message: str
+    severity: str = Severity.ERROR
+
+
+class EventValidationError(ValueError):
+    """事件未通过结构校验.
+
+    Attributes:
+        issues (list[ValidationIssue]): 所有 ERROR 级别的问题.
+    """
+
+    def __init__(self, issues: list[ValidationIssue]) -> None:
+        self.issues = issues
+        summary = "; ".join(f"{i.path}: {i.message}" for i in issues[:5])
+        if len(issues) > 5:
+            summary += f"; ... 共 {len(issues)} 个问题"
+        super().__init__(f"事件结构校验失败: {summary}")
+
+
+# 已编译的检查函数：接收 content 中各 Seg 的 (type, data) 列表，把问题写入 issues
+ContentChecker = Callable[[list[tuple[Any, Any]], list[ValidationIssue]], None]
+
+_USER_INFO_STR_FIELDS = (
+    "user_id",
+    "user_nickname",
+    "user_cardname",
+    "user_titlename",
+    "permission_level",
+    "role",
+    "level",
+    "sex",
+    "area",
+)
+
+# 这些前缀的事件，第一个 Seg 的 type 必须等于 event_type
+_SELF_TYPED_PREFIXES = frozenset(
+    {
+        EventTypePrefix.NOTICE,
+        EventTypePrefix.REQUEST,
+        EventTypePrefix.META,
+        EventTypePrefix.ACTION_RESPONSE,
+    }
+)
+
+
+def compile_checker(event_type: str) -> ContentChecker:
+    """为某个事件类型编译 content 检查函数.
+
+    一般不直接调用，而是通过 EventTypeRegistry.get_checker() 取得缓存的结果.
+
+    Args:
+        event_type (str): 事件类型字符串.
+
+    Returns:
+        ContentChecker: 检查函数.
+    """
+    path = EventTypePath.parse(event_type)
+    if not path.is_valid:
+        return _check_nothing
+    if path.prefix == EventTypePrefix.MESSAGE:
+        return _check_message
+    if path.prefix == EventTypePrefix.ACTION:
+        if path.parts[-1] == "send_message":
+            return _check_send_message
+        return _check_action_params
+    if path.prefix in _SELF_TYPED_PREFIXES:
+        return _self_typed_checker(event_type)
+    return _check_nothing
+
+
+def _check_nothing(segs: list[tuple[Any, Any]], issues: list[ValidationIssue]) -> None:
+    """无法确定规则时不检查 content."""
+
+
+def _check_message(segs: list[tuple[Any, Any]], issues: list[ValidationIssue]) -> None:
+    """message: 第一个 Seg SHOULD 是带 message_id 的 message_metadata."""
+    if not segs or segs[0][0] != "message_metadata":
+        issues.append(
+            ValidationIssue(
+                "content[0]",
+                "missing_metadata",
+                "消息事件的第一个 Seg 应为 message_metadata",
+                Severity.WARNING,
+            )
+        )
+        return
+    data = segs[0][1]
+    if isinstance(data, dict) and not isinstance(data.get("message_id"), str):
+        issues.append(
+            ValidationIssue(
+                "content[0].data.message_id",
+                "missing",
+                "message_metadata 必须包含字符串 message_id",
+            )
+        )
+
+
+def _check_send_message(segs: list[tuple[Any, Any]], issues: list[ValidationIssue]) -> None:
+    """action.*.send_message: content 直接是要发送的消息 Seg."""
+    if not segs:
+        issues.append(ValidationIssue("content", "empty", "send_message 动作的 content 不能为空"))
+
+
+def _check_action_params(segs: list[tuple[Any, Any]], issues: list[ValidationIssue]) -> None:
+    """action: content MUST 只包含一个 action_params Seg."""
+    if len(segs) != 1:
+        issues.append(
+            ValidationIssue(
+                "content", "seg_count", f"动作事件必须只包含一个 Seg，实际为 {len(segs)} 个"
+            )
+        )
+    if segs and segs[0][0] != "action_params":
+        issues.append(
+            ValidationIssue(
+                "content[0].type", "seg_type_mismatch", "动作事件的 Seg 类型必须为 action_params"
+            )
+        )
+
+
+def _self_typed_checker(event_type: str) -> ContentChecker:
+    """为 notice / request / meta / action_response 编译检查函数.
+
+    这些事件的第一个 Seg 的 type MUST 等于 event_type.
+    """
+
+    def check(segs: list[tuple[Any, Any]], issues: list[ValidationIssue]) -> None:
+        if not segs:
+            issues.append(ValidationIssue("content", "empty", f"content 必须包含 {event_type} Seg"))
+            return
+        if segs[0][0] != event_type:
+            issues.append(
+                ValidationIssue(
+                    "content[0].type",
+                    "seg_type_mismatch",
+                    f"Seg 类型必须与 event_type 相同: 期望 {event_type!r}，实际为 {segs[0][0]!r}",
+                )
+            )
+        if len(segs) > 1:
+            issues.append(
+                ValidationIssue(
+                    "content",
+                    "seg_count",
+                    f"通常只包含一个 Seg，实际为 {len(segs)} 个",
+                    Severity.WARNING,
+                )
+            )
+
+    return check
+
+
+class EventValidator:
+    """整个事件的结构校验器.
+
+    Attributes:
+        registry (EventTypeRegistry): 缓存检查函数的注册器，默认为全局 event_registry.
+
+    Methods:
+        validate(event: Event | dict[str, Any]) -> list[ValidationIssue]: 返回所有问题.
+        is_valid(event: Event | dict[str, Any]) -> bool: 判断是否没有 ERROR 级别的问题.
+        ensure_valid(event: Event | dict[str, Any]) -> None: 有 ERROR 级别的问题时抛出异常.
+    """
+
+    def __init__(self, registry: EventTypeRegistry | None = None) -> None:
+        self.registry = registry if registry is not None else event_registry
+
+    def validate(self, event: Event | dict[str, Any]) -> list[ValidationIssue]:
+        """返回事件的所有校验问题.
+
+        Args:
+            event (Event | dict[str, Any]): Event 对象或事件字典.
+
+        Returns:
+            list[ValidationIssue]: 问题列表，没有问题时为空.
+        """
+        recorder = metrics.recorder
+        if recorder is None:
+            return self._validate(event)
+        started = perf_counter_ns()
+        issues = self._validate(event)
+        elapsed = perf_counter_ns() - started
+        if isinstance(event, dict):
+            event_type = event.get("event_type")
+        else:
+            event_type = getattr(event, "event_type", None)
+        failed = any(i.severity == Severity.ERROR for i in issues)
+        recorder.observe(MetricOperation.VALIDATE, event_type, elapsed, failed=failed)
+        return issues
+
+    def _validate(self, event: Event | dict[str, Any]) -> list[ValidationIssue]:
+        """Validate 的实际实现."""
+        issues: list[ValidationIssue] = []
+        if isinstance(event, dict):
+            get = event.get
+            content = get("content")
+            user_info = get("user_info")
+            conversation_info = get("conversation_info")
+            raw_data = get("raw_data")
+            _check_header(get("event_id"), get("event_type"), get("time"), get("bot_id"), issues)
+            event_type = get("event_type")
+        elif isinstance(event, Event):
+            content = event.content
+            user_info = event.user_info
+            conversation_info = event.conversation_info
+            raw_data = event.raw_data
+            event_type = event.event_type
+            _check_header(event.event_id, event_type, event.time, event.bot_id, issues)
+        else:
+            return [ValidationIssue("", "wrong_type", "事件必须是 Event 或字典")]
+
+        if user_info is not None:
+            _check_user_info(user_info, issues)
+        if conversation_info is not None:
+            _check_conversation_info(conversation_info, issues)
+        if raw_data is not None and not isinstance(raw_data, str):
+            issues.append(ValidationIssue("raw_data", "wrong_type", "raw_data 必须是字符串"))
+
+        if not isinstance(content, list):
+            issues.append(ValidationIssue("content", "wrong_type", "content 必须是列表"))
+            return issues
+        segs = _collect_segs(content, issues)
+        if isinstance(event_type, str):
+            self.registry.get_checker(event_type)(segs, issues)
+        return issues
+
+    def is_valid(self, event: Event | dict[str, Any]) -> bool:
+        """判断事件是否没有 ERROR 级别的问题.
+
+        Args:
+            event (Event | dict[str, Any]): Event 对象或事件字典.
+
+        Returns:
+            bool: 没有 ERROR 级别的问题时返回 True.
+        """
+        return not any(i.severity == Severity.ERROR for i in self.validate(event))
+
+    def ensure_valid(self, event: Event | dict[str, Any]) -> None:
+        """有 ERROR 级别的问题时抛出异常.
+
+        Args:
+            event (Event | dict[str, Any]): Event 对象或事件字典.
+
+        Raises:
+            EventValidationError: 事件存在 ERROR 级别的问题.
+        """
+        errors = [i for i in self.validate(event) if i.severity == Severity.ERROR]
+        if errors:
+            raise EventValidationError(errors)
+
+
+def _check_header(
+    event_id: Any, event_type: Any, time: Any, bot_id: Any, issues: list[ValidationIssue]
+) -> None:
+    """检查 event_id、event_type、time、bot_id."""
+    if not isinstance(event_id, str) or not event_id:
+        issues.append(ValidationIssue("event_id", "wrong_type", "event_id 必须是非空字符串"))
+    if not isinstance(event_type, str):
+        issues.append(ValidationIssue("event_type", "wrong_type", "event_type 必须是字符串"))
+    elif not EventTypePath.parse(event_type).is_valid:
+        issues.append(
+            ValidationIssue("event_type", "invalid", f"event_type 不符合命名规范: {event_type!r}")
+        )
+    if type(time) not in (float, int):
+        issues.append(ValidationIssue("time", "wrong_type", "time 必须是数字"))
+    if not isinstance(bot_id, str):
+        issues.append(ValidationIssue("bot_id", "wrong_type", "bot_id 必须是字符串"))
+
+
+def _collect_segs(content: list[Any], issues: list[ValidationIssue]) -> list[tuple[Any, Any]]:
+    """检查每个 Seg 的 type 和 data，返回 (type, data) 列表."""
+    segs = []
+    for i, seg in enumerate(content):
+        if isinstance(seg, dict):
+            seg_type, data = seg.get("type"), seg.get("data")
+        elif isinstance(seg, Seg):
+            seg_type, data = seg.type, seg.data
+        else:
+            issues.append(ValidationIssue(f"content[{i}]", "wrong_type", "Seg 必须是对象"))
+            continue
+        if not isinstance(seg_type, str):
+            issues.append(
+                ValidationIssue(f"content[{i}].type", "wrong_type", "Seg.type 必须是字符串")
+            )
+        if not isinstance(data, dict):
+            issues.append(
+                ValidationIssue(f"content[{i}].data", "wrong_type", "Seg.data 必须是对象")
+            )
+        segs.append((seg_type, data))
+    return segs
+
+
+def _check_user_info(user_info: Any, issues: list[ValidationIssue]) -> None:
+    """检查 user_info 各字段的类型."""
+    if isinstance(user_info, dict):
+        get = user_info.get
+    elif isinstance(user_info, UserInfo):
+
+        def get(name: str) -> Any:
+            return getattr(user_info, name)
+
+    else:
+        issues.append(ValidationIssue("user_info", "wrong_type", "user_info 必须是对象"))
+        return
+    for name in _USER_INFO_STR_FIELDS:
+        value = get(name)
+        if value is not None and not isinstance(value, str):
+            issues.append(
+                ValidationIssue(f"user_info.{name}", "wrong_type", f"{name} 必须是字符串")
+            )
+    age = get("age")
+    if age is not None and type(age) is not int:
+        issues.append(ValidationIssue("user_info.age", "wrong_type", "age 必须是整数"))
+    additional_data = get("additional_data")
+    if additional_data is not None and not isinstance(additional_data, dict):
+        issues.append(
+            ValidationIssue("user_info.additional_data", "wrong_type", "additional_data 必须是对象")
+        )
+
+
+def _check_conversation_info(conversation_info: Any, issues: list[ValidationIssue]) -> None:
+    """检查 conversation_info 的必需字段和字段类型."""
+    if isinstance(conversation_info, dict):
+        get = conversation_info.get
+    elif isinstance(conversation_info, ConversationInfo):
+
+        def get(name: str) -> Any:
+            return getattr(conversation_info, name)
+
+    else:
+        issues.append(
+            ValidationIssue("conversation_info", "wrong_type", "conversation_info 必须是对象")
+        )
+        return
+    for name in ("conversation_id", "type"):
+        if not isinstance(get(name), str):
+            issues.append(
+                ValidationIssue(f"conversation_info.{name}", "missing", f"{name} 必须是字符串")
+            )
+    for name in ("name", "parent_id"):
+        value = get(name)
+        if value is not None and not isinstance(value, str):
+            issues.append(
+                ValidationIssue(f"conversation_info.{name}", "wrong_type", f"{name} 必须是字符串")
+            )
+    extra = get("extra")
+    if extra is not None and not isinstance(extra, dict):
+        issues.append(ValidationIssue("conversation_info.extra", "wrong_type", "extra 必须是对象"))
+
+
+# 使用全局注册器的默认校验器
+default_validator = EventValidator()
+
+
+def validate_event(event: Event | dict[str, Any]) -> list[ValidationIssue]:
+    """使用默认校验器校验整个事件.
+
+    Args:
+        event (Event | dict[str, Any]): Event 对象或事件字典.
+
+    Returns:
+        list[ValidationIssue]: 问题列表，没有问题时为空.
+    """
+    return default_validator.validate(event)
@@ -0,0 +1,101 @@
+"""从 EventArchive 训练预置压缩字典.
+
+从归档中均匀抽取样本事件，用 compression.train_dictionary 生成字典并写入文件，
+然后在另一批抽样事件上报告使用字典前后的平均帧大小.
+
+归档按只读方式直接读取各分段的 .log 文件，不经过 EventArchive：打开 EventArchive 会修复索引、
+封存分段并创建新的活动分段，而这个工具不应修改它读取的归档.
+
+运行方式:
+    python tools/build_zdict.py <归档目录> <输出文件> [--size 字节数] [--samples 样本数]
+"""
+
+import argparse
+import glob
+import os
+import random
+import struct
+import sys
+import zlib
+from collections.abc import Iterator
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aicarus_protocols import DictionaryCompressor, Event, train_dictionary
+from aicarus_protocols.compression import DEFAULT_DICTIONARY_SIZE, MAX_DICTIONARY_SIZE
+
+# 分段中每个帧前的 4 字节大端长度
+_LENGTH = struct.Struct(">I")
+
+
+def iter_archived_events(directory: str) -> Iterator[Event]:
+    """只读地按写入顺序解码归档中的事件，跳过无法解码的帧和残缺的尾帧."""
+    for path in sorted(glob.glob(os.path.join(directory, "segment-*.log"))):
+        with open(path, "rb") as f:
+            data = f.read()
+        pos = 0
+        while pos + _LENGTH.size <= len(data):
+            (length,) = _LENGTH.unpack_from(data, pos)
+            start = pos + _LENGTH.size
+            if start + length > len(data):
+                break
+            pos = start + length
+            try:
+                yield Event.from_json_bytes(data[start:pos], lazy=True)
+            except (TypeError, ValueError, AttributeError):
+                continue
+
+
+def sample_events(directory: str, count: int, seed: int) -> list[Event]:
+    """用蓄水池抽样从归档中均匀抽取 count 个事件."""
+    rng = random.Random(seed)
+    reservoir: list[Event] = []
+    for seen, event in enumerate(iter_archived_events(directory)):
+        if seen < count:
+            reservoir.append(event)
+        else:
+            j = rng.randrange(seen + 1)
+            if j < count:
+                reservoir[j] = event
+    return reservoir
+
+
+def main() -> None:
+    """训练字典并打印评估结果."""
+    parser = argparse.ArgumentParser(description="从 EventArchive 训练预置压缩字典")
+    parser.add_argument("archive", help="EventArchive 目录")
+    parser.add_argument("output", help="字典输出文件")
+    parser.add_argument("--size", type=int, default=DEFAULT_DICTIONARY_SIZE, help="字典大小")
+    parser.add_argument("--samples", type=int, default=10000, help="训练样本数量")
+    parser.add_argument("--seed", type=int, default=0, help="抽样随机种子")
+    args = parser.parse_args()
+    if not 0 < args.size <= MAX_DICTIONARY_SIZE:
+        parser.error(f"--size 必须在 1 到 {MAX_DICTIONARY_SIZE} 之间")
+
+    if not os.path.isdir(args.archive):
+        parser.error(f"归档目录不存在: {args.archive}")
+    events = sample_events(args.archive, args.samples * 2, args.seed)
+    if not events:
+        parser.error("归档中没有事件")
+    # 一半用于训练，另一半用于评估，避免用训练样本自己评估字典
+    training, evaluation = events[::2], events[1::2] or events[::2]
+    dictionary = train_dictionary(training, args.size)
+    with open(args.output, "wb") as f:
+        f.write(dictionary)
+
+    compressor = DictionaryCompressor(dictionary)
+    plain = [event.to_json_bytes() for event in evaluation]
+    raw = sum(map(len, plain))
+    without = sum(len(zlib.compress(payload, 6, -15)) for payload in plain)
+    with_dictionary = sum(len(compressor.compress(payload)) for payload in plain)
+    dictionary_id = compressor.dictionary_id
+    print(f"字典 {len(dictionary)} 字节 (id={dictionary_id:#010x})，已写入 {args.output}")
+    print(f"评估 {len(plain)} 个事件，平均每帧:")
+    print(f"  未压缩     : {raw / len(plain):7.1f} 字节")
+    print(f"  无字典压缩 : {without / len(plain):7.1f} 字节 ({without / raw:.0%})")
+    print(f"  字典压缩   : {with_dictionary / len(plain):7.1f} 字节 ({with_dictionary / raw:.0%})")
+
+
+if __name__ == "__main__":
+    main()